@@ -1,12 +1,24 @@
 import numpy as np
 from manim import *
 
-class BCHCommutatorVisualization(ThreeDScene):
+from config import ProfiledScene, scale_resolution
+from geometry_cache import cached_arrow3d
+from static_layers import StaticLayerScene
+
+class BCHCommutatorVisualization(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene to visualize the Lie bracket (commutator) term
     from the Baker-Campbell-Hausdorff (BCH) formula for so(3),
     which corresponds to the cross product.
     """
+    metadata = {
+        "order": 7,
+        "title": "BCH Formula Commutator",
+        "description": "Visualization of the Baker-Campbell-Hausdorff formula commutator terms.",
+        "complexity": "Advanced",
+        "icon": "fas fa-brackets-curly",
+    }
+
     def construct(self):
         # --- 1. Scene Setup ---
         self.set_camera_orientation(phi=60 * DEGREES, theta=-70 * DEGREES, zoom=1)
@@ -28,14 +40,15 @@ class BCHCommutatorVisualization(ThreeDScene):
         ).set_shade_in_3d(True).rotate(90*DEGREES, axis=RIGHT) # Make it the XY plane
 
         self.add(axes, plane)
+        self.mark_static(axes, plane, title, subtitle)
         self.wait()
 
         # --- 2. Define and Draw Vectors in the Algebra ---
         v1 = np.array([2.5, 0, 0]) # A rotation vector along the world x-axis
         v2 = np.array([0, 2, 0])   # A rotation vector along the world y-axis
 
-        v1_arrow = Arrow3D(start=ORIGIN, end=v1, color=RED, resolution=8)
-        v2_arrow = Arrow3D(start=ORIGIN, end=v2, color=ORANGE, resolution=8)
+        v1_arrow = cached_arrow3d(start=ORIGIN, end=v1, color=RED, resolution=scale_resolution(8))
+        v2_arrow = cached_arrow3d(start=ORIGIN, end=v2, color=ORANGE, resolution=scale_resolution(8))
         v1_label = MathTex(r"\mathbf{v}_1", color=RED).next_to(v1_arrow, RIGHT)
         v2_label = MathTex(r"\mathbf{v}_2", color=ORANGE).next_to(v2_arrow, UP)
 
@@ -55,12 +68,12 @@ class BCHCommutatorVisualization(ThreeDScene):
         # For so(3), the Lie bracket is the cross product
         v_commutator = np.cross(v1, v2)
 
-        commutator_arrow = Arrow3D(
+        commutator_arrow = cached_arrow3d(
             start=ORIGIN,
             end=v_commutator,
             color=PURPLE,
             thickness=0.03,
-            resolution=8
+            resolution=scale_resolution(8)
         )
         commutator_label = MathTex(r"[ \mathbf{v}_1, \mathbf{v}_2 ]", color=PURPLE).next_to(commutator_arrow, OUT)
 
@@ -0,0 +1,257 @@
+"""
+Performance benchmarks with a stored baseline.
+
+Four groups are timed:
+
+* ``kernel``: the SO(3)/SE(3) operations in ``lie_groups`` and ``pose_store``
+  at batch sizes 1, 1e3 and 1e6.
+* ``construct``: every scene's ``construct`` with animations skipped and
+  nothing rasterized (see ``dry_run``).
+* ``frame``: one low-quality render of the final frame of a few reference
+  scenes.
+* ``geometry``: building a sphere, cylinder and arrow with manim and from a
+  warm ``geometry_cache`` entry, to check the cache pays for itself.
+
+Results are written as JSON. Given a baseline file, each benchmark is
+compared by its fastest round and the run fails when one got slower than its
+group's tolerance:
+
+    python benchmark.py --save-baseline            # on main
+    python benchmark.py --baseline media/benchmarks/baseline.json
+    python benchmark.py --group kernel --sizes 1 1000
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from unittest import mock
+
+import numpy as np
+
+import lie_groups
+from pose_store import quaternions_to_matrices
+
+BENCHMARK_DIR = Path(__file__).parent / "media" / "benchmarks"
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_OUTPUT = BENCHMARK_DIR / "latest.json"
+BATCH_SIZES = (1, 1_000, 1_000_000)
+# Scenes whose final frame is rendered by the ``frame`` group
+REFERENCE_SCENES = ("SO3RotationVisualization", "SE3RelativePose", "PoseGraphOptimization")
+# Allowed ratio of current to baseline time, per group
+MAX_SLOWDOWN = {"kernel": 1.25, "construct": 1.5, "frame": 1.5, "geometry": 1.5}
+# Timing budget per benchmark: rounds are repeated until it is used up
+MIN_TIME = 0.2
+MIN_ROUNDS = 3
+MAX_ROUNDS = 1000
+
+
+def _rotation_vectors(rng: np.random.Generator, n: int) -> np.ndarray:
+    return rng.normal(scale=1.0, size=(n, 3))
+
+
+def _poses(rng: np.random.Generator, n: int) -> np.ndarray:
+    return lie_groups.se3_exp(rng.normal(size=(n, 6)))
+
+
+def _quaternions(rng: np.random.Generator, n: int) -> np.ndarray:
+    q = rng.normal(size=(n, 4))
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+# name -> setup(rng, n) returning the zero-argument call to time
+KERNELS: Dict[str, Callable[[np.random.Generator, int], Callable[[], object]]] = {
+    "so3_hat": lambda rng, n: (lambda w=_rotation_vectors(rng, n): lie_groups.so3_hat(w)),
+    "so3_exp": lambda rng, n: (lambda w=_rotation_vectors(rng, n): lie_groups.so3_exp(w)),
+    "so3_log": lambda rng, n: (lambda R=lie_groups.so3_exp(_rotation_vectors(rng, n)): lie_groups.so3_log(R)),
+    "so3_left_jacobian": lambda rng, n: (lambda w=_rotation_vectors(rng, n): lie_groups.so3_left_jacobian(w)),
+    "so3_exp_quat": lambda rng, n: (lambda w=_rotation_vectors(rng, n): lie_groups.so3_exp_quat(w)),
+    "quat_multiply": lambda rng, n: (
+        lambda a=_quaternions(rng, n), b=_quaternions(rng, n): lie_groups.quat_multiply(a, b)
+    ),
+    "quaternions_to_matrices": lambda rng, n: (lambda q=_quaternions(rng, n): quaternions_to_matrices(q)),
+    "se3_exp": lambda rng, n: (lambda xi=rng.normal(size=(n, 6)): lie_groups.se3_exp(xi)),
+    "se3_log": lambda rng, n: (lambda T=_poses(rng, n): lie_groups.se3_log(T)),
+    "se3_inverse": lambda rng, n: (lambda T=_poses(rng, n): lie_groups.se3_inverse(T)),
+    "se3_compose": lambda rng, n: (lambda a=_poses(rng, n), b=_poses(rng, n): lie_groups.se3_compose(a, b)),
+    "relative_pose": lambda rng, n: (lambda a=_poses(rng, n), b=_poses(rng, n): lie_groups.relative_pose(a, b)),
+    "transform_points": lambda rng, n: (
+        lambda T=_poses(rng, n), p=rng.normal(size=(n, 3)): lie_groups.transform_points(T, p)
+    ),
+}
+
+
+def measure(
+    func: Callable[[], object],
+    min_time: float = MIN_TIME,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+) -> Dict[str, float]:
+    """Time ``func`` over as many rounds as fit in ``min_time``, after a warm-up call."""
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    rounds = int(np.clip(min_time / max(warmup, 1e-9), min_rounds, max_rounds))
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return {"min": min(times), "median": statistics.median(times), "rounds": rounds}
+
+
+def bench_kernels(
+    sizes: Sequence[int] = BATCH_SIZES,
+    names: Optional[Iterable[str]] = None,
+    min_time: float = MIN_TIME,
+) -> Dict[str, dict]:
+    """Benchmark every kernel (or ``names``) at each batch size."""
+    results = {}
+    for name in names or KERNELS:
+        for n in sizes:
+            func = KERNELS[name](np.random.default_rng(0), n)
+            results[f"kernel/{name}/{n}"] = measure(func, min_time)
+    return results
+
+
+def bench_scenes(names: Optional[Iterable[str]] = None, frames: Iterable[str] = REFERENCE_SCENES, rounds: int = 1) -> Dict[str, dict]:
+    """Time each scene's headless ``construct``, and one final frame of the reference scenes."""
+    from manim import tempconfig
+
+    from dry_run import headless_scene
+    from scene_registry import discover_scenes, filter_scenes
+
+    results = {}
+    with tempconfig({"quality": "low_quality"}):
+        for entry in filter_scenes(discover_scenes(), names):
+            scene_cls = entry.load()
+            times = []
+            for _ in range(rounds):
+                with headless_scene(scene_cls) as scene:
+                    start = time.perf_counter()
+                    scene.construct()
+                    times.append(time.perf_counter() - start)
+                    if entry.name in frames:
+                        renderer = scene.renderer
+                        # The headless scene stubs update_frame on the instance; call the real one
+                        render = lambda: type(renderer).update_frame(renderer, scene)
+                        results[f"frame/{entry.name}"] = measure(render, min_time=0.0)
+            results[f"construct/{entry.name}"] = {
+                "min": min(times), "median": statistics.median(times), "rounds": rounds,
+            }
+    return results
+
+
+def bench_geometry(min_time: float = MIN_TIME) -> Dict[str, dict]:
+    """Time each cached primitive built by manim (``built``) and from a warm cache entry (``cached``)."""
+    from manim import Arrow3D, Cylinder, Sphere
+
+    from geometry_cache import CACHE_ENV_VAR, cached_arrow3d, cached_cylinder, cached_sphere
+
+    end = np.array([1.0, 2.0, 0.5])
+    primitives = {
+        "sphere": (lambda: Sphere(radius=1.0, resolution=(32, 32)), lambda: cached_sphere(1.0, (32, 32))),
+        "cylinder": (
+            lambda: Cylinder(radius=0.5, height=2.0, resolution=(24, 24)),
+            lambda: cached_cylinder(0.5, 2.0, resolution=(24, 24)),
+        ),
+        "arrow3d": (lambda: Arrow3D(start=np.zeros(3), end=end), lambda: cached_arrow3d(np.zeros(3), end)),
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as directory, mock.patch.dict(os.environ, {CACHE_ENV_VAR: directory}):
+        for name, (built, cached) in primitives.items():
+            results[f"geometry/{name}/built"] = measure(built, min_time)
+            # measure()'s warm-up call fills the cache entry
+            results[f"geometry/{name}/cached"] = measure(cached, min_time)
+    return results
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    max_slowdown: Optional[Dict[str, float]] = None,
+) -> List[Tuple[str, float, float, float]]:
+    """``(name, baseline, current, ratio)`` of every benchmark slower than its tolerance."""
+    tolerance = {**MAX_SLOWDOWN, **(max_slowdown or {})}
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["min"], result["min"]
+        ratio = now / before if before > 0 else float("inf")
+        if ratio > tolerance.get(name.split("/")[0], max(tolerance.values())):
+            regressions.append((name, before, now, ratio))
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+
+def save_results(results: Dict[str, dict], path: Path) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment(), "results": results}, indent=1))
+    return path
+
+
+def load_results(path: Path) -> Dict[str, dict]:
+    return json.loads(Path(path).read_text())["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark kernels and scenes against a baseline.")
+    parser.add_argument("--group", action="append", choices=["kernel", "construct", "frame", "geometry"], help="Groups to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(BATCH_SIZES), help="Kernel batch sizes")
+    parser.add_argument("--scene", action="append", help="Only these scenes")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT, help="Results file")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results file")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write the results to {DEFAULT_BASELINE}")
+    parser.add_argument(
+        "--max-slowdown", nargs="+", default=[], metavar="[GROUP=]RATIO",
+        help="Tolerated slowdown, for every group or per group (e.g. 1.3 or kernel=1.1)",
+    )
+    args = parser.parse_args()
+
+    groups = set(args.group or ["kernel", "construct", "frame", "geometry"])
+    results = {}
+    if "kernel" in groups:
+        results.update(bench_kernels(args.sizes))
+    if groups & {"construct", "frame"}:
+        scene_results = bench_scenes(args.scene, REFERENCE_SCENES if "frame" in groups else ())
+        results.update({k: v for k, v in scene_results.items() if k.split("/")[0] in groups})
+    if "geometry" in groups:
+        results.update(bench_geometry())
+
+    for name, result in results.items():
+        print(f"{name:45s} {result['min'] * 1e3:10.3f} ms  (median {result['median'] * 1e3:.3f} ms, {result['rounds']} rounds)")
+    save_results(results, args.out)
+    if args.save_baseline:
+        save_results(results, DEFAULT_BASELINE)
+
+    if args.baseline:
+        max_slowdown = {}
+        for item in args.max_slowdown:
+            group, _, ratio = item.rpartition("=")
+            for name in [group] if group else MAX_SLOWDOWN:
+                max_slowdown[name] = float(ratio)
+        regressions = compare(results, load_results(args.baseline), max_slowdown)
+        for name, before, now, ratio in regressions:
+            print(f"❌ {name}: {before * 1e3:.3f} ms -> {now * 1e3:.3f} ms ({ratio:.2f}x)")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Incremental builds driven by a dependency graph.
+
+A build is a set of named steps, each with the files it reads, the files it
+writes and any other values it depends on (configuration, scene metadata,
+section code keys). A step's inputs are hashed into a digest that is stored in
+``media/build_state.json`` once the step succeeded; the next build only runs
+the steps whose digest changed or whose outputs are missing. Steps are ordered
+by their files, a step reading another step's output runs after it, plus any
+explicit ``after`` edges.
+
+File hashes are cached by modification time and size, so checking an
+unchanged tree costs a ``stat`` per file.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from graphlib import CycleError, TopologicalSorter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from scene_registry import PROJECT_ROOT
+
+STATE_FILE = PROJECT_ROOT / "media" / "build_state.json"
+
+Paths = Union[Iterable[Path], Callable[[], Iterable[Path]]]
+
+
+@dataclass
+class Step:
+    """One build step and what it depends on."""
+
+    name: str
+    # Runs the step; returning False marks it failed, so it is not recorded
+    action: Optional[Callable[[], object]] = None
+    # Files read, or a callable listing them when they only exist once earlier steps ran
+    inputs: Paths = ()
+    outputs: Iterable[Path] = ()
+    # Anything else the result depends on; must be JSON-serializable (or have a stable str)
+    values: object = None
+    after: Iterable[str] = ()
+
+    def input_paths(self) -> List[Path]:
+        paths = self.inputs() if callable(self.inputs) else self.inputs
+        return sorted(Path(path) for path in paths)
+
+
+@dataclass
+class BuildGraph:
+    """Steps of an incremental build, with the digests of their last successful runs."""
+
+    state_file: Path = STATE_FILE
+    steps: Dict[str, Step] = field(default_factory=dict)
+
+    def __post_init__(self):
+        try:
+            state = json.loads(Path(self.state_file).read_text())
+        except (OSError, ValueError):
+            state = {}
+        self.digests: Dict[str, str] = state.get("steps", {})
+        # Path -> [mtime_ns, size, sha1]
+        self.file_hashes: Dict[str, list] = state.get("files", {})
+
+    def add(self, name: str, action: Optional[Callable[[], object]] = None, **kwargs) -> Step:
+        if name in self.steps:
+            raise ValueError(f"Duplicate build step: {name}")
+        self.steps[name] = Step(name, action, **kwargs)
+        return self.steps[name]
+
+    def dependencies(self) -> Dict[str, set]:
+        """Step name -> names of the steps it runs after."""
+        producers = {Path(output): step.name for step in self.steps.values() for output in step.outputs}
+        return {
+            name: {producers[path] for path in step.input_paths() if path in producers} | set(step.after)
+            for name, step in self.steps.items()
+        }
+
+    def order(self) -> List[Step]:
+        """Steps in dependency order; raises ValueError on a cycle."""
+        try:
+            return [self.steps[name] for name in TopologicalSorter(self.dependencies()).static_order()]
+        except CycleError as e:
+            raise ValueError(f"Build steps depend on each other: {e.args[1]}") from e
+
+    def _file_hash(self, path: Path) -> Optional[str]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        cached = self.file_hashes.get(str(path))
+        if cached and cached[:2] == [stat.st_mtime_ns, stat.st_size]:
+            return cached[2]
+        hasher = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(block)
+        self.file_hashes[str(path)] = [stat.st_mtime_ns, stat.st_size, hasher.hexdigest()]
+        return hasher.hexdigest()
+
+    def digest(self, step: Step) -> str:
+        """Hash of everything ``step`` depends on, as the tree is now."""
+        hasher = hashlib.sha1(json.dumps(step.values, sort_keys=True, default=str).encode())
+        for path in step.input_paths():
+            hasher.update(f"\0{path}\0{self._file_hash(path)}".encode())
+        return hasher.hexdigest()
+
+    def is_fresh(self, step: Step) -> bool:
+        return (
+            self.digests.get(step.name) == self.digest(step)
+            and all(Path(output).exists() for output in step.outputs)
+        )
+
+    def stale(self) -> List[str]:
+        """Steps that would run, in order: changed ones and everything after them."""
+        dependencies = self.dependencies()
+        stale = []
+        for step in self.order():
+            if dependencies[step.name] & set(stale) or not self.is_fresh(step):
+                stale.append(step.name)
+        return stale
+
+    def record(self, name: str) -> None:
+        """Mark ``name`` as built from the inputs as they are now."""
+        self.digests[name] = self.digest(self.steps[name])
+        self.save()
+
+    def save(self) -> None:
+        path = Path(self.state_file)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(path.name + ".partial")
+        temporary.write_text(json.dumps({"steps": self.digests, "files": self.file_hashes}, indent=1, sort_keys=True))
+        os.replace(temporary, path)
+
+    def build(self) -> List[str]:
+        """
+        Run the steps whose inputs changed, in order; returns the names of those run.
+
+        Freshness is checked when a step's turn comes, so a step whose
+        upstream re-ran without changing its outputs is still skipped. Steps
+        without an action are recorded by whoever performs them.
+        """
+        ran = []
+        for step in self.order():
+            if step.action is None or self.is_fresh(step):
+                continue
+            ran.append(step.name)
+            if step.action() is not False:
+                self.record(step.name)
+        return ran
@@ -0,0 +1,250 @@
+"""
+Sparse bundle adjustment for pinhole cameras and 3D landmarks.
+
+Camera poses (world-to-camera) and 3D points are refined jointly by
+Levenberg-Marquardt on the reprojection residuals. The normal equations are
+block-sparse: every observation couples one camera with one point, so the
+point blocks are eliminated with a Schur complement and only the much
+smaller reduced camera system is factorized. Cameras listed as fixed keep
+their pose, which anchors the gauge (the free rigid motion of the whole
+reconstruction).
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+import scipy.linalg
+import scipy.sparse as sp
+
+from lie_groups import se3_exp, so3_hat
+from pose_store import as_pose_matrices
+
+CAM_DOF = 6
+POINT_DOF = 3
+
+
+@dataclass
+class BundleAdjustmentProblem:
+    """Cameras, points and the observations that tie them together."""
+
+    cameras: np.ndarray        # (C, 4, 4) world-to-camera transforms
+    points: np.ndarray         # (P, 3) landmark positions in the world frame
+    camera_index: np.ndarray   # (M,) camera observing each measurement
+    point_index: np.ndarray    # (M,) landmark seen by each measurement
+    observations: np.ndarray   # (M, 2) measured pixel coordinates
+    focal_length: float = 500.0
+    # Cameras whose pose is not optimized
+    fixed_cameras: Tuple[int, ...] = ()
+
+    @property
+    def num_cameras(self) -> int:
+        return len(self.cameras)
+
+    @property
+    def num_points(self) -> int:
+        return len(self.points)
+
+
+@dataclass
+class BundleAdjustmentResult:
+    """Optimized state plus the per-iteration RMS reprojection error."""
+
+    cameras: np.ndarray
+    points: np.ndarray
+    rms_history: List[float]
+    point_history: List[np.ndarray] = field(default_factory=list)
+
+
+def project(cameras: np.ndarray, points: np.ndarray, camera_index, point_index, focal_length):
+    """Return pixel projections and camera-frame points for each observation."""
+    T = cameras[camera_index]
+    p_cam = np.einsum("mij,mj->mi", T[:, :3, :3], points[point_index]) + T[:, :3, 3]
+    pixels = focal_length * p_cam[:, :2] / p_cam[:, 2:3]
+    return pixels, p_cam
+
+
+def reprojection_residuals(problem: BundleAdjustmentProblem, cameras=None, points=None) -> np.ndarray:
+    """(M, 2) difference between predicted and observed pixels."""
+    cameras = problem.cameras if cameras is None else cameras
+    points = problem.points if points is None else points
+    pixels, _ = project(cameras, points, problem.camera_index, problem.point_index, problem.focal_length)
+    return pixels - problem.observations
+
+
+def rms_error(residuals: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.sum(residuals**2, axis=-1))))
+
+
+def _jacobians(cameras, points, problem):
+    """Analytic residual Jacobians w.r.t. a left se(3) perturbation and the point."""
+    _, p_cam = project(cameras, points, problem.camera_index, problem.point_index, problem.focal_length)
+    x, y, z = p_cam[:, 0], p_cam[:, 1], p_cam[:, 2]
+    f = problem.focal_length
+    J_proj = np.zeros((len(p_cam), 2, 3))
+    J_proj[:, 0, 0] = f / z
+    J_proj[:, 0, 2] = -f * x / z**2
+    J_proj[:, 1, 1] = f / z
+    J_proj[:, 1, 2] = -f * y / z**2
+
+    # d p_cam / d (rho, theta) = [I, -[p_cam]x]
+    dp_dxi = np.concatenate([np.broadcast_to(np.eye(3), (len(p_cam), 3, 3)), -so3_hat(p_cam)], axis=2)
+    J_cam = J_proj @ dp_dxi
+    J_point = J_proj @ cameras[problem.camera_index, :3, :3]
+    return J_cam, J_point
+
+
+def _segment_sum(index: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """Sum rows of ``values`` that share the same ``index`` into ``n`` buckets."""
+    flat = values.reshape(len(values), -1)
+    indicator = sp.csr_matrix((np.ones(len(index)), (index, np.arange(len(index)))), shape=(n, len(index)))
+    return np.asarray(indicator @ flat).reshape((n,) + values.shape[1:])
+
+
+def _block_sparse(blocks: np.ndarray, rows: np.ndarray, cols: np.ndarray, shape) -> sp.csr_matrix:
+    """Scatter (M, r, c) dense blocks at block coordinates (rows, cols)."""
+    m, r, c = blocks.shape
+    ii = (rows[:, None, None] * r + np.arange(r)[None, :, None]).repeat(c, axis=2)
+    jj = (cols[:, None, None] * c + np.arange(c)[None, None, :]).repeat(r, axis=1)
+    return sp.csr_matrix((blocks.ravel(), (ii.ravel(), jj.ravel())), shape=shape)
+
+
+def schur_step(problem, cameras, points, damping: float):
+    """
+    Solve one damped Gauss-Newton step by eliminating the point blocks.
+
+    Returns the camera and point increments; those of the problem's fixed
+    cameras are zero.
+    """
+    C, P = len(cameras), len(points)
+    cam_idx, pt_idx = problem.camera_index, problem.point_index
+
+    residuals = reprojection_residuals(problem, cameras, points)
+    J_cam, J_point = _jacobians(cameras, points, problem)
+    J_cam_T = np.swapaxes(J_cam, 1, 2)
+    J_point_T = np.swapaxes(J_point, 1, 2)
+
+    U = _segment_sum(cam_idx, J_cam_T @ J_cam, C)              # (C, 6, 6)
+    V = _segment_sum(pt_idx, J_point_T @ J_point, P)           # (P, 3, 3)
+    W_blocks = J_cam_T @ J_point                                # (M, 6, 3)
+    g_cam = _segment_sum(cam_idx, (J_cam_T @ residuals[..., None])[..., 0], C)
+    g_point = _segment_sum(pt_idx, (J_point_T @ residuals[..., None])[..., 0], P)
+
+    # Marquardt damping scales the diagonal of every block
+    U[:, range(CAM_DOF), range(CAM_DOF)] *= 1 + damping
+    V[:, range(POINT_DOF), range(POINT_DOF)] *= 1 + damping
+    V_inv = np.linalg.inv(V)
+
+    W = _block_sparse(W_blocks, cam_idx, pt_idx, (C * CAM_DOF, P * POINT_DOF))
+    Y = _block_sparse(W_blocks @ V_inv[pt_idx], cam_idx, pt_idx, W.shape)  # W V^-1
+
+    # Reduced camera system: (U - W V^-1 W^T) dc = -g_c + W V^-1 g_p
+    U_diag = _block_sparse(U, np.arange(C), np.arange(C), (C * CAM_DOF, C * CAM_DOF))
+    S = (U_diag - Y @ W.T).toarray()
+    rhs = -g_cam.ravel() + Y @ g_point.ravel()
+    if problem.fixed_cameras:
+        # A fixed camera's increment is zero: drop its rows and columns from the system
+        fixed = (np.asarray(problem.fixed_cameras)[:, None] * CAM_DOF + np.arange(CAM_DOF)).ravel()
+        S[fixed, :] = 0.0
+        S[:, fixed] = 0.0
+        S[fixed, fixed] = 1.0
+        rhs[fixed] = 0.0
+    delta_cam = scipy.linalg.solve(S, rhs, assume_a="pos")
+
+    # Back-substitute the point increments independently per point
+    rhs_point = -g_point.ravel() - W.T @ delta_cam
+    delta_point = (V_inv @ rhs_point.reshape(P, POINT_DOF, 1))[..., 0]
+    return delta_cam.reshape(C, CAM_DOF), delta_point
+
+
+def solve_bundle_adjustment(
+    problem: BundleAdjustmentProblem,
+    max_iterations: int = 20,
+    initial_damping: float = 1e-3,
+    tolerance: float = 1e-6,
+    record_points: bool = False,
+) -> BundleAdjustmentResult:
+    """Run Levenberg-Marquardt with Schur-complement steps."""
+    cameras = as_pose_matrices(problem.cameras).copy()
+    points = np.array(problem.points, dtype=np.float64)
+    damping = initial_damping
+    cost = rms_error(reprojection_residuals(problem, cameras, points))
+    history = [cost]
+    point_history = [points.copy()] if record_points else []
+
+    for _ in range(max_iterations):
+        delta_cam, delta_point = schur_step(problem, cameras, points, damping)
+        new_cameras = se3_exp(delta_cam) @ cameras
+        new_points = points + delta_point
+        new_cost = rms_error(reprojection_residuals(problem, new_cameras, new_points))
+
+        if new_cost < cost:
+            converged = (cost - new_cost) < tolerance * cost
+            cameras, points, cost = new_cameras, new_points, new_cost
+            damping = max(damping / 10, 1e-9)
+            history.append(cost)
+            if record_points:
+                point_history.append(points.copy())
+            if converged:
+                break
+        else:
+            damping *= 10
+
+    return BundleAdjustmentResult(cameras, points, history, point_history)
+
+
+def look_at(center: np.ndarray, target: Optional[np.ndarray] = None) -> np.ndarray:
+    """World-to-camera transform for a camera at ``center`` looking at ``target``."""
+    target = np.zeros(3) if target is None else target
+    z = normalize_rows(target - center)
+    up = np.where(np.abs(z[..., 2:3]) > 0.99, [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])
+    x = normalize_rows(np.cross(up, z))
+    y = np.cross(z, x)
+    R_wc = np.stack([x, y, z], axis=-1)
+    T = np.zeros(center.shape[:-1] + (4, 4))
+    T[..., :3, :3] = np.swapaxes(R_wc, -1, -2)
+    T[..., :3, 3] = -np.einsum("...ji,...j->...i", R_wc, center)
+    T[..., 3, 3] = 1
+    return T
+
+
+def normalize_rows(v: np.ndarray) -> np.ndarray:
+    return v / np.linalg.norm(v, axis=-1, keepdims=True)
+
+
+def make_synthetic_problem(
+    num_cameras: int = 20,
+    num_points: int = 200,
+    observations_per_point: int = 6,
+    pixel_noise: float = 0.5,
+    pose_noise: float = 0.02,
+    point_noise: float = 0.1,
+    focal_length: float = 500.0,
+    seed: Optional[int] = 0,
+):
+    """
+    Cameras on a ring looking at a cloud of landmarks, with perturbed estimates.
+
+    Returns the noisy problem and the ground-truth (cameras, points).
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, num_cameras, endpoint=False)
+    centers = np.stack([8 * np.cos(angles), 8 * np.sin(angles), 1.5 + 0.5 * np.sin(3 * angles)], axis=1)
+    true_cameras = look_at(centers)
+    true_points = rng.uniform(-2, 2, size=(num_points, 3))
+
+    k = min(observations_per_point, num_cameras)
+    camera_index = np.argsort(rng.random((num_points, num_cameras)), axis=1)[:, :k].ravel()
+    point_index = np.repeat(np.arange(num_points), k)
+    pixels, _ = project(true_cameras, true_points, camera_index, point_index, focal_length)
+    observations = pixels + rng.normal(0, pixel_noise, pixels.shape)
+
+    noisy_cameras = se3_exp(rng.normal(0, pose_noise, (num_cameras, 6))) @ true_cameras
+    # The first camera starts at truth and stays fixed, anchoring the gauge
+    noisy_cameras[0] = true_cameras[0]
+    noisy_points = true_points + rng.normal(0, point_noise, true_points.shape)
+
+    problem = BundleAdjustmentProblem(
+        noisy_cameras, noisy_points, camera_index, point_index, observations, focal_length, fixed_cameras=(0,)
+    )
+    return problem, (true_cameras, true_points)
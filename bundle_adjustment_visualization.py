@@ -0,0 +1,89 @@
+import numpy as np
+from manim import *
+
+from bundle_adjustment import make_synthetic_problem, solve_bundle_adjustment
+from config import ProfiledScene
+
+class BundleAdjustmentVisualization(ProfiledScene, Scene):
+    """
+    A Manim scene to visualize Bundle Adjustment: camera poses and 3D landmarks
+    are refined jointly until the reprojection error reaches the pixel noise floor.
+    1. Shows noisy cameras and landmarks seen from above.
+    2. Explains the Schur complement that makes the problem tractable.
+    3. Animates the landmarks settling as the reprojection error shrinks.
+    """
+    metadata = {
+        "order": 10,
+        "title": "Bundle Adjustment",
+        "description": "Joint refinement of camera poses and landmarks with a sparse Schur-complement solver.",
+        "complexity": "Advanced",
+        "icon": "fas fa-project-diagram",
+    }
+
+    def construct(self):
+        # --- Solve first, animate the recorded iterations afterwards ---
+        problem, (_, true_points) = make_synthetic_problem(
+            num_cameras=16, num_points=120, observations_per_point=5,
+            point_noise=0.35, pose_noise=0.03, seed=3
+        )
+        # A large initial damping gives a gradual descent that reads well on screen
+        result = solve_bundle_adjustment(problem, max_iterations=15, initial_damping=10.0, record_points=True)
+
+        title = Text("Bundle Adjustment").scale(0.9).to_edge(UP)
+        self.play(Write(title))
+
+        # --- Act 1: Cameras and landmarks (top-down view) ---
+        scale = 0.32
+        view_center = LEFT * 3.2 + DOWN * 0.4
+        to_screen = lambda p: view_center + np.array([p[0], p[1], 0]) * scale
+
+        camera_centers = [-(T[:3, :3].T @ T[:3, 3]) for T in problem.cameras]
+        cameras = VGroup(*[
+            Triangle(color=BLUE, fill_opacity=1).scale(0.08).move_to(to_screen(c))
+            for c in camera_centers
+        ])
+        landmarks = VGroup(*[Dot(to_screen(p), radius=0.03, color=YELLOW) for p in result.point_history[0]])
+        truth = VGroup(*[Dot(to_screen(p), radius=0.02, color=GREEN_B, fill_opacity=0.5) for p in true_points])
+
+        subtitle = Text("Cameras + Landmarks", font_size=28).to_corner(UL).shift(DOWN * 0.6)
+        self.play(Write(subtitle), FadeIn(cameras), FadeIn(landmarks))
+        self.wait(0.5)
+
+        # --- Act 2: The sparse structure ---
+        cost = MathTex(r"\min_{T_i, X_j} \sum_{(i,j)} \| \pi(T_i X_j) - u_{ij} \|^2", font_size=36).to_corner(UR).shift(DOWN * 0.6)
+        schur = MathTex(r"(U - W V^{-1} W^T)\,\delta_c = \ldots", font_size=34).next_to(cost, DOWN, buff=0.3)
+        schur_note = Text("Eliminate 3x3 point blocks first", font_size=22).next_to(schur, DOWN, buff=0.2)
+        self.play(Write(cost))
+        self.play(Write(schur), FadeIn(schur_note))
+        self.wait(1)
+
+        # --- Act 3: Iterations shrink the reprojection error ---
+        history = result.rms_history
+        axes = Axes(
+            x_range=[0, len(history) - 1, 1],
+            y_range=[0, history[0] * 1.1, max(history[0] / 4, 0.5)],
+            x_length=5, y_length=3,
+            axis_config={"include_tip": False, "font_size": 20},
+        ).to_corner(DR).shift(UP * 0.2)
+        axes_labels = axes.get_axis_labels(Text("iteration", font_size=20), Text("RMS px", font_size=20))
+        error_value = DecimalNumber(history[0], num_decimal_places=2, font_size=36, color=RED).next_to(axes, UP, buff=0.2)
+        self.play(Create(axes), Write(axes_labels), FadeIn(error_value), FadeIn(truth))
+
+        curve = VGroup()
+        previous_point = axes.c2p(0, history[0])
+        for i in range(1, len(history)):
+            point = axes.c2p(i, history[i])
+            segment = Line(previous_point, point, color=RED, stroke_width=4)
+            targets = result.point_history[i]
+            self.play(
+                *[dot.animate.move_to(to_screen(p)) for dot, p in zip(landmarks, targets)],
+                Create(segment),
+                error_value.animate.set_value(history[i]),
+                run_time=0.6
+            )
+            curve.add(segment)
+            previous_point = point
+
+        final_text = Text("Error reaches the pixel noise floor", color=GREEN_B, font_size=28).next_to(title, DOWN, buff=0.2)
+        self.play(Write(final_text))
+        self.wait(3)
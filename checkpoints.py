@@ -0,0 +1,150 @@
+"""
+Checkpoint/resume for interrupted renders.
+
+manim writes every ``play``/``wait`` to a partial movie file named after a
+hash of the play (camera, animations and mobjects) and skips plays whose file
+already exists. Two things keep that from working as a checkpoint when a
+render is killed by a timeout or a dying worker: the file is streamed to its
+final name, so the play being written is left behind truncated but looks
+complete, and only ``max_files_cached`` files are kept, so a long scene evicts
+its own early plays.
+
+``checkpointed(scene)`` fixes both for one render. Partial movies are written
+to a temporary name and only renamed once the encoder finished cleanly. manim
+0.17-0.18 encode through an ffmpeg pipe (``open_movie_pipe``), 0.19-0.20
+through PyAV (``open_partial_movie_stream``); both are hooked. Later versions
+encode in background jobs and are not supported (see ``pyproject.toml``). Each one is
+recorded in ``checkpoints.json`` next to them, indexed by play number with the
+play's hash and the file's size. A play is reused only when the checkpoint for
+its number has the same hash and an intact file, so a retry replays the
+finished plays with animations skipped and resumes rendering at the first
+missing or invalid segment.
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+CHECKPOINT_FILE = "checkpoints.json"
+# Suffix of partial movies still being written
+PARTIAL_SUFFIX = ".partial"
+
+
+@dataclass
+class Checkpoint:
+    """A finished partial movie file."""
+
+    play: int
+    hash: str
+    file: str
+    size: int
+
+    def is_intact(self, directory: Path) -> bool:
+        path = Path(directory) / self.file
+        return path.exists() and path.stat().st_size == self.size
+
+
+@dataclass
+class ResumeReport:
+    """What a checkpointed render reused and rendered."""
+
+    reused: List[int] = field(default_factory=list)
+    rendered: List[int] = field(default_factory=list)
+
+    @property
+    def resumed_from(self) -> int:
+        """First play that had to be rendered (0 for a fresh render)."""
+        return min(self.rendered, default=len(self.reused))
+
+
+def load_checkpoints(directory: Path) -> Dict[int, Checkpoint]:
+    try:
+        records = json.loads((Path(directory) / CHECKPOINT_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    return {record["play"]: Checkpoint(**record) for record in records}
+
+
+def save_checkpoints(directory: Path, checkpoints: Dict[int, Checkpoint]) -> None:
+    """Write the index atomically, so a kill mid-write keeps the previous one."""
+    path = Path(directory) / CHECKPOINT_FILE
+    temporary = path.with_name(path.name + PARTIAL_SUFFIX)
+    temporary.write_text(json.dumps([asdict(checkpoints[play]) for play in sorted(checkpoints)], indent=1))
+    os.replace(temporary, path)
+
+
+def valid_checkpoints(directory: Path) -> Dict[int, Checkpoint]:
+    """Checkpoints whose file is still there with the recorded size."""
+    return {play: c for play, c in load_checkpoints(directory).items() if c.is_intact(directory)}
+
+
+def clear_checkpoints(directory: Path) -> None:
+    """Delete the index and every partial movie it or an interrupted write left behind."""
+    directory = Path(directory)
+    for checkpoint in load_checkpoints(directory).values():
+        (directory / checkpoint.file).unlink(missing_ok=True)
+    for leftover in directory.glob(f"*{PARTIAL_SUFFIX}*"):
+        leftover.unlink()
+    (directory / CHECKPOINT_FILE).unlink(missing_ok=True)
+
+
+def _partial_path(path: Path) -> Path:
+    # Keep the extension last so ffmpeg still picks the container from it
+    return path.with_name(f"{path.stem}{PARTIAL_SUFFIX}{path.suffix}")
+
+
+@contextmanager
+def checkpointed(scene):
+    """
+    Make ``scene``'s partial movie files resumable checkpoints while it renders.
+
+    Needs manim's caching (``disable_caching = False``); yields a
+    ``ResumeReport`` that is filled in as the plays run.
+    """
+    renderer = scene.renderer
+    writer = renderer.file_writer
+    directory = Path(writer.partial_movie_directory)
+    for leftover in directory.glob(f"*{PARTIAL_SUFFIX}*"):
+        leftover.unlink()
+    if hasattr(writer, "open_movie_pipe"):
+        open_name, close_name = "open_movie_pipe", "close_movie_pipe"
+    elif hasattr(writer, "open_partial_movie_stream") and not hasattr(writer, "_inflight_encode_jobs"):
+        open_name, close_name = "open_partial_movie_stream", "close_partial_movie_stream"
+    else:
+        raise RuntimeError(f"checkpoints do not support this manim version's {type(writer).__name__}")
+    open_movie, close_movie = getattr(writer, open_name), getattr(writer, close_name)
+    checkpoints = valid_checkpoints(directory)
+    report = ResumeReport()
+    writing = []
+
+    def is_already_cached(hash_invocation: str) -> bool:
+        checkpoint = checkpoints.get(renderer.num_plays)
+        reuse = checkpoint is not None and checkpoint.hash == hash_invocation and checkpoint.is_intact(directory)
+        (report.reused if reuse else report.rendered).append(renderer.num_plays)
+        return reuse
+
+    def open_partial_movie(file_path=None):
+        final = Path(file_path or writer.partial_movie_files[renderer.num_plays])
+        open_movie(file_path=str(_partial_path(final)))
+        writing[:] = [final]
+
+    def close_partial_movie():
+        # PyAV raises here when encoding failed; the ffmpeg pipe reports it in its exit status
+        close_movie()
+        final = writing.pop()
+        process = getattr(writer, "writing_process", None)
+        if process is not None and process.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed writing play {renderer.num_plays} ({final.name})")
+        os.replace(_partial_path(final), final)
+        checkpoints[renderer.num_plays] = Checkpoint(
+            renderer.num_plays, final.stem, final.name, final.stat().st_size,
+        )
+        save_checkpoints(directory, checkpoints)
+
+    writer.is_already_cached = is_already_cached
+    setattr(writer, open_name, open_partial_movie)
+    setattr(writer, close_name, close_partial_movie)
+    yield report
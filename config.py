@@ -5,8 +5,10 @@ This file contains customizable parameters for animations, including timing,
 colors, resolutions, and other visual settings.
 """
 
+import os
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Optional, Tuple, Union
 
 import numpy as np
 
@@ -101,6 +103,44 @@ class SceneConfig:
     se3_camera: Tuple[float, float, float] = (70, -110, 0.9)
 
 
+@dataclass
+class RenderProfile:
+    """A named render quality that drives per-scene cost."""
+    
+    name: str
+    # Multiplier on every mesh tessellation (spheres, cylinders, arrows)
+    mesh_scale: float
+    frame_rate: int
+    pixel_width: int
+    pixel_height: int
+    # Multiplier on every play() and wait() duration
+    run_time_scale: float = 1.0
+
+
+PROFILE_ENV_VAR = "SLAM_RENDER_PROFILE"
+DEFAULT_PROFILE = "final"
+MIN_MESH_RESOLUTION = 3
+
+PROFILES = {
+    "draft": RenderProfile("draft", mesh_scale=0.25, frame_rate=15, pixel_width=480, pixel_height=270, run_time_scale=0.25),
+    "preview": RenderProfile("preview", mesh_scale=0.5, frame_rate=30, pixel_width=854, pixel_height=480),
+    "final": RenderProfile("final", mesh_scale=1.0, frame_rate=60, pixel_width=1920, pixel_height=1080),
+}
+
+
+def get_profile(name: Optional[str] = None) -> RenderProfile:
+    """
+    Get a render profile by name, falling back to $SLAM_RENDER_PROFILE.
+
+    The variable is read on every call, so a CLI that selects a profile
+    after importing this module still gets it.
+    """
+    name = name or os.environ.get(PROFILE_ENV_VAR, DEFAULT_PROFILE)
+    if name not in PROFILES:
+        raise ValueError(f"Unknown render profile {name!r}, expected one of {sorted(PROFILES)}")
+    return PROFILES[name]
+
+
 # Global configuration instances
 ANIMATION = AnimationConfig()
 COLORS = ColorConfig()
@@ -108,6 +148,13 @@ MATH = MathConfig()
 SCENE = SceneConfig()
 
 
+def scale_resolution(resolution: Union[int, Tuple[int, int]]) -> Union[int, Tuple[int, int]]:
+    """Scale a full-quality mesh resolution by the active profile."""
+    if isinstance(resolution, int):
+        return max(MIN_MESH_RESOLUTION, round(resolution * get_profile().mesh_scale))
+    return tuple(scale_resolution(r) for r in resolution)
+
+
 def get_resolution(quality: str = "medium") -> Tuple[int, int]:
     """Get resolution based on quality setting."""
     resolutions = {
@@ -115,7 +162,7 @@ def get_resolution(quality: str = "medium") -> Tuple[int, int]:
         "medium": ANIMATION.medium_resolution,
         "high": ANIMATION.high_resolution,
     }
-    return resolutions.get(quality, ANIMATION.medium_resolution)
+    return scale_resolution(resolutions.get(quality, ANIMATION.medium_resolution))
 
 
 def get_camera_orientation(scene_type: str = "default") -> Tuple[float, float, float]:
@@ -125,4 +172,70 @@ def get_camera_orientation(scene_type: str = "default") -> Tuple[float, float, f
         "so3": SCENE.so3_camera,
         "se3": SCENE.se3_camera,
     }
-    return orientations.get(scene_type, SCENE.default_camera) 
\ No newline at end of file
+    return orientations.get(scene_type, SCENE.default_camera)
+
+
+def apply_profile(manim_config=None, profile: Optional[RenderProfile] = None) -> RenderProfile:
+    """
+    Push the profile's frame rate and pixel size into manim's config.
+
+    Only called when a profile was selected explicitly, so plain
+    ``manim -ql``/``-qh`` flags keep working when no profile is set.
+    """
+    profile = profile or get_profile()
+    if manim_config is None:
+        from manim import config as manim_config
+    manim_config.frame_rate = profile.frame_rate
+    manim_config.pixel_width = profile.pixel_width
+    manim_config.pixel_height = profile.pixel_height
+    return profile
+
+
+@contextmanager
+def profile_environment(profile: Optional[str]):
+    """Select ``profile`` through $SLAM_RENDER_PROFILE for child processes started inside."""
+    previous = os.environ.get(PROFILE_ENV_VAR)
+    if profile:
+        os.environ[PROFILE_ENV_VAR] = profile
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop(PROFILE_ENV_VAR, None)
+        else:
+            os.environ[PROFILE_ENV_VAR] = previous
+
+
+def _scale_run_time(animation, scale: float):
+    if not hasattr(animation, "run_time"):
+        # A ``mobject.animate`` builder: build the animation to reach its run_time
+        from manim.animation.animation import prepare_animation
+        animation = prepare_animation(animation)
+    animation.run_time *= scale
+    return animation
+
+
+class ProfiledScene:
+    """
+    Scene mixin that applies the active render profile.
+
+    Place it before the manim base class, e.g.
+    ``class MyScene(ProfiledScene, ThreeDScene)``. Every ``play`` (including
+    ``move_camera``, and ``wait``, which manim plays as a ``Wait``) is
+    stretched by ``run_time_scale``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if PROFILE_ENV_VAR in os.environ:
+            apply_profile()
+        super().__init__(*args, **kwargs)
+
+    def play(self, *animations, **kwargs):
+        scale = get_profile().run_time_scale
+        if scale != 1.0:
+            if kwargs.get("run_time") is not None:
+                kwargs["run_time"] *= scale
+            else:
+                # Each animation keeps its own length relative to the others
+                animations = [_scale_run_time(anim, scale) for anim in animations]
+        return super().play(*animations, **kwargs)
@@ -3,18 +3,21 @@ document.addEventListener('DOMContentLoaded', function() {
     const hamburger = document.querySelector('.hamburger');
     const navMenu = document.querySelector('.nav-menu');
 
-    hamburger.addEventListener('click', function() {
-        hamburger.classList.toggle('active');
-        navMenu.classList.toggle('active');
-    });
+    // The gallery page has no navigation bar
+    if (hamburger && navMenu) {
+        hamburger.addEventListener('click', function() {
+            hamburger.classList.toggle('active');
+            navMenu.classList.toggle('active');
+        });
 
-    // Close mobile menu when clicking on a link
-    document.querySelectorAll('.nav-menu a').forEach(link => {
-        link.addEventListener('click', () => {
-            hamburger.classList.remove('active');
-            navMenu.classList.remove('active');
+        // Close mobile menu when clicking on a link
+        document.querySelectorAll('.nav-menu a').forEach(link => {
+            link.addEventListener('click', () => {
+                hamburger.classList.remove('active');
+                navMenu.classList.remove('active');
+            });
         });
-    });
+    }
 
     // Smooth scrolling for anchor links
     document.querySelectorAll('a[href^="#"]').forEach(anchor => {
@@ -33,6 +36,7 @@ document.addEventListener('DOMContentLoaded', function() {
     // Navbar background on scroll
     window.addEventListener('scroll', function() {
         const navbar = document.querySelector('.navbar');
+        if (!navbar) return;
         if (window.scrollY > 50) {
             navbar.style.background = 'rgba(10, 10, 10, 0.98)';
         } else {
@@ -48,7 +52,9 @@ document.addEventListener('DOMContentLoaded', function() {
 
     const observer = new IntersectionObserver(function(entries) {
         entries.forEach(entry => {
-            if (entry.isIntersecting) {
+            if (entry.target.classList.contains('loop-preview')) {
+                toggleLoopPreview(entry.target, entry.isIntersecting);
+            } else if (entry.isIntersecting) {
                 entry.target.style.opacity = '1';
                 entry.target.style.transform = 'translateY(0)';
             }
@@ -63,10 +69,14 @@ document.addEventListener('DOMContentLoaded', function() {
         observer.observe(el);
     });
 
+    // Gallery videos: posters first, animated thumbnails only while on screen
+    setupGalleryVideos(observer);
+
     // Parallax effect for hero section
     window.addEventListener('scroll', function() {
         const scrolled = window.pageYOffset;
         const hero = document.querySelector('.hero');
+        if (!hero) return;
         const rate = scrolled * -0.5;
         hero.style.transform = `translateY(${rate}px)`;
     });
@@ -146,9 +156,51 @@ document.addEventListener('DOMContentLoaded', function() {
     createParticles();
 });
 
+// Gallery videos use preload="none", so only their posters load with the page.
+// Each card's short muted loop is fetched when it scrolls into view, paused
+// when it leaves, and replaced by the full video on click.
+function setupGalleryVideos(observer) {
+    // Posters are WebP; fall back to the JPEG where WebP cannot be shown
+    const webp = document.createElement('canvas').toDataURL('image/webp').startsWith('data:image/webp');
+    if (!webp) {
+        document.querySelectorAll('video[data-poster-fallback]').forEach(video => {
+            video.poster = video.dataset.posterFallback;
+        });
+    }
+
+    document.querySelectorAll('.loop-preview').forEach(loop => {
+        const video = loop.parentElement.querySelector('.gallery-video');
+        const showVideo = () => {
+            loop.pause();
+            loop.hidden = true;
+            observer.unobserve(loop);
+        };
+        loop.addEventListener('click', () => {
+            showVideo();
+            video.play();
+        });
+        video.addEventListener('play', showVideo);
+        observer.observe(loop);
+    });
+}
+
+function toggleLoopPreview(loop, visible) {
+    if (loop.hidden) return;
+    if (visible) {
+        if (!loop.getAttribute('src')) {
+            loop.src = loop.dataset.src;
+        }
+        // Autoplay may still be refused (e.g. data saver); the poster stays visible then
+        loop.play().catch(() => {});
+    } else {
+        loop.pause();
+    }
+}
+
 // Particle background effect
 function createParticles() {
     const hero = document.querySelector('.hero');
+    if (!hero) return;
     const particleCount = 50;
     
     for (let i = 0; i < particleCount; i++) {
@@ -227,6 +279,7 @@ document.addEventListener('keydown', function(e) {
     if (e.key === 'Escape') {
         const hamburger = document.querySelector('.hamburger');
         const navMenu = document.querySelector('.nav-menu');
+        if (!hamburger || !navMenu) return;
         hamburger.classList.remove('active');
         navMenu.classList.remove('active');
     }
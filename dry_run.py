@@ -0,0 +1,199 @@
+"""
+Headless "math-only" dry run of the scenes.
+
+Runs each scene's ``construct`` with every animation skipped and all
+rasterization disabled, and records the numbers the scene computed: every
+numeric local of ``construct`` and of the scene's own helper methods (poses,
+vectors, matrices, ``Rotation`` objects, ``PoseStore``s, numeric dataclasses)
+plus numeric attributes assigned to the scene. The result is written as
+``<Scene>.json`` and ``<Scene>.npz`` so the math can be checked without
+rendering a frame:
+
+    python dry_run.py se3_relative_pose.py
+    python dry_run.py --out media/dry_run     # every scene
+"""
+
+import argparse
+import dataclasses
+import inspect
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from pose_store import PoseStore
+
+DEFAULT_OUTPUT_DIR = Path(__file__).parent / "media" / "dry_run"
+# Arrays larger than this are left out of the artifact
+MAX_EXPORT_ELEMENTS = 1_000_000
+
+
+def _numeric_array(value) -> Optional[np.ndarray]:
+    """The value as a numeric array, or None if it is not numeric data."""
+    if isinstance(value, (bool, np.bool_)):
+        return None
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return np.asarray(value)
+    if isinstance(value, np.ndarray):
+        return value if value.dtype.kind in "iuf" else None
+    if isinstance(value, PoseStore):
+        return value.as_matrices()
+    if hasattr(value, "as_matrix") and hasattr(value, "as_rotvec"):
+        return np.asarray(value.as_matrix())  # scipy Rotation
+    if isinstance(value, (list, tuple)) and value:
+        if not all(isinstance(v, (int, float, np.number, np.ndarray, list, tuple)) for v in value):
+            return None
+        try:
+            array = np.asarray(value, dtype=np.float64)
+        except (TypeError, ValueError):
+            return None
+        return array
+    return None
+
+
+def flatten_numerics(name: str, value, out: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Add ``value`` (and numeric leaves of dicts/dataclasses) to ``out`` under ``name``."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flatten_numerics(f"{name}.{key}", item, out)
+    elif dataclasses.is_dataclass(value) and not isinstance(value, type):
+        for field in dataclasses.fields(value):
+            flatten_numerics(f"{name}.{field.name}", getattr(value, field.name), out)
+    else:
+        array = _numeric_array(value)
+        if array is not None and array.size <= MAX_EXPORT_ELEMENTS:
+            out[name] = np.array(array)
+    return out
+
+
+class NumericsRecorder:
+    """
+    Snapshot the numeric locals of selected functions as they return.
+
+    Uses ``sys.setprofile``, so the recorded code runs unmodified. A function
+    that returns several times (a helper called per case) gets ``#1``,
+    ``#2``... suffixes.
+    """
+
+    def __init__(self, functions: Iterable):
+        self._names = {f.__code__: f.__name__ for f in functions}
+        self._calls: Dict[str, int] = {}
+        self.values: Dict[str, np.ndarray] = {}
+
+    def _profile(self, frame, event, arg):
+        if event != "return" or frame.f_code not in self._names:
+            return
+        name = self._names[frame.f_code]
+        count = self._calls[name] = self._calls.get(name, 0) + 1
+        prefix = name if count == 1 else f"{name}#{count}"
+        if count == 2:
+            # Retroactively tag the first call too, so every call is numbered
+            for key in [k for k in self.values if k.split(".")[0] == name]:
+                self.values[f"{name}#1" + key[len(name):]] = self.values.pop(key)
+        for var, value in frame.f_locals.items():
+            if var != "self":
+                flatten_numerics(f"{prefix}.{var}", value, self.values)
+
+    def __enter__(self):
+        self._previous = sys.getprofile()
+        sys.setprofile(self._profile)
+        return self
+
+    def __exit__(self, *exc):
+        sys.setprofile(self._previous)
+        return False
+
+
+def own_methods(cls) -> List:
+    """Plain functions defined by ``cls`` and its bases from the same module."""
+    return [
+        member
+        for klass in cls.__mro__ if klass.__module__ == cls.__module__
+        for member in vars(klass).values() if inspect.isfunction(member)
+    ]
+
+
+def record_numerics(obj, method: str = "construct") -> Dict[str, np.ndarray]:
+    """Call ``obj.<method>()`` and return the numerics of its class's own methods."""
+    before = set(vars(obj))
+    with NumericsRecorder(own_methods(type(obj))) as recorder:
+        getattr(obj, method)()
+    for attr in set(vars(obj)) - before:
+        flatten_numerics(f"self.{attr}", getattr(obj, attr), recorder.values)
+    return recorder.values
+
+
+def export_numerics(values: Dict[str, np.ndarray], directory: Path, name: str) -> Dict[str, Path]:
+    """Write ``<name>.json`` (shape, dtype and nested values) and ``<name>.npz``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    payload = {
+        key: {"shape": list(value.shape), "dtype": str(value.dtype), "value": value.tolist()}
+        for key, value in sorted(values.items())
+    }
+    json_path = directory / f"{name}.json"
+    json_path.write_text(json.dumps(payload, indent=1))
+    npz_path = directory / f"{name}.npz"
+    np.savez(npz_path, **values)
+    return {"json": json_path, "npz": npz_path}
+
+
+@contextmanager
+def headless_scene(scene_cls):
+    """A set-up ``scene_cls`` instance whose animations are skipped and never rasterized."""
+    from manim import tempconfig
+
+    settings = {
+        "dry_run": True,
+        "skip_animations": True,
+        "write_to_movie": False,
+        "save_last_frame": False,
+        "disable_caching": True,
+    }
+    with tempconfig(settings):
+        scene = scene_cls()
+        renderer = scene.renderer
+        noop = lambda *args, **kwargs: None
+        renderer.update_frame = noop
+        renderer.render = noop
+        renderer.save_static_frame_data = noop
+        scene.setup()
+        yield scene
+
+
+def dry_run_scene(scene_cls) -> Dict[str, np.ndarray]:
+    """Run ``scene_cls.construct`` with animations skipped and nothing rasterized."""
+    with headless_scene(scene_cls) as scene:
+        return record_numerics(scene)
+
+
+def main():
+    from scene_registry import discover_scenes, filter_scenes
+
+    parser = argparse.ArgumentParser(description="Export scene numerics without rendering.")
+    parser.add_argument("files", nargs="*", type=Path, help="Scene modules (default: all)")
+    parser.add_argument("--scene", action="append", help="Only these scene classes")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT_DIR, help="Output directory")
+    args = parser.parse_args()
+
+    failed = False
+    for entry in filter_scenes(discover_scenes(args.files or None), args.scene):
+        start = time.perf_counter()
+        try:
+            values = dry_run_scene(entry.load())
+        except Exception as e:
+            print(f"❌ {entry.name}: {e}")
+            failed = True
+            continue
+        paths = export_numerics(values, args.out, entry.name)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✅ {entry.name}: {len(values)} values in {elapsed:.0f} ms -> {paths['json']}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
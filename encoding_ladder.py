@@ -0,0 +1,347 @@
+"""
+Encoding ladder for the gallery previews.
+
+Each rendered preview is re-encoded into several resolutions and codecs with
+the local ffmpeg: H.264 in MP4 for every browser, VP9 in WebM and, when
+ffmpeg has an AV1 encoder, AV1 in WebM. Rungs above the source resolution
+are dropped; a source smaller than every rung gets a single rung at its own
+height.
+
+Bitrates are picked per scene: a quick constant-quality probe encode measures
+how many bits per pixel the scene needs (a mostly flat diagram compresses far
+better than a dense point cloud), and the scene's complexity class scales the
+rung bitrate caps and shifts the quality target.
+
+The gallery lists the variants as ``<source>`` elements, most efficient codec
+first and, within a codec, smaller heights behind a ``media`` query, so a
+browser fetches the smallest variant it can play for its screen. Encodes run
+in a thread pool (ffmpeg does the work) and are skipped when the preview and
+the settings did not change since the last run, as recorded in
+``ladder.json``. A scene with a failed rung is encoded again on the next run:
+
+    python encoding_ladder.py docs/previews -j 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+import manifests
+from site_assets import is_fingerprinted
+
+FFMPEG = "ffmpeg"
+FFPROBE = "ffprobe"
+MANIFEST_FILE = "ladder.json"
+
+
+@dataclass(frozen=True)
+class Codec:
+    """An output format and how to drive its encoder."""
+
+    name: str
+    # Encoders to try, in order of preference
+    encoders: tuple
+    extension: str
+    mime_type: str
+    # Bitrate relative to H.264 at the same quality
+    efficiency: float
+    crf: int
+
+
+CODECS = {
+    "av1": Codec("av1", ("libsvtav1", "libaom-av1"), "webm", 'video/webm; codecs="av01.0.05M.08"', 0.6, 35),
+    "vp9": Codec("vp9", ("libvpx-vp9",), "webm", 'video/webm; codecs="vp9"', 0.7, 33),
+    "h264": Codec("h264", ("libx264",), "mp4", 'video/mp4; codecs="avc1.640028"', 1.0, 23),
+}
+# Most efficient first: browsers take the first <source> they can play
+CODEC_ORDER = ("av1", "vp9", "h264")
+# H.264 bitrate cap (kbit/s) per height for a scene of normal complexity
+HEIGHT_KBPS = {360: 500, 480: 900, 720: 1800, 1080: 3500}
+# Viewports that get a rung; the largest rung of a codec has no condition
+HEIGHT_MEDIA = {360: "(max-width: 640px)", 480: "(max-width: 1024px)", 720: "(max-width: 1600px)"}
+
+# Bits per pixel of the probe encode (x264, CRF 23) that separate the classes
+SIMPLE_BPP = 0.03
+DETAILED_BPP = 0.1
+# class -> (bitrate factor, CRF offset)
+COMPLEXITY = {"simple": (0.6, 3), "normal": (1.0, 0), "detailed": (1.5, -2)}
+PROBE_HEIGHT = 360
+PROBE_SECONDS = 20
+# Keyframe interval, so scrubbing a preview stays cheap
+KEYFRAME_SECONDS = 2
+
+
+@dataclass(frozen=True)
+class Rung:
+    """One variant to encode: a height in one codec."""
+
+    codec: str
+    height: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.height}p-{self.codec}"
+
+
+@dataclass
+class Variant:
+    """An encoded variant as listed in the manifest."""
+
+    file: str
+    codec: str
+    height: int
+    kbps: int
+    type: str
+    bytes: int
+
+
+def available_encoders(ffmpeg: str = FFMPEG) -> Set[str]:
+    """Names of the video encoders the local ffmpeg was built with."""
+    result = subprocess.run([ffmpeg, "-hide_banner", "-encoders"], capture_output=True, text=True, check=True)
+    return {
+        fields[1] for fields in (line.split() for line in result.stdout.splitlines())
+        if len(fields) > 1 and fields[0].startswith("V")
+    }
+
+
+def encoder_for(codec: str, encoders: Set[str]) -> Optional[str]:
+    return next((e for e in CODECS[codec].encoders if e in encoders), None)
+
+
+def ladder_rungs(source_height: int, encoders: Set[str]) -> List[Rung]:
+    """Rungs for a source of ``source_height``: no upscaling, only codecs ffmpeg can encode."""
+    # yuv420p needs an even height
+    heights = [h for h in sorted(HEIGHT_KBPS) if h <= source_height] or [source_height - source_height % 2]
+    return [
+        Rung(codec, height) for codec in CODEC_ORDER if encoder_for(codec, encoders)
+        for height in heights
+    ]
+
+
+def complexity_class(bits_per_pixel: float) -> str:
+    if bits_per_pixel < SIMPLE_BPP:
+        return "simple"
+    return "detailed" if bits_per_pixel > DETAILED_BPP else "normal"
+
+
+def height_kbps(height: int) -> float:
+    """H.264 bitrate cap for ``height``; heights below the ladder scale the smallest rung's by pixel count."""
+    if height in HEIGHT_KBPS:
+        return HEIGHT_KBPS[height]
+    smallest = min(HEIGHT_KBPS)
+    return HEIGHT_KBPS[smallest] * (height / smallest) ** 2
+
+
+def rung_kbps(rung: Rung, bits_per_pixel: float) -> int:
+    factor, _ = COMPLEXITY[complexity_class(bits_per_pixel)]
+    return int(round(height_kbps(rung.height) * CODECS[rung.codec].efficiency * factor))
+
+
+def encoder_args(rung: Rung, encoder: str, bits_per_pixel: float, fps: float) -> List[str]:
+    """ffmpeg output options: constrained quality, capped at the rung's bitrate."""
+    codec = CODECS[rung.codec]
+    _, crf_offset = COMPLEXITY[complexity_class(bits_per_pixel)]
+    crf, kbps = codec.crf + crf_offset, rung_kbps(rung, bits_per_pixel)
+    args = ["-vf", f"scale=-2:{rung.height}", "-an", "-pix_fmt", "yuv420p", "-g", str(int(round(fps * KEYFRAME_SECONDS)))]
+    if encoder == "libx264":
+        args += ["-c:v", encoder, "-preset", "slow", "-crf", str(crf), "-profile:v", "high",
+                 "-maxrate", f"{kbps}k", "-bufsize", f"{2 * kbps}k", "-movflags", "+faststart"]
+    elif encoder == "libvpx-vp9":
+        # With -crf, -b:v is the cap of constrained-quality mode
+        args += ["-c:v", encoder, "-crf", str(crf), "-b:v", f"{kbps}k", "-deadline", "good", "-cpu-used", "2", "-row-mt", "1"]
+    elif encoder == "libsvtav1":
+        args += ["-c:v", encoder, "-crf", str(crf), "-preset", "8", "-svtav1-params", f"mbr={kbps}"]
+    else:
+        args += ["-c:v", encoder, "-crf", str(crf), "-b:v", f"{kbps}k", "-cpu-used", "6", "-row-mt", "1"]
+    return args
+
+
+def probe_video(path: Path, ffprobe: str = FFPROBE) -> Dict[str, float]:
+    """Width, height, frame rate and duration of ``path``."""
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-select_streams", "v:0", "-show_entries",
+         "stream=width,height,r_frame_rate:format=duration", "-of", "json", str(path)],
+        capture_output=True, text=True, check=True,
+    )
+    info = json.loads(result.stdout)
+    stream = info["streams"][0]
+    numerator, denominator = stream["r_frame_rate"].split("/")
+    return {
+        "width": int(stream["width"]),
+        "height": int(stream["height"]),
+        "fps": float(numerator) / float(denominator),
+        "duration": float(info["format"]["duration"]),
+    }
+
+
+def measure_complexity(path: Path, info: Dict[str, float], ffmpeg: str = FFMPEG) -> float:
+    """Bits per pixel of a fast constant-quality encode of the first seconds at the probe height."""
+    height = min(PROBE_HEIGHT, int(info["height"]))
+    width = info["width"] * height / info["height"]
+    seconds = min(PROBE_SECONDS, info["duration"])
+    with tempfile.TemporaryDirectory() as tmp:
+        probe = Path(tmp) / "probe.mkv"
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-nostdin", "-t", str(seconds), "-i", str(path),
+             "-vf", f"scale=-2:{height}", "-an", "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", str(probe)],
+            check=True,
+        )
+        bits = probe.stat().st_size * 8
+    return bits / max(width * height * info["fps"] * seconds, 1.0)
+
+
+def file_hash(path: Path) -> str:
+    hasher = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()[:16]
+
+
+def settings_key() -> str:
+    """Changes whenever the ladder or the encoder settings do."""
+    return manifests.settings_key(CODECS, HEIGHT_KBPS, COMPLEXITY, SIMPLE_BPP, DETAILED_BPP, KEYFRAME_SECONDS)
+
+
+def load_manifest(directory: Path) -> Dict[str, dict]:
+    return manifests.read_manifest(Path(directory) / MANIFEST_FILE)
+
+
+def save_manifest(directory: Path, manifest: Dict[str, dict]) -> None:
+    manifests.write_manifest(Path(directory) / MANIFEST_FILE, manifest)
+
+
+def load_ladder(directory: Path) -> Dict[str, List[Variant]]:
+    """The variants per scene from the last ``build_ladder`` run, without encoding anything."""
+    return {scene: [Variant(**v) for v in entry["variants"]] for scene, entry in load_manifest(directory).items()}
+
+
+def up_to_date(entry: Optional[dict], source_hash: str, directory: Path) -> bool:
+    """Whether a manifest entry still describes the current source and settings."""
+    return (
+        entry is not None
+        and entry.get("source_hash") == source_hash
+        and entry.get("settings") == settings_key()
+        and not entry.get("failed")
+        and all((Path(directory) / v["file"]).exists() for v in entry["variants"])
+    )
+
+
+def encode_variant(source: Path, output: Path, args: List[str], ffmpeg: str = FFMPEG) -> Path:
+    partial = output.with_name(f"{output.stem}.partial{output.suffix}")
+    subprocess.run([ffmpeg, "-y", "-loglevel", "error", "-nostdin", "-i", str(source), *args, str(partial)], check=True)
+    os.replace(partial, output)
+    return output
+
+
+def build_ladder(
+    sources: Dict[str, Path],
+    directory: Path,
+    jobs: int = 2,
+    ffmpeg: str = FFMPEG,
+    force: bool = False,
+) -> Dict[str, List[Variant]]:
+    """
+    Encode every scene's ladder into ``directory``; returns the variants per scene.
+
+    ``sources`` maps scene names to their rendered previews.
+    """
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    encoders = available_encoders(ffmpeg)
+    hashes = {scene: file_hash(source) for scene, source in sources.items()}
+    stale = {
+        scene: (source, hashes[scene]) for scene, source in sources.items()
+        if force or not up_to_date(manifest.get(scene), hashes[scene], directory)
+    }
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        infos = dict(zip(stale, pool.map(lambda item: probe_video(item[0]), stale.values())))
+        complexity = dict(zip(stale, pool.map(
+            lambda scene: measure_complexity(stale[scene][0], infos[scene], ffmpeg), stale,
+        )))
+        tasks = {}
+        for scene, (source, _) in stale.items():
+            info, bpp = infos[scene], complexity[scene]
+            for rung in ladder_rungs(int(info["height"]), encoders):
+                output = directory / f"{scene}-{rung.label}.{CODECS[rung.codec].extension}"
+                args = encoder_args(rung, encoder_for(rung.codec, encoders), bpp, info["fps"])
+                tasks[scene, rung] = (output, pool.submit(encode_variant, source, output, args, ffmpeg))
+
+    for scene, (source, source_hash) in stale.items():
+        # A rung whose encode failed is left out rather than failing the whole ladder,
+        # and recorded so the next run tries again
+        scene_tasks = [(rung, output, future) for (name, rung), (output, future) in tasks.items() if name == scene]
+        variants = [
+            Variant(output.name, rung.codec, rung.height, rung_kbps(rung, complexity[scene]),
+                    CODECS[rung.codec].mime_type, output.stat().st_size)
+            for rung, output, future in scene_tasks if future.exception() is None
+        ]
+        manifest[scene] = {
+            "source_hash": source_hash,
+            "settings": settings_key(),
+            "complexity": complexity_class(complexity[scene]),
+            "bits_per_pixel": round(complexity[scene], 4),
+            "variants": [asdict(v) for v in variants],
+            "failed": [rung.label for rung, _, future in scene_tasks if future.exception() is not None],
+        }
+    save_manifest(directory, manifest)
+    return {
+        scene: [Variant(**v) for v in manifest[scene]["variants"]]
+        for scene in sources if scene in manifest
+    }
+
+
+def source_tags(variants: Iterable[Variant], prefix: str = "previews/", indent: str = "") -> str:
+    """``<source>`` elements for ``variants``: best codec first, small heights behind media queries."""
+    by_codec: Dict[str, List[Variant]] = {}
+    for variant in variants:
+        by_codec.setdefault(variant.codec, []).append(variant)
+    lines = []
+    for codec in sorted(by_codec, key=CODEC_ORDER.index):
+        ladder = sorted(by_codec[codec], key=lambda v: v.height)
+        for variant in ladder:
+            media = HEIGHT_MEDIA.get(variant.height) if variant is not ladder[-1] else None
+            media_attribute = f' media="{media}"' if media else ""
+            lines.append(f"""{indent}<source src="{prefix}{variant.file}" type='{variant.type}'{media_attribute}>""")
+    return "\n".join(lines)
+
+
+def preview_sources(directory: Path) -> Dict[str, Path]:
+    """
+    Rendered previews in ``directory`` by scene.
+
+    Previews are ``<Scene>.mp4``; ladder variants and thumbnails carry a
+    suffix after a dash, and site_assets.py's fingerprinted copies
+    (``<Scene>.<hash>.mp4``) are published outputs, not sources.
+    """
+    return {
+        path.stem: path for path in sorted(Path(directory).glob("*.mp4"))
+        if "-" not in path.stem and not is_fingerprinted(path.name)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode the preview videos into a resolution/codec ladder.")
+    parser.add_argument("directory", type=Path, nargs="?", default=Path(__file__).parent / "docs" / "previews")
+    parser.add_argument("-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Parallel encodes")
+    parser.add_argument("--force", action="store_true", help="Re-encode even if nothing changed")
+    args = parser.parse_args()
+
+    ladder = build_ladder(preview_sources(args.directory), args.directory, args.jobs, force=args.force)
+    for scene, variants in ladder.items():
+        sizes = ", ".join(f"{v.height}p {v.codec} {v.bytes / 1e6:.1f} MB" for v in variants)
+        print(f"🎞️  {scene}: {sizes}")
+    sys.exit(0 if ladder else 1)
+
+
+if __name__ == "__main__":
+    main()
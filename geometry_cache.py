@@ -0,0 +1,254 @@
+"""
+On-disk cache of tessellated surface geometry.
+
+Building a ``Sphere``, ``Cylinder`` or ``Arrow3D`` evaluates its
+parametric function over a uv grid and converts every grid cell into a
+Bézier face, every time a scene runs. The face vertex arrays only depend on
+the primitive type and its geometric parameters, so they are stored once as
+an uncompressed ``.npz`` keyed by a hash of those parameters and shared by
+every scene and render process. Restoring still creates a styled copy of a
+template face per face, so ``benchmark.py --group geometry`` measures what
+the cache saves against building the primitive directly.
+
+Uncompressed ``.npz`` members are plain ``.npy`` files laid out contiguously
+inside the zip, so ``load_arrays`` memory-maps them in place instead of
+reading them. Writes go to a temporary file that is atomically renamed, so
+concurrent renders never see a partial entry.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+CACHE_ENV_VAR = "SLAM_GEOMETRY_CACHE"
+DEFAULT_CACHE_DIR = Path(__file__).parent / "media" / "geometry_cache"
+# Bump when the stored layout changes
+CACHE_VERSION = 1
+
+# Size of the fixed part of a zip local file header
+_LOCAL_HEADER_SIZE = 30
+
+
+def cache_dir() -> Path:
+    return Path(os.environ.get(CACHE_ENV_VAR, DEFAULT_CACHE_DIR))
+
+
+def cache_key(kind: str, **params) -> str:
+    """Stable file stem for a primitive type and its geometric parameters."""
+    canonical = json.dumps(
+        {"kind": kind, "version": CACHE_VERSION, **params},
+        sort_keys=True,
+        default=lambda value: np.asarray(value).tolist(),
+    )
+    return f"{kind}-{hashlib.sha1(canonical.encode()).hexdigest()[:16]}"
+
+
+def save_arrays(path: Path, arrays: Dict[str, np.ndarray]) -> Path:
+    """Write ``arrays`` as an uncompressed ``.npz``, atomically."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+def load_arrays(path: Path) -> Dict[str, np.ndarray]:
+    """
+    Memory-map every member of an uncompressed ``.npz``.
+
+    Falls back to a regular load for compressed members.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            name = info.filename[:-len(".npy")]
+            if info.compress_type != zipfile.ZIP_STORED:
+                arrays[name] = np.load(archive.open(info))
+                continue
+            f.seek(info.header_offset)
+            header = f.read(_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            f.seek(info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject or 0 in shape:
+                arrays[name] = np.load(archive.open(info), allow_pickle=False)
+                continue
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+
+def cached_arrays(
+    kind: str,
+    build: Callable[[], Dict[str, np.ndarray]],
+    directory: Optional[Path] = None,
+    **params,
+) -> Dict[str, np.ndarray]:
+    """Load the arrays for ``kind``/``params``, building and storing them on a miss."""
+    path = Path(directory or cache_dir()) / f"{cache_key(kind, **params)}.npz"
+    if path.exists():
+        try:
+            return load_arrays(path)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            pass  # Corrupt or foreign file: rebuild it below
+    save_arrays(path, build())
+    return load_arrays(path)
+
+
+# --- Surface snapshots --------------------------------------------------------
+
+def _is_face(mobject) -> bool:
+    return hasattr(mobject, "u_index")
+
+
+def _surfaces(mobject):
+    """Family members whose direct children include uv faces."""
+    return [m for m in mobject.get_family() if any(_is_face(s) for s in m.submobjects)]
+
+
+def snapshot_faces(mobject) -> Dict[str, np.ndarray]:
+    """Face points and uv indices of every surface in ``mobject``'s family."""
+    arrays = {}
+    for k, surface in enumerate(_surfaces(mobject)):
+        faces = [s for s in surface.submobjects if _is_face(s)]
+        arrays[f"points_{k}"] = np.concatenate([face.points for face in faces])
+        arrays[f"offsets_{k}"] = np.cumsum([0] + [len(face.points) for face in faces])
+        arrays[f"uv_{k}"] = np.array([(face.u_index, face.v_index) for face in faces])
+    return arrays
+
+
+def restore_faces(shell, arrays: Dict[str, np.ndarray]):
+    """
+    Replace the faces of a cheaply built ``shell`` with cached ones.
+
+    ``shell`` must be the same primitive type as the snapshot, built at a
+    low resolution with the desired style. Restored faces copy the style of
+    a shell face with the same checkerboard parity.
+    """
+    for k, surface in enumerate(_surfaces(shell)):
+        shell_faces = [s for s in surface.submobjects if _is_face(s)]
+        others = [s for s in surface.submobjects if not _is_face(s)]
+        num_colors = len(getattr(surface, "checkerboard_colors", None) or [None])
+        templates = {}
+        for face in shell_faces:
+            templates.setdefault((face.u_index + face.v_index) % num_colors, face)
+
+        points, offsets, uv = arrays[f"points_{k}"], arrays[f"offsets_{k}"], arrays[f"uv_{k}"]
+        faces = []
+        for i, (u_index, v_index) in enumerate(uv):
+            face = templates.get((u_index + v_index) % num_colors, shell_faces[0]).copy()
+            face.points = np.array(points[offsets[i]:offsets[i + 1]])
+            face.u_index, face.v_index = int(u_index), int(v_index)
+            faces.append(face)
+        surface.submobjects = faces + others
+    return shell
+
+
+def _cached_primitive(kind: str, constructor, geometry: dict, shell_geometry: dict, style: dict):
+    import manim
+
+    arrays = cached_arrays(
+        kind, lambda: snapshot_faces(constructor(**geometry)),
+        manim_version=manim.__version__, **geometry,
+    )
+    shell = constructor(**{**geometry, **shell_geometry}, **style)
+    restore_faces(shell, arrays)
+    if "resolution" in geometry:
+        shell.resolution = geometry["resolution"]
+    return shell
+
+
+# Resolution of the throwaway shell that cached faces are poured into
+SHELL_RESOLUTION = 3
+
+
+def cached_sphere(radius: float = 1.0, resolution=(32, 32), center=(0, 0, 0), **style):
+    """A ``Sphere`` whose faces come from the geometry cache."""
+    from manim import Sphere
+
+    geometry = dict(radius=radius, resolution=tuple(resolution))
+    shell = (SHELL_RESOLUTION, SHELL_RESOLUTION)
+    return _cached_primitive("sphere", Sphere, geometry, dict(resolution=shell), style).shift(np.asarray(center))
+
+
+def cached_cylinder(radius: float = 1.0, height: float = 2.0, direction=(0, 0, 1), resolution=(24, 24), **style):
+    """A ``Cylinder`` whose faces come from the geometry cache."""
+    from manim import Cylinder
+
+    geometry = dict(radius=radius, height=height, direction=np.asarray(direction, dtype=float), resolution=tuple(resolution))
+    shell = (SHELL_RESOLUTION, SHELL_RESOLUTION)
+    return _cached_primitive("cylinder", Cylinder, geometry, dict(resolution=shell), style)
+
+
+def _arrow_rotation(direction: np.ndarray) -> np.ndarray:
+    """The rotation manim gives a cylinder or cone along ``direction``: about Y, then about Z."""
+    theta = np.arccos(np.clip(direction[2], -1.0, 1.0))
+    phi = np.arctan2(direction[1], direction[0])
+    about_y = np.array([[np.cos(theta), 0, np.sin(theta)], [0, 1, 0], [-np.sin(theta), 0, np.cos(theta)]])
+    about_z = np.array([[np.cos(phi), -np.sin(phi), 0], [np.sin(phi), np.cos(phi), 0], [0, 0, 1]])
+    return about_z @ about_y
+
+
+def place_arrow(arrays: Dict[str, np.ndarray], start, end, height: float) -> Dict[str, np.ndarray]:
+    """
+    Move the faces of the canonical arrow (see ``cached_arrow3d``) between ``start`` and ``end``.
+
+    The unit shaft is stretched along its axis to the shaft length, the cone
+    moved to its tip, and both rotated and shifted into place.
+    """
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    length = np.linalg.norm(end - start)
+    rotation = _arrow_rotation((end - start) / length if length else np.array([0.0, 0.0, 1.0]))
+    shaft = length - height
+    placed = dict(arrays)
+    for name in arrays:
+        if not name.startswith("points_"):
+            continue
+        points = np.array(arrays[name])
+        if name == "points_0":
+            points[:, 2] *= shaft
+        else:
+            points[:, 2] += shaft - 1.0
+        placed[name] = points @ rotation.T + start
+    return placed
+
+
+def cached_arrow3d(start, end, thickness: float = 0.02, height: float = 0.3, base_radius: float = 0.08, resolution: int = 24, **style):
+    """
+    An ``Arrow3D`` (shaft and cone) whose faces come from the geometry cache.
+
+    One canonical arrow is cached per thickness, tip size and resolution:
+    along +Z from the origin with a shaft of length 1. Every arrow with those
+    parameters is placed from it with ``place_arrow``, whatever its vector.
+    """
+    import manim
+    from manim import Arrow3D
+
+    geometry = dict(thickness=thickness, height=height, base_radius=base_radius, resolution=resolution)
+    arrays = cached_arrays(
+        "arrow3d", lambda: snapshot_faces(Arrow3D(start=np.zeros(3), end=np.array([0.0, 0.0, 1.0 + height]), **geometry)),
+        manim_version=manim.__version__, **geometry,
+    )
+    shell = Arrow3D(start=start, end=end, **{**geometry, "resolution": SHELL_RESOLUTION}, **style)
+    restore_faces(shell, place_arrow(arrays, start, end, height))
+    shell.resolution = resolution
+    return shell
@@ -0,0 +1,201 @@
+"""
+Golden-frame visual regression checks.
+
+Instead of rendering and watching a video, each scene is run headless (see
+``dry_run``) and only a handful of timestamps are rasterized, at a small
+resolution, into in-memory arrays. Each frame is reduced to a 64-bit
+perceptual hash (DCT of the downscaled luminance, as in pHash) plus its mean
+color, and compared with the values stored in ``tests/golden_frames.json``:
+a small Hamming distance tolerates anti-aliasing and font differences while a
+moved, missing or recolored object does not pass.
+
+    python golden_frames.py --update SE3RelativePose   # accept the current look
+    python golden_frames.py                            # check every scene
+    pytest tests/test_golden_frames.py
+"""
+
+import argparse
+import json
+import random
+import sys
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import scipy.fft
+
+GOLDEN_FILE = Path(__file__).parent / "tests" / "golden_frames.json"
+FRAME_SIZE = (320, 180)
+# Seconds into the scene to check; later ones than the scene's end are dropped
+DEFAULT_TIMES = (1.0, 4.0, 8.0, 15.0)
+GOLDEN_TIMES: Dict[str, Tuple[float, ...]] = {}
+# pHash: the hash is the low HASH_SIZE x HASH_SIZE DCT block of a
+# (HASH_SIZE * HIGHFREQ_FACTOR)^2 grayscale thumbnail
+HASH_SIZE = 8
+HIGHFREQ_FACTOR = 4
+MAX_HASH_DISTANCE = 6
+# Largest allowed change of the mean color, per channel on a 0-255 scale
+MAX_COLOR_DIFFERENCE = 6.0
+# Scenes that draw random noise are seeded so frames are reproducible
+SEED = 0
+
+
+def _thumbnail(gray: np.ndarray, size: int) -> np.ndarray:
+    """Area-average ``gray`` down to ``size`` x ``size``."""
+    rows = np.linspace(0, gray.shape[0], size + 1).astype(int)
+    cols = np.linspace(0, gray.shape[1], size + 1).astype(int)
+    sums = np.add.reduceat(np.add.reduceat(gray, rows[:-1], axis=0), cols[:-1], axis=1)
+    return sums / np.outer(np.diff(rows), np.diff(cols))
+
+
+def perceptual_hash(frame: np.ndarray) -> str:
+    """64-bit pHash of an RGB(A) frame, as 16 hex digits."""
+    rgb = np.asarray(frame, dtype=np.float64)[..., :3]
+    gray = rgb @ np.array([0.299, 0.587, 0.114])
+    dct = scipy.fft.dctn(_thumbnail(gray, HASH_SIZE * HIGHFREQ_FACTOR), norm="ortho")
+    low = dct[:HASH_SIZE, :HASH_SIZE].ravel()
+    bits = low > np.median(low[1:])
+    return f"{int(''.join('1' if b else '0' for b in bits), 2):0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def hash_distance(a: str, b: str) -> int:
+    """Number of differing bits between two hashes."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+
+@dataclass
+class GoldenFrame:
+    """Fingerprint of the frame at ``time`` seconds."""
+
+    time: float
+    hash: str
+    mean_rgb: List[float]
+
+    @classmethod
+    def from_frame(cls, time: float, frame: np.ndarray) -> "GoldenFrame":
+        mean = np.asarray(frame, dtype=np.float64)[..., :3].reshape(-1, 3).mean(axis=0)
+        return cls(round(time, 3), perceptual_hash(frame), [round(float(c), 2) for c in mean])
+
+
+def compare_frames(expected: Sequence[dict], actual: Sequence[GoldenFrame]) -> List[str]:
+    """Descriptions of every frame that differs from its golden fingerprint."""
+    problems = []
+    actual_by_time = {frame.time: frame for frame in actual}
+    for golden in expected:
+        frame = actual_by_time.get(golden["time"])
+        if frame is None:
+            problems.append(f"t={golden['time']}s: no frame (the scene got shorter?)")
+            continue
+        distance = hash_distance(golden["hash"], frame.hash)
+        color = float(np.max(np.abs(np.subtract(golden["mean_rgb"], frame.mean_rgb))))
+        if distance > MAX_HASH_DISTANCE:
+            problems.append(f"t={golden['time']}s: hash differs by {distance} bits (> {MAX_HASH_DISTANCE})")
+        elif color > MAX_COLOR_DIFFERENCE:
+            problems.append(f"t={golden['time']}s: mean color moved by {color:.1f} (> {MAX_COLOR_DIFFERENCE})")
+    extra = sorted(set(actual_by_time) - {golden["time"] for golden in expected})
+    if extra:
+        problems.append(f"frames without a golden fingerprint at {extra} (the scene got longer?)")
+    return problems
+
+
+def capture_frames(scene_cls, times: Sequence[float], size: Tuple[int, int] = FRAME_SIZE) -> List[Tuple[float, np.ndarray]]:
+    """
+    Rasterize ``scene_cls`` at each of ``times`` (seconds), skipping everything else.
+
+    Animations run headless; right before a play that spans a requested
+    time, the scene is advanced to that point of the play and drawn.
+    """
+    from manim import tempconfig
+
+    from dry_run import headless_scene
+
+    np.random.seed(SEED)
+    random.seed(SEED)
+    pending = sorted(times)
+    captured = []
+    with tempconfig({"pixel_width": size[0], "pixel_height": size[1]}):
+        with headless_scene(scene_cls) as scene:
+            renderer = scene.renderer
+
+            def snapshot(t):
+                # The headless scene stubs update_frame on the instance; call the real one
+                type(renderer).update_frame(renderer, scene)
+                captured.append((t, np.array(renderer.get_frame())))
+
+            play_internal = scene.play_internal
+
+            def capturing_play_internal(*args, **kwargs):
+                # Skipped plays advance the renderer's clock before they run
+                start = renderer.time - scene.duration
+                while pending and pending[0] < renderer.time:
+                    t = pending.pop(0)
+                    scene.update_to_time(t - start)
+                    snapshot(t)
+                return play_internal(*args, **kwargs)
+
+            play = renderer.play
+
+            def capturing_play(*args, **kwargs):
+                result = play(*args, **kwargs)
+                # Waits are frozen frames and never reach play_internal
+                while pending and pending[0] < renderer.time:
+                    snapshot(pending.pop(0))
+                return result
+
+            scene.play_internal = capturing_play_internal
+            renderer.play = capturing_play
+            scene.construct()
+    return captured
+
+
+def scene_fingerprints(scene_cls, times: Optional[Sequence[float]] = None) -> List[GoldenFrame]:
+    times = times or GOLDEN_TIMES.get(scene_cls.__name__, DEFAULT_TIMES)
+    return [GoldenFrame.from_frame(t, frame) for t, frame in capture_frames(scene_cls, times)]
+
+
+def load_golden(path: Path = GOLDEN_FILE) -> Dict[str, dict]:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_golden(golden: Dict[str, dict], path: Path = GOLDEN_FILE) -> None:
+    Path(path).write_text(json.dumps(golden, indent=1, sort_keys=True) + "\n")
+
+
+def main():
+    from scene_registry import discover_scenes, filter_scenes
+
+    parser = argparse.ArgumentParser(description="Check scenes against their golden frames.")
+    parser.add_argument("names", nargs="*", help="Only these scene classes (default: published scenes)")
+    parser.add_argument("--update", action="store_true", help="Store the current frames as golden")
+    parser.add_argument("--golden", type=Path, default=GOLDEN_FILE, help="Golden fingerprint file")
+    args = parser.parse_args()
+
+    golden = load_golden(args.golden)
+    failed = False
+    for entry in filter_scenes(discover_scenes(), args.names or None, None if args.names else True):
+        frames = scene_fingerprints(entry.load())
+        if args.update:
+            import manim
+
+            golden[entry.name] = {"manim": manim.__version__, "frames": [asdict(f) for f in frames]}
+            print(f"📸 {entry.name}: stored {len(frames)} frames")
+            continue
+        if entry.name not in golden:
+            print(f"⚠️  {entry.name}: no golden frames (run with --update)")
+            continue
+        problems = compare_frames(golden[entry.name]["frames"], frames)
+        failed |= bool(problems)
+        print(f"{'❌' if problems else '✅'} {entry.name}")
+        for problem in problems:
+            print(f"    {problem}")
+    if args.update:
+        save_golden(golden, args.golden)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import numpy as np
+from scipy.spatial.transform import Rotation
+from manim import *
+
+from imu_preintegration import make_synthetic_imu, preintegrate_keyframes
+from config import ProfiledScene, get_resolution
+from geometry_cache import cached_sphere
+from static_layers import StaticLayerScene
+
+class IMUPreintegrationVisualization(ProfiledScene, StaticLayerScene, ThreeDScene):
+    """
+    A Manim scene to visualize on-manifold IMU preintegration between keyframes.
+    1. Shows a 1 kHz IMU stream between two keyframes.
+    2. Summarizes the samples into the relative increments ΔR, Δv, Δp.
+    3. Chains the increments along a trajectory while the position
+       uncertainty (from the preintegrated covariance) grows.
+    """
+    metadata = {
+        "order": 11,
+        "title": "IMU Preintegration",
+        "description": "Summarizing 1 kHz IMU samples into relative motion increments and their covariance.",
+        "complexity": "Advanced",
+        "icon": "fas fa-tachometer-alt",
+    }
+
+    def construct(self):
+        # --- 1. Scene Setup ---
+        self.set_camera_orientation(phi=65 * DEGREES, theta=-100 * DEGREES, zoom=0.8)
+        axes = ThreeDAxes(
+            x_range=[-5, 5, 1], y_range=[-5, 5, 1], z_range=[-2, 2, 1],
+            x_length=10, y_length=10, z_length=4
+        )
+        title = Text("IMU Preintegration Between Keyframes").scale(0.7).to_edge(UP)
+        self.add_fixed_in_frame_mobjects(title)
+        self.add(axes)
+        self.mark_static(axes, title)
+
+        # --- 2. Preintegrate the synthetic stream ---
+        rate, keyframe_period, speed, yaw_rate = 1000, 0.5, 2.0, 0.5
+        gyro, accel, dt = make_synthetic_imu(4 * np.pi / yaw_rate / 2, rate=rate, speed=speed, yaw_rate=yaw_rate)
+        # Exaggerate the noise densities so the growing uncertainty is visible on screen
+        preint = preintegrate_keyframes(
+            gyro, accel, dt, samples_per_keyframe=int(keyframe_period * rate),
+            gyro_noise=5e-3, accel_noise=5e-2
+        )
+
+        # Chain the increments from a known initial state to get keyframe poses
+        R_0, v_0, p_0 = np.eye(3), np.array([speed, 0.0, 0.0]), np.array([0.0, -speed / yaw_rate, 0.0])
+        states = [(R_0, p_0, np.zeros((3, 3)))]
+        running = preint[0]
+        for k in range(len(preint)):
+            if k > 0:
+                running = running.compose(preint[k])
+            R_j, _, p_j = running.predict(R_0, v_0, p_0)
+            states.append((R_j, p_j, running.covariance[6:9, 6:9]))
+
+        # --- 3. The raw IMU stream between the first two keyframes ---
+        kf_dots = VGroup(*[Dot3D(p, color=YELLOW, radius=0.08) for _, p, _ in states])
+        samples_per_keyframe = int(keyframe_period * rate)
+        sample_positions = np.linspace(states[0][1], states[1][1], 25)
+        sample_dots = VGroup(*[Dot3D(p, color=GRAY, radius=0.025) for p in sample_positions])
+
+        stream_label = Text(f"{samples_per_keyframe} IMU samples (1 kHz)", font_size=26).to_corner(UL).shift(DOWN * 0.6)
+        self.add_fixed_in_frame_mobjects(stream_label)
+        self.play(FadeIn(kf_dots[0]), FadeIn(kf_dots[1]), Write(stream_label))
+        self.play(LaggedStart(*[FadeIn(d) for d in sample_dots], lag_ratio=0.05), run_time=1.5)
+        self.wait(0.5)
+
+        # --- 4. Collapse them into the preintegrated increments ---
+        formulas = MathTex(
+            r"\Delta R_{ij} &= \prod_k \mathrm{Exp}(\tilde\omega_k \Delta t) \\",
+            r"\Delta v_{ij} &= \sum_k \Delta R_{ik} \tilde a_k \Delta t \\",
+            r"\Delta p_{ij} &= \sum_k \Delta v_{ik} \Delta t + \tfrac{1}{2} \Delta R_{ik} \tilde a_k \Delta t^2",
+            font_size=30
+        ).to_corner(UR).shift(DOWN * 0.6)
+        self.add_fixed_in_frame_mobjects(formulas)
+
+        first_edge = Line3D(states[0][1], states[1][1], color=ORANGE, thickness=0.02)
+        self.play(Write(formulas), run_time=2)
+        self.play(ReplacementTransform(sample_dots, first_edge), run_time=1.5)
+
+        # Group composition, as in SO3CompositionVsAddition: the chained ΔR equals the product
+        delta_text = MathTex(
+            rf"\|\mathrm{{Log}}(\Delta R_{{01}})\| = {np.linalg.norm(Rotation.from_matrix(preint.delta_R[0]).as_rotvec()):.3f}\,\mathrm{{rad}}",
+            font_size=30
+        ).to_corner(DL)
+        self.add_fixed_in_frame_mobjects(delta_text)
+        self.play(Write(delta_text))
+        self.wait(1)
+
+        # --- 5. Chain keyframes and grow the position covariance ---
+        exaggeration = 3.0
+        edges = VGroup(first_edge)
+        ellipsoids = VGroup()
+        for k in range(1, len(states) - 1):
+            edge = Line3D(states[k][1], states[k + 1][1], color=ORANGE, thickness=0.02)
+            eigvals, eigvecs = np.linalg.eigh(states[k + 1][2])
+            shape = eigvecs @ np.diag(exaggeration * np.sqrt(np.maximum(eigvals, 1e-12)))
+            ellipsoid = cached_sphere(radius=1, resolution=get_resolution("low")).set_color(BLUE).set_opacity(0.25)
+            ellipsoid.apply_matrix(shape).move_to(states[k + 1][1])
+            self.play(
+                Create(edge), FadeIn(kf_dots[k + 1]), FadeIn(ellipsoid),
+                run_time=0.4
+            )
+            edges.add(edge)
+            ellipsoids.add(ellipsoid)
+
+        cov_text = Text("Uncertainty grows between keyframes", color=BLUE, font_size=28).to_corner(DR)
+        self.add_fixed_in_frame_mobjects(cov_text)
+        self.play(Write(cov_text))
+        self.move_camera(phi=40 * DEGREES, theta=-90 * DEGREES, zoom=0.9, run_time=2)
+        self.wait(3)
@@ -0,0 +1,178 @@
+"""
+Level of detail for tessellated 3D primitives.
+
+``Sphere``, ``Cylinder`` and ``Arrow3D`` are built at a fixed resolution no
+matter how large they end up on screen. Here the resolution is picked from the
+silhouette error instead: an n-gon of pixel radius r deviates from the true
+circle by r (1 - cos(π/n)), so the coarsest level whose error stays under a
+pixel tolerance is used. Faint surfaces hide facets in proportion to their
+opacity, so the tolerance is divided by it.
+
+The helpers at the bottom build every level through ``geometry_cache`` and
+attach an updater that evaluates the level on every frame the mobject is on
+screen, from the camera zoom, focal distance and orientation, so levels
+switch while ``move_camera`` runs. ``Cube`` is already six flat faces and has
+only one level.
+"""
+
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+from config import scale_resolution
+from geometry_cache import cached_arrow3d, cached_sphere
+
+# Candidate resolutions (segments around the circumference), capped per profile
+LOD_LEVELS = (4, 8, 12, 16, 24, 32)
+# Largest allowed silhouette deviation, in output pixels
+MAX_ERROR_PIXELS = 1.0
+# Relative tolerance band in which the current level is kept to avoid flicker
+HYSTERESIS = 0.25
+# Floor for the opacity weighting so nearly invisible meshes still get a level
+MIN_OPACITY_WEIGHT = 0.1
+# Attributes that point at submobjects and must follow a swap (Arrow3D's tip)
+LINKED_ATTRIBUTES = ("cone",)
+
+
+def perspective_factor(depth: float, focal_distance: float) -> float:
+    """Magnification of a point ``depth`` units towards the camera, as in ``ThreeDCamera``."""
+    if not np.isfinite(focal_distance):
+        return 1.0
+    gap = focal_distance - depth
+    return focal_distance / gap if gap > 0 else 1e6
+
+
+def projected_radius(
+    radius: float,
+    pixels_per_unit: float,
+    zoom: float = 1.0,
+    depth: float = 0.0,
+    focal_distance: float = np.inf,
+) -> float:
+    """On-screen radius in pixels of a primitive of scene-space ``radius``."""
+    return radius * pixels_per_unit * zoom * perspective_factor(depth, focal_distance)
+
+
+def silhouette_error(radius_px: float, resolution: int) -> float:
+    """Largest pixel gap between a circle and its inscribed ``resolution``-gon."""
+    return radius_px * (1 - np.cos(np.pi / resolution))
+
+
+def required_resolution(radius_px: float, max_error: float = MAX_ERROR_PIXELS) -> float:
+    """Smallest (fractional) segment count that keeps the error under ``max_error``."""
+    if radius_px <= max_error:
+        return 0.0
+    return np.pi / np.arccos(1 - max_error / radius_px)
+
+
+def select_resolution(
+    radius_px: float,
+    levels: Sequence[int] = LOD_LEVELS,
+    max_error: float = MAX_ERROR_PIXELS,
+    opacity: float = 1.0,
+    current: Optional[int] = None,
+    hysteresis: float = HYSTERESIS,
+) -> int:
+    """
+    Pick the coarsest level from ``levels`` whose silhouette error is acceptable.
+
+    When ``current`` is still acceptable within the ``hysteresis`` band it is
+    kept, so an object hovering at a threshold does not switch every frame.
+    """
+    levels = sorted(levels)
+    tolerance = max_error / max(opacity, MIN_OPACITY_WEIGHT)
+
+    def level_for(tol):
+        needed = required_resolution(radius_px, tol)
+        return next((level for level in levels if level >= needed), levels[-1])
+
+    if current is not None and level_for(tolerance * (1 + hysteresis)) <= current <= level_for(tolerance * (1 - hysteresis)):
+        return current
+    return level_for(tolerance)
+
+
+def profile_levels(max_resolution: int = LOD_LEVELS[-1], levels: Sequence[int] = LOD_LEVELS) -> tuple:
+    """The levels allowed under the active render profile."""
+    cap = scale_resolution(max_resolution)
+    allowed = tuple(level for level in levels if level <= cap)
+    return allowed or (min(levels),)
+
+
+def camera_pixels_per_unit(camera, point: np.ndarray) -> float:
+    """Screen pixels per scene unit at ``point`` for a manim (ThreeD)Camera."""
+    pixels_per_unit = camera.pixel_width / camera.frame_width
+    if not hasattr(camera, "get_rotation_matrix"):
+        return pixels_per_unit
+    depth = (camera.get_rotation_matrix() @ (np.asarray(point) - camera.frame_center))[2]
+    return projected_radius(1.0, pixels_per_unit, camera.get_zoom(), depth, camera.get_focal_distance())
+
+
+def add_level_of_detail(
+    scene,
+    mobject,
+    factory: Callable[[int], object],
+    radius: float,
+    levels: Optional[Sequence[int]] = None,
+    max_error: float = MAX_ERROR_PIXELS,
+    opacity: Optional[float] = None,
+    initial_level: Optional[int] = None,
+):
+    """
+    Swap the faces of ``mobject`` for those of ``factory(resolution)`` as its screen size changes.
+
+    ``radius`` is the scene-space radius that the resolution tessellates
+    (sphere radius, arrow shaft radius) and ``initial_level`` the resolution
+    ``mobject`` was built with. Each level is built once and reused. The
+    mobject keeps its identity and attributes (``LINKED_ATTRIBUTES`` such as
+    an arrow's ``cone`` are pointed at the incoming faces); incoming faces are
+    moved, scaled and restyled to match the current ones, so this suits
+    objects that are translated, scaled and recolored but not rotated.
+
+    The first level is chosen on the first update, i.e. once the mobject is
+    on screen, so styling applied after this call (``set_opacity``) counts.
+    """
+    levels = profile_levels() if levels is None else tuple(levels)
+    reference_width = mobject.width
+    linked = lambda mob: {attr: getattr(mob, attr) for attr in LINKED_ATTRIBUTES if hasattr(mob, attr)}
+    # Level -> (faces, linked attributes)
+    built = {}
+    if initial_level is not None:
+        built[initial_level] = (list(mobject.submobjects), linked(mobject))
+    state = {"level": initial_level}
+
+    def update_level(mob):
+        scale = mob.width / reference_width if reference_width else 1.0
+        radius_px = radius * scale * camera_pixels_per_unit(scene.camera, mob.get_center())
+        fill_opacity = mob.get_fill_opacity() if opacity is None else opacity
+        level = select_resolution(radius_px, levels, max_error, fill_opacity, current=state["level"])
+        if level == state["level"]:
+            return
+        if level not in built:
+            source = factory(level)
+            built[level] = (list(source.submobjects), linked(source))
+        submobjects, attributes = built[level]
+        faces = mob.get_group_class()(*submobjects)
+        if faces.width and mob.width:
+            faces.scale(mob.width / faces.width)
+        faces.move_to(mob.get_center()).match_style(mob)
+        mob.submobjects = list(submobjects)
+        for attr, value in attributes.items():
+            setattr(mob, attr, value)
+        state["level"] = level
+
+    mobject.add_updater(update_level)
+    return mobject
+
+
+def lod_sphere(scene, radius: float = 1.0, max_resolution: int = 32, opacity: Optional[float] = None, **kwargs):
+    """A ``Sphere`` whose resolution follows its projected size."""
+    levels = profile_levels(max_resolution)
+    factory = lambda n: cached_sphere(radius=radius, resolution=(n, n), **kwargs)
+    return add_level_of_detail(scene, factory(levels[-1]), factory, radius, levels, opacity=opacity, initial_level=levels[-1])
+
+
+def lod_arrow3d(scene, start, end, max_resolution: int = 24, base_radius: float = 0.08, **kwargs):
+    """An ``Arrow3D`` whose shaft and cone resolution follow its projected size."""
+    levels = profile_levels(max_resolution)
+    factory = lambda n: cached_arrow3d(start, end, base_radius=base_radius, resolution=n, **kwargs)
+    return add_level_of_detail(scene, factory(levels[-1]), factory, base_radius, levels, initial_level=levels[-1])
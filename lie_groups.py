@@ -0,0 +1,170 @@
+"""
+Vectorized SO(3)/SE(3) kernels used by the scenes.
+
+Every function works on a single element or a batch stacked along the first
+axis. Functions that take poses accept either 4x4 homogeneous matrices or a
+``PoseStore`` directly.
+"""
+
+import numpy as np
+
+from pose_store import PoseStore, as_pose_matrices, quaternions_to_matrices
+
+# Below this angle the closed-form coefficients switch to their Taylor series
+SMALL_ANGLE = 1e-6
+
+
+def so3_hat(w: np.ndarray) -> np.ndarray:
+    """Map (N, 3) rotation vectors to (N, 3, 3) skew-symmetric matrices."""
+    w = np.asarray(w, dtype=np.float64)
+    W = np.zeros(w.shape[:-1] + (3, 3))
+    W[..., 0, 1], W[..., 0, 2] = -w[..., 2], w[..., 1]
+    W[..., 1, 0], W[..., 1, 2] = w[..., 2], -w[..., 0]
+    W[..., 2, 0], W[..., 2, 1] = -w[..., 1], w[..., 0]
+    return W
+
+
+def so3_vee(W: np.ndarray) -> np.ndarray:
+    """Inverse of ``so3_hat``."""
+    W = np.asarray(W)
+    return np.stack([W[..., 2, 1], W[..., 0, 2], W[..., 1, 0]], axis=-1)
+
+
+def _rodrigues_coefficients(theta: np.ndarray):
+    """Return sin(t)/t, (1-cos t)/t^2 and (t-sin t)/t^3 with small-angle care."""
+    small = theta < SMALL_ANGLE
+    t = np.where(small, 1.0, theta)
+    t2 = t * t
+    a = np.where(small, 1 - theta**2 / 6, np.sin(t) / t)
+    b = np.where(small, 0.5 - theta**2 / 24, (1 - np.cos(t)) / t2)
+    c = np.where(small, 1 / 6 - theta**2 / 120, (t - np.sin(t)) / (t2 * t))
+    return a, b, c
+
+
+def so3_exp(w: np.ndarray) -> np.ndarray:
+    """Rodrigues' formula: rotation vectors (N, 3) to matrices (N, 3, 3)."""
+    w = np.asarray(w, dtype=np.float64)
+    theta = np.linalg.norm(w, axis=-1)
+    a, b, _ = _rodrigues_coefficients(theta)
+    W = so3_hat(w)
+    return np.eye(3) + a[..., None, None] * W + b[..., None, None] * (W @ W)
+
+
+def so3_log(R: np.ndarray) -> np.ndarray:
+    """Rotation matrices (N, 3, 3) to rotation vectors (N, 3)."""
+    R = np.asarray(R, dtype=np.float64)
+    cos_theta = np.clip((np.trace(R, axis1=-2, axis2=-1) - 1) / 2, -1.0, 1.0)
+    theta = np.arccos(cos_theta)
+    a, _, _ = _rodrigues_coefficients(theta)
+    w = so3_vee(R - np.swapaxes(R, -1, -2)) / (2 * a[..., None])
+
+    # Near pi the antisymmetric part vanishes; recover the axis from R + I
+    near_pi = theta > np.pi - 1e-4
+    if np.any(near_pi):
+        Rp = R[near_pi]
+        diag = np.diagonal(Rp, axis1=-2, axis2=-1)
+        col = np.argmax(diag, axis=-1)
+        axis = np.take_along_axis(Rp + np.eye(3), col[:, None, None], axis=-1)[..., 0]
+        axis /= np.linalg.norm(axis, axis=-1, keepdims=True)
+        w[near_pi] = axis * theta[near_pi][:, None]
+    return w
+
+
+def so3_left_jacobian(w: np.ndarray) -> np.ndarray:
+    """The V matrix of the SE(3) exponential map (left Jacobian of SO(3))."""
+    w = np.asarray(w, dtype=np.float64)
+    theta = np.linalg.norm(w, axis=-1)
+    _, b, c = _rodrigues_coefficients(theta)
+    W = so3_hat(w)
+    return np.eye(3) + b[..., None, None] * W + c[..., None, None] * (W @ W)
+
+
+def se3_exp(twist: np.ndarray) -> np.ndarray:
+    """Twists (N, 6) ordered (v, w) to 4x4 transformation matrices."""
+    twist = np.asarray(twist, dtype=np.float64)
+    v, w = twist[..., :3], twist[..., 3:]
+    T = np.zeros(twist.shape[:-1] + (4, 4))
+    T[..., :3, :3] = so3_exp(w)
+    T[..., :3, 3] = (so3_left_jacobian(w) @ v[..., None])[..., 0]
+    T[..., 3, 3] = 1
+    return T
+
+
+def se3_log(poses) -> np.ndarray:
+    """Poses to (N, 6) twists ordered (v, w)."""
+    T = as_pose_matrices(poses)
+    w = so3_log(T[:, :3, :3])
+    v = np.linalg.solve(so3_left_jacobian(w), T[:, :3, 3:])[..., 0]
+    return np.concatenate([v, w], axis=-1)
+
+
+def se3_inverse(poses) -> np.ndarray:
+    """Invert poses in closed form: (R, t)^-1 = (R^T, -R^T t)."""
+    T = as_pose_matrices(poses)
+    Rt = np.swapaxes(T[:, :3, :3], -1, -2)
+    inv = np.zeros_like(T)
+    inv[:, :3, :3] = Rt
+    inv[:, :3, 3] = -(Rt @ T[:, :3, 3:])[..., 0]
+    inv[:, 3, 3] = 1
+    return inv
+
+
+def se3_compose(poses_a, poses_b) -> np.ndarray:
+    """Batched product ``T_a @ T_b``."""
+    return as_pose_matrices(poses_a) @ as_pose_matrices(poses_b)
+
+
+def relative_pose(poses_a, poses_b) -> np.ndarray:
+    """Relative transformation ``T_a^-1 @ T_b`` as in ``SE3RelativePose``."""
+    return se3_inverse(poses_a) @ as_pose_matrices(poses_b)
+
+
+def transform_points(poses, points: np.ndarray) -> np.ndarray:
+    """Apply each pose to (N, 3) points, or one pose to every point."""
+    points = np.asarray(points, dtype=np.float64)
+    if isinstance(poses, PoseStore):
+        # Skip building the full 4x4 stack for compact stores
+        R = quaternions_to_matrices(poses.rotations)
+        t = poses.positions.astype(np.float64)
+    else:
+        T = as_pose_matrices(poses)
+        R, t = T[:, :3, :3], T[:, :3, 3]
+    return np.einsum("nij,nj->ni", np.broadcast_to(R, points.shape[:-1] + (3, 3)), points) + t
+
+
+def quat_multiply(q1: np.ndarray, q2: np.ndarray) -> np.ndarray:
+    """Hamilton product of xyzw quaternions, broadcasting over leading axes."""
+    x1, y1, z1, w1 = np.moveaxis(q1, -1, 0)
+    x2, y2, z2, w2 = np.moveaxis(q2, -1, 0)
+    return np.stack([
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2,
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+    ], axis=-1)
+
+
+def so3_exp_quat(w: np.ndarray) -> np.ndarray:
+    """Rotation vectors (N, 3) to xyzw unit quaternions (N, 4)."""
+    w = np.asarray(w, dtype=np.float64)
+    theta = np.linalg.norm(w, axis=-1, keepdims=True)
+    half = theta / 2
+    # sin(theta/2)/theta -> 1/2 as theta -> 0
+    scale = np.where(theta < SMALL_ANGLE, 0.5 - theta**2 / 48, np.sin(half) / np.where(theta < SMALL_ANGLE, 1.0, theta))
+    return np.concatenate([w * scale, np.cos(half)], axis=-1)
+
+
+def quat_cumprod(quats: np.ndarray, axis: int = -2) -> np.ndarray:
+    """
+    Inclusive running product q_0 q_1 ... q_i along ``axis``.
+
+    Uses a doubling (Hillis-Steele) scan, so the work is log2(N) vectorized
+    quaternion products instead of N sequential ones.
+    """
+    out = np.moveaxis(np.array(quats, dtype=np.float64), axis, 0)
+    shift = 1
+    while shift < len(out):
+        out[shift:] = quat_multiply(out[:-shift], out[shift:])
+        shift *= 2
+    out /= np.linalg.norm(out, axis=-1, keepdims=True)
+    return np.moveaxis(out, 0, axis)
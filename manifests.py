@@ -0,0 +1,41 @@
+"""
+JSON manifests of generated files.
+
+The encoding ladder (``ladder.json``), the thumbnails (``thumbnails.json``)
+and the published site assets (``assets.json``) each record what they
+generated, and from which source and settings, in a manifest next to their
+outputs. A missing or unreadable manifest reads as empty, so everything is
+generated again, and writes are atomic, so a killed build never leaves a
+truncated one behind.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+
+def read_manifest(path: Path) -> Dict[str, dict]:
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(path: Path, manifest: Dict[str, dict]) -> None:
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(manifest, indent=1, sort_keys=True) + "\n")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def settings_key(*settings) -> str:
+    """Changes whenever any of ``settings`` (constants that shape the outputs) does."""
+    return hashlib.sha1(repr(list(settings)).encode()).hexdigest()[:16]
@@ -0,0 +1,393 @@
+"""
+Per-scene peak memory, and memory budgets for parallel renders.
+
+``track_memory`` samples the Python heap (``tracemalloc``) and the process
+RSS after every ``play``/``wait`` of a scene and attributes each sample to
+an act: the ``# --- Act ... ---`` section of ``construct`` the call was made
+from, or the helper method it came through. The resulting ``SceneMemory``
+shows which act makes memory grow, e.g. a naive act that keeps adding
+mobjects.
+
+Measurements run each scene in a fresh process so RSS peaks do not carry
+over, and are stored next to the render costs. A parallel renderer turns
+them into an expected footprint per job (``render_memory_mb``) and only
+starts a job while the running ones fit in the memory budget
+(``MemoryGate``, or ``AsyncMemoryGate`` for asyncio tasks):
+
+    python memory_profile.py --measure                     # headless construct
+    python memory_profile.py --measure --render SE3RelativePose
+    python memory_profile.py --budget SLAMKeyframesVisualization=800
+"""
+
+import argparse
+import asyncio
+import bisect
+import inspect
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import PROFILE_ENV_VAR
+from render_cost import DEFAULT_COST_FILE, get_target, load_costs, save_costs, source_hash
+from scene_registry import SceneEntry, discover_scenes, filter_scenes
+
+# Total memory parallel renders may use; default is a fraction of physical memory
+MEMORY_BUDGET_ENV_VAR = "SLAM_MEMORY_BUDGET_MB"
+SYSTEM_MEMORY_FRACTION = 0.75
+# Per-scene peak RSS allowed by ``--measure``, with overrides by scene name
+DEFAULT_SCENE_BUDGET_MB = 2048
+SCENE_BUDGETS_MB: Dict[str, float] = {}
+# Assumed footprint of a render that has never been measured
+DEFAULT_RENDER_MEMORY_MB = 1024
+# On top of the measured scene: frame buffers of the camera and the ffmpeg writer
+FRAME_BUFFERS = 4
+FFMPEG_MEMORY_MB = 150
+
+_MB = 1024 * 1024
+_ACT_MARKER = re.compile(r"^\s*#\s*---\s*(.*?)\s*---\s*$")
+
+
+def rss_mb(peak: bool = False) -> float:
+    """Resident set size of this process (or its high-water mark) in MB."""
+    key = "VmHWM:" if peak else "VmRSS:"
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(key):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+
+    # Only the peak is available; kilobytes on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (_MB if sys.platform == "darwin" else 1024)
+
+
+def act_markers(path: Path, class_name: str) -> List[Tuple[int, str]]:
+    """``(line, title)`` of each ``# --- title ---`` comment in ``class_name.construct``."""
+    from scene_registry import scenes_in
+
+    entry = next(e for e in scenes_in(path) if e.name == class_name)
+    construct = next(
+        (f for f in entry.class_def().body if getattr(f, "name", None) == "construct"), None
+    )
+    if construct is None:
+        return []
+    lines = Path(path).read_text().splitlines()
+    return [
+        (lineno, match.group(1))
+        for lineno in range(construct.lineno, construct.end_lineno + 1)
+        if (match := _ACT_MARKER.match(lines[lineno - 1]))
+    ]
+
+
+@dataclass
+class MemorySample:
+    """Memory right after one ``play``/``wait``."""
+
+    act: str
+    play: int
+    rss_mb: float
+    traced_mb: float
+    # Highest traced heap since the previous sample
+    traced_peak_mb: float
+
+
+@dataclass
+class SceneMemory:
+    """Memory profile of one scene run."""
+
+    scene: str
+    profile: str = ""
+    samples: List[MemorySample] = field(default_factory=list)
+    baseline_rss_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+    budget_mb: float = DEFAULT_SCENE_BUDGET_MB
+    source_hash: str = ""
+
+    @property
+    def peak_traced_mb(self) -> float:
+        return max((s.traced_peak_mb for s in self.samples), default=0.0)
+
+    @property
+    def acts(self) -> Dict[str, Dict[str, float]]:
+        """Per act, in order: traced heap peak, heap growth over the act and final RSS."""
+        acts, previous = {}, 0.0
+        for sample in self.samples:
+            act = acts.setdefault(sample.act, {"traced_peak_mb": 0.0, "start_mb": previous})
+            act["traced_peak_mb"] = max(act["traced_peak_mb"], sample.traced_peak_mb)
+            act["growth_mb"] = sample.traced_mb - act["start_mb"]
+            act["rss_mb"] = sample.rss_mb
+            previous = sample.traced_mb
+        return acts
+
+    @property
+    def over_budget(self) -> bool:
+        return self.peak_rss_mb > self.budget_mb
+
+    @classmethod
+    def from_record(cls, record: dict) -> "SceneMemory":
+        samples = [MemorySample(**s) for s in record.get("samples", [])]
+        fields = {k: v for k, v in record.items() if k in cls.__dataclass_fields__ and k != "samples"}
+        return cls(samples=samples, **fields)
+
+
+def scene_budget_mb(name: str) -> float:
+    return SCENE_BUDGETS_MB.get(name, DEFAULT_SCENE_BUDGET_MB)
+
+
+@contextmanager
+def track_memory(scene, markers: Optional[List[Tuple[int, str]]] = None):
+    """
+    Sample memory after every ``play``/``wait`` of ``scene`` while the block runs.
+
+    Yields the ``SceneMemory`` being filled in. ``markers`` are the act
+    comments of ``construct`` (see ``act_markers``).
+    """
+    scene_cls = type(scene)
+    construct = scene_cls.construct.__code__
+    # Methods of the scene class itself that construct delegates acts to
+    helpers = {
+        f.__code__: name for name, f in vars(scene_cls).items()
+        if inspect.isfunction(f) and f.__code__ is not construct
+    }
+    marker_lines = [line for line, _ in markers or []]
+    report = SceneMemory(scene_cls.__name__, budget_mb=scene_budget_mb(scene_cls.__name__))
+
+    def current_act() -> str:
+        frame, helper = sys._getframe(2), None
+        while frame is not None and frame.f_code is not construct:
+            helper = helpers.get(frame.f_code, helper)
+            frame = frame.f_back
+        if frame is not None and marker_lines:
+            index = bisect.bisect_right(marker_lines, frame.f_lineno) - 1
+            if index >= 0:
+                return markers[index][1]
+        return helper or "construct"
+
+    renderer = scene.renderer
+    play = renderer.play
+
+    def sampled_play(*args, **kwargs):
+        result = play(*args, **kwargs)
+        traced, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        report.samples.append(MemorySample(
+            current_act(), len(report.samples), rss_mb(), traced / _MB, traced_peak / _MB,
+        ))
+        return result
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    report.baseline_rss_mb = rss_mb()
+    renderer.play = sampled_play
+    try:
+        yield report
+    finally:
+        renderer.play = play
+        report.peak_rss_mb = rss_mb(peak=True)
+        if started:
+            tracemalloc.stop()
+
+
+def measure_memory(entry: SceneEntry, profile: Optional[str] = None, render: bool = False) -> SceneMemory:
+    """Profile ``entry`` in this process, headless or with a full render."""
+    from dry_run import headless_scene
+
+    markers = act_markers(entry.path, entry.name)
+    scene_cls = entry.load()
+    if render:
+        scene = scene_cls()
+        with track_memory(scene, markers) as report:
+            scene.render()
+    else:
+        with headless_scene(scene_cls) as scene, track_memory(scene, markers) as report:
+            scene.construct()
+    report.profile = get_target(profile).name
+    report.source_hash = source_hash(entry)
+    return report
+
+
+def _measure_in_child(entry: SceneEntry, profile: Optional[str], render: bool) -> dict:
+    return asdict(measure_memory(entry, profile, render))
+
+
+def measure_isolated(entry: SceneEntry, profile: Optional[str] = None, render: bool = False) -> SceneMemory:
+    """``measure_memory`` in a fresh interpreter, so earlier scenes do not inflate the RSS peak."""
+    previous = os.environ.get(PROFILE_ENV_VAR)
+    if profile:
+        # Read by config.py when the child imports it
+        os.environ[PROFILE_ENV_VAR] = profile
+    try:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            return SceneMemory.from_record(pool.submit(_measure_in_child, entry, profile, render).result())
+    finally:
+        if previous is None:
+            os.environ.pop(PROFILE_ENV_VAR, None)
+        else:
+            os.environ[PROFILE_ENV_VAR] = previous
+
+
+# --- Budgets for parallel renders -------------------------------------------------
+
+def memory_budget_mb() -> float:
+    """Memory all concurrent renders may use together."""
+    if MEMORY_BUDGET_ENV_VAR in os.environ:
+        return float(os.environ[MEMORY_BUDGET_ENV_VAR])
+    try:
+        total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / _MB
+    except (ValueError, OSError, AttributeError):
+        return float(2 * DEFAULT_RENDER_MEMORY_MB)
+    return SYSTEM_MEMORY_FRACTION * total
+
+
+def render_memory_mb(memory: Optional[SceneMemory], profile: Optional[str] = None) -> float:
+    """Expected peak RSS of rendering a scene whose construct was profiled as ``memory``."""
+    if memory is None or not memory.peak_rss_mb:
+        return float(DEFAULT_RENDER_MEMORY_MB)
+    target = get_target(profile)
+    frame_mb = target.pixel_width * target.pixel_height * 4 / _MB
+    return memory.peak_rss_mb + FRAME_BUFFERS * frame_mb + FFMPEG_MEMORY_MB
+
+
+def _memory_key(scene: str, target: str) -> str:
+    return f"{scene}@{target}"
+
+
+def store_memory(data: dict, memory: SceneMemory) -> None:
+    data.setdefault("memory", {})[_memory_key(memory.scene, memory.profile)] = asdict(memory)
+
+
+def stored_memory(entry: SceneEntry, profile: Optional[str], data: dict) -> Optional[SceneMemory]:
+    """The stored profile of ``entry``, if its source has not changed since."""
+    record = data.get("memory", {}).get(_memory_key(entry.name, get_target(profile).name))
+    if record and record.get("source_hash") == source_hash(entry):
+        return SceneMemory.from_record(record)
+    return None
+
+
+class MemoryGate:
+    """
+    Admission control for concurrent renders.
+
+    ``acquire(mb)`` blocks until the running jobs plus ``mb`` fit in the
+    budget. A job larger than the whole budget still runs, alone.
+    """
+
+    def __init__(self, budget_mb: float):
+        self.budget_mb = budget_mb
+        self.in_use_mb = 0.0
+        self._running = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, mb: float) -> None:
+        with self._condition:
+            self._condition.wait_for(lambda: self._running == 0 or self.in_use_mb + mb <= self.budget_mb)
+            self.in_use_mb += mb
+            self._running += 1
+
+    def release(self, mb: float) -> None:
+        with self._condition:
+            self.in_use_mb -= mb
+            self._running -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, mb: float):
+        self.acquire(mb)
+        try:
+            yield
+        finally:
+            self.release(mb)
+
+
+class AsyncMemoryGate:
+    """``MemoryGate`` for asyncio tasks: waiting for room does not block the event loop."""
+
+    def __init__(self, budget_mb: float):
+        self.budget_mb = budget_mb
+        self.in_use_mb = 0.0
+        self._running = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def reserve(self, mb: float):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._running == 0 or self.in_use_mb + mb <= self.budget_mb)
+            self.in_use_mb += mb
+            self._running += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_use_mb -= mb
+                self._running -= 1
+                self._condition.notify_all()
+
+
+def print_report(memory: SceneMemory) -> None:
+    flag = "❌ over budget" if memory.over_budget else "✅"
+    print(
+        f"{memory.scene}: peak RSS {memory.peak_rss_mb:.0f} MB (budget {memory.budget_mb:.0f} MB, "
+        f"start {memory.baseline_rss_mb:.0f} MB), heap peak {memory.peak_traced_mb:.1f} MB {flag}"
+    )
+    for act, stats in memory.acts.items():
+        print(
+            f"    {act:45s} heap peak {stats['traced_peak_mb']:8.1f} MB  "
+            f"growth {stats['growth_mb']:+8.1f} MB  RSS {stats['rss_mb']:7.0f} MB"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile per-scene memory and check budgets.")
+    parser.add_argument("names", nargs="*", help="Only these scene classes (default: published scenes)")
+    parser.add_argument("--profile", choices=["draft", "preview", "final"], default=os.environ.get(PROFILE_ENV_VAR))
+    parser.add_argument("--measure", action="store_true", help="Run the scenes (imports manim) and store the results")
+    parser.add_argument("--render", action="store_true", help="Measure a full render instead of a headless construct")
+    parser.add_argument("--budget", nargs="+", default=[], metavar="SCENE=MB", help="Per-scene peak RSS budgets")
+    parser.add_argument("--costs", type=Path, default=DEFAULT_COST_FILE, help="Measurements file")
+    args = parser.parse_args()
+
+    for item in args.budget:
+        name, _, mb = item.partition("=")
+        SCENE_BUDGETS_MB[name] = float(mb)
+    entries = filter_scenes(discover_scenes(), args.names or None, None if args.names else True)
+    data = load_costs(args.costs)
+
+    failed = False
+    for entry in entries:
+        if args.measure:
+            try:
+                memory = measure_isolated(entry, args.profile, args.render)
+            except Exception as e:
+                print(f"❌ {entry.name}: {e}")
+                failed = True
+                continue
+            store_memory(data, memory)
+        else:
+            memory = stored_memory(entry, args.profile, data)
+            if memory is None:
+                print(f"{entry.name}: not measured (run with --measure)")
+                continue
+        memory.budget_mb = scene_budget_mb(entry.name)
+        print_report(memory)
+        failed |= memory.over_budget
+    if args.measure:
+        save_costs(data, args.costs)
+    print(f"Parallel render budget: {memory_budget_mb():.0f} MB")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
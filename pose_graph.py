@@ -0,0 +1,243 @@
+"""
+2D pose graph construction, sparse assembly and Gauss-Newton optimization.
+
+Nodes are SE(2) poses (x, y, θ); edges are relative-pose measurements from
+odometry or loop closures. The Hessian of ``Σ eᵀΩe`` is assembled as a
+``scipy.sparse`` matrix with one 3x3 block per node pair that shares an edge,
+which is the structure the ``PoseGraphOptimization`` scene alludes to.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+POSE_DOF = 3
+
+
+@dataclass
+class PoseGraph:
+    """Node estimates plus relative-pose edges with diagonal information."""
+
+    poses: np.ndarray          # (N, 3) x, y, theta
+    edge_from: np.ndarray      # (E,)
+    edge_to: np.ndarray        # (E,)
+    measurements: np.ndarray   # (E, 3) pose of `to` expressed in the frame of `from`
+    information: np.ndarray    # (E, 3) diagonal of Ω per edge
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.poses)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_from)
+
+    def with_edges(self, edge_from, edge_to, measurements, information) -> "PoseGraph":
+        """Return a copy of the graph with extra edges appended."""
+        return PoseGraph(
+            self.poses.copy(),
+            np.concatenate([self.edge_from, edge_from]),
+            np.concatenate([self.edge_to, edge_to]),
+            np.concatenate([self.measurements, measurements]),
+            np.concatenate([self.information, information]),
+        )
+
+
+def wrap_angle(theta: np.ndarray) -> np.ndarray:
+    return (theta + np.pi) % (2 * np.pi) - np.pi
+
+
+def rotation_2d(theta: np.ndarray) -> np.ndarray:
+    c, s = np.cos(theta), np.sin(theta)
+    return np.stack([np.stack([c, -s], -1), np.stack([s, c], -1)], -2)
+
+
+def relative_poses(from_poses: np.ndarray, to_poses: np.ndarray) -> np.ndarray:
+    """Pose of each ``to`` expressed in the frame of the matching ``from``."""
+    R_T = np.swapaxes(rotation_2d(from_poses[:, 2]), -1, -2)
+    dt = (R_T @ (to_poses[:, :2] - from_poses[:, :2])[..., None])[..., 0]
+    return np.column_stack([dt, wrap_angle(to_poses[:, 2] - from_poses[:, 2])])
+
+
+def chain_odometry(start: np.ndarray, steps: np.ndarray) -> np.ndarray:
+    """Dead-reckon (N, 3) relative steps from ``start`` into N+1 absolute poses."""
+    theta = start[2] + np.concatenate([[0.0], np.cumsum(steps[:, 2])])
+    world_steps = (rotation_2d(theta[:-1]) @ steps[:, :2, None])[..., 0]
+    xy = start[:2] + np.concatenate([[[0.0, 0.0]], np.cumsum(world_steps, axis=0)])
+    return np.column_stack([xy, wrap_angle(theta)])
+
+
+def edge_errors(graph: PoseGraph, poses: Optional[np.ndarray] = None) -> np.ndarray:
+    """(E, 3) residuals between predicted and measured relative poses."""
+    poses = graph.poses if poses is None else poses
+    predicted = relative_poses(poses[graph.edge_from], poses[graph.edge_to])
+    z = graph.measurements
+    R_z_T = np.swapaxes(rotation_2d(z[:, 2]), -1, -2)
+    e_t = (R_z_T @ (predicted[:, :2] - z[:, :2])[..., None])[..., 0]
+    return np.column_stack([e_t, wrap_angle(predicted[:, 2] - z[:, 2])])
+
+
+def total_error(graph: PoseGraph, poses: Optional[np.ndarray] = None) -> float:
+    """The objective Σ eᵀΩe."""
+    e = edge_errors(graph, poses)
+    return float(np.sum(graph.information * e**2))
+
+
+def _edge_jacobians(graph: PoseGraph, poses: np.ndarray):
+    """Jacobians of every edge error w.r.t. its two endpoint poses."""
+    xi, xj = poses[graph.edge_from], poses[graph.edge_to]
+    R_i = rotation_2d(xi[:, 2])
+    R_z_T = np.swapaxes(rotation_2d(graph.measurements[:, 2]), -1, -2)
+    dR_i_T = np.swapaxes(rotation_2d(xi[:, 2] + np.pi / 2), -1, -2)  # d(R_iᵀ)/dθ
+    dt = (xj[:, :2] - xi[:, :2])[..., None]
+
+    E = len(xi)
+    A = np.zeros((E, 3, 3))
+    B = np.zeros((E, 3, 3))
+    RzRi = R_z_T @ np.swapaxes(R_i, -1, -2)
+    A[:, :2, :2] = -RzRi
+    A[:, :2, 2] = (R_z_T @ dR_i_T @ dt)[..., 0]
+    A[:, 2, 2] = -1
+    B[:, :2, :2] = RzRi
+    B[:, 2, 2] = 1
+    return A, B
+
+
+def _scatter_blocks(blocks: np.ndarray, rows: np.ndarray, cols: np.ndarray):
+    """COO indices and values for (M, 3, 3) blocks at block coordinates."""
+    blocks = np.broadcast_to(blocks, (len(rows), POSE_DOF, POSE_DOF))
+    offs = np.arange(POSE_DOF)
+    ii = np.broadcast_to(rows[:, None, None] * POSE_DOF + offs[:, None], blocks.shape)
+    jj = np.broadcast_to(cols[:, None, None] * POSE_DOF + offs[None, :], blocks.shape)
+    return ii.ravel(), jj.ravel(), blocks.ravel()
+
+
+def assemble_hessian(graph: PoseGraph, poses: Optional[np.ndarray] = None, prior: float = 1e6):
+    """
+    Assemble the Gauss-Newton system H dx = -b as a sparse CSR matrix.
+
+    A strong prior on node 0 fixes the gauge freedom.
+    """
+    poses = graph.poses if poses is None else poses
+    e = edge_errors(graph, poses)
+    A, B = _edge_jacobians(graph, poses)
+    omega = graph.information[:, None, :]
+    At_W = np.swapaxes(A, 1, 2) * omega
+    Bt_W = np.swapaxes(B, 1, 2) * omega
+
+    i, j = graph.edge_from, graph.edge_to
+    parts = [
+        _scatter_blocks(At_W @ A, i, i),
+        _scatter_blocks(At_W @ B, i, j),
+        _scatter_blocks(Bt_W @ A, j, i),
+        _scatter_blocks(Bt_W @ B, j, j),
+        _scatter_blocks(prior * np.eye(POSE_DOF)[None], np.zeros(1, int), np.zeros(1, int)),
+    ]
+    rows, cols, vals = (np.concatenate(x) for x in zip(*parts))
+    n = graph.num_nodes * POSE_DOF
+    H = sp.csr_matrix((vals, (rows, cols)), shape=(n, n))
+
+    b = np.zeros(n)
+    offs = np.arange(POSE_DOF)
+    np.add.at(b, i[:, None] * POSE_DOF + offs, (At_W @ e[..., None])[..., 0])
+    np.add.at(b, j[:, None] * POSE_DOF + offs, (Bt_W @ e[..., None])[..., 0])
+    return H, b
+
+
+def reorder(H: sp.spmatrix):
+    """Reverse Cuthill-McKee permutation and the permuted matrix."""
+    perm = reverse_cuthill_mckee(sp.csr_matrix(H), symmetric_mode=True)
+    return perm, H[perm][:, perm]
+
+
+def bandwidth(H: sp.spmatrix) -> int:
+    coo = sp.coo_matrix(H)
+    return int(np.max(np.abs(coo.row - coo.col))) if coo.nnz else 0
+
+
+def optimize(graph: PoseGraph, iterations: int = 10, tolerance: float = 1e-9) -> List[np.ndarray]:
+    """
+    Gauss-Newton on the pose graph.
+
+    Returns the pose estimate after every iteration, starting with the input.
+    """
+    poses = graph.poses.copy()
+    history = [poses.copy()]
+    error = total_error(graph, poses)
+    for _ in range(iterations):
+        H, b = assemble_hessian(graph, poses)
+        dx = spla.spsolve(H.tocsc(), -b, permc_spec="COLAMD")
+        poses = poses + dx.reshape(-1, POSE_DOF)
+        poses[:, 2] = wrap_angle(poses[:, 2])
+        history.append(poses.copy())
+        new_error = total_error(graph, poses)
+        if abs(error - new_error) <= tolerance * max(error, 1.0):
+            break
+        error = new_error
+    return history
+
+
+def sparsity_image(matrix: sp.spmatrix, resolution: int = 512) -> np.ndarray:
+    """
+    Rasterize the nonzero pattern into a (resolution, resolution) uint8 image.
+
+    Each pixel covers a square tile of the matrix and is lit if any entry in
+    the tile is nonzero, so the cost depends on nnz rather than on n².
+    """
+    coo = sp.coo_matrix(matrix)
+    n_rows, n_cols = coo.shape
+    res = min(resolution, max(n_rows, n_cols))
+    image = np.zeros((res, res), dtype=np.uint8)
+    image[coo.row * res // n_rows, coo.col * res // n_cols] = 255
+    return image
+
+
+def make_loop_graph(
+    num_nodes: int = 11,
+    laps: float = 1.0,
+    num_loop_closures: int = 0,
+    radius: float = 3.0,
+    odometry_noise: float = 0.02,
+    seed: Optional[int] = 0,
+):
+    """
+    A robot driving ``laps`` times around a circle with noisy odometry.
+
+    Loop closures connect nodes that revisit the same place on a later lap
+    (or the last node to the first when ``laps == 1``). Returns the graph with
+    dead-reckoned initial poses, and the ground-truth poses.
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi * laps, num_nodes, endpoint=laps != 1.0)
+    truth = np.column_stack([radius * np.cos(angles), radius * np.sin(angles), wrap_angle(angles + np.pi / 2)])
+
+    steps = relative_poses(truth[:-1], truth[1:])
+    noisy_steps = steps + rng.normal(0, odometry_noise, steps.shape) * [1, 1, 0.5]
+    poses = chain_odometry(truth[0], noisy_steps)
+    idx = np.arange(num_nodes - 1)
+    graph = PoseGraph(poses, idx, idx + 1, noisy_steps, np.full((num_nodes - 1, 3), 1.0 / odometry_noise**2))
+
+    if num_loop_closures:
+        graph = add_loop_closures(graph, truth, num_loop_closures, laps, rng)
+    return graph, truth
+
+
+def add_loop_closures(graph: PoseGraph, truth: np.ndarray, count: int, laps: float = 1.0, rng=None) -> PoseGraph:
+    """Append ``count`` accurate loop-closure edges between revisited places."""
+    rng = np.random.default_rng() if rng is None else rng
+    n = len(truth)
+    per_lap = n / laps if laps > 1 else n - 1
+    if laps > 1:
+        later = rng.integers(int(np.ceil(per_lap)), n, size=count)
+        earlier = later - int(round(per_lap)) * rng.integers(1, int(laps) + 1, size=count)
+        keep = earlier >= 0
+        earlier, later = earlier[keep], later[keep]
+    else:
+        earlier, later = np.zeros(1, int), np.full(1, n - 1)
+    z = relative_poses(truth[earlier], truth[later])
+    info = np.full((len(earlier), 3), 1.0 / 0.01**2)
+    return graph.with_edges(earlier, later, z, info)
@@ -1,15 +1,68 @@
+import os
+import time
+
 import numpy as np
 from manim import *
 
-class PoseGraphOptimization(Scene):
+from pose_graph import (
+    add_loop_closures, assemble_hessian, bandwidth, make_loop_graph, optimize, reorder, sparsity_image, total_error
+)
+from config import ProfiledScene
+
+def sparsity_pattern_mobject(matrix, height=3.0, color=BLUE, resolution=512):
+    """
+    Render the nonzero pattern of a sparse matrix as a single ImageMobject.
+
+    The pattern is rasterized with ``sparsity_image`` instead of drawing one
+    square per entry, so even 10k x 10k patterns are a single texture.
+    """
+    pattern = sparsity_image(matrix, resolution) > 0
+    rgba = np.zeros(pattern.shape + (4,), dtype=np.uint8)
+    rgba[pattern, :3] = color_to_int_rgb(color)
+    rgba[..., 3] = 255
+    image = ImageMobject(rgba).set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+    image.height = height
+    frame = SurroundingRectangle(image, color=GRAY, buff=0, stroke_width=2)
+    return Group(image, frame)
+
+def build_graph_geometry(poses, edge_from, edge_to, scale=1.0, center=ORIGIN):
+    """
+    Build the trajectory and the loop-closure edges as two VMobjects.
+
+    Every node and edge goes into one point array instead of one Dot/Line
+    mobject each, so construction stays linear and cheap for 50k poses.
+    """
+    xyz = np.column_stack([poses[:, :2] * scale, np.zeros(len(poses))]) + center
+    trajectory = VMobject(stroke_color=BLUE, stroke_width=1.5)
+    trajectory.set_points_as_corners(xyz)
+
+    # Odometry edges are already drawn by the trajectory; keep only the loop closures
+    loops = edge_to - edge_from != 1
+    a, b = xyz[edge_from[loops]], xyz[edge_to[loops]]
+    # One straight cubic Bezier per edge; disjoint segments become separate subpaths
+    segment_points = np.stack([a, a + (b - a) / 3, a + 2 * (b - a) / 3, b], axis=1).reshape(-1, 3)
+    loop_edges = VMobject(stroke_color=RED, stroke_width=0.5, stroke_opacity=0.6)
+    loop_edges.set_points(segment_points)
+    return trajectory, loop_edges
+
+class PoseGraphOptimization(ProfiledScene, Scene):
     """
     A Manim scene to visualize the core concepts of Pose Graph Optimization in SLAM.
     1. Shows how visual odometry accumulates drift.
     2. Shows the creation of a loop closure constraint.
     3. Visualizes the optimization process that corrects the graph.
     """
+    metadata = {
+        "order": 8,
+        "title": "Pose Graph Optimization",
+        "description": "Visualization of drift accumulation and correction through loop closures.",
+        "complexity": "Advanced",
+        "icon": "fas fa-sitemap",
+    }
+
     def construct(self):
         # --- Act 1: Visual Odometry and Drift ---
+        self.next_section("drift")
         title = Text("Pose Graph Optimization").scale(0.9).to_edge(UP)
         self.play(Write(title))
         self.wait(0.5)
@@ -23,10 +76,12 @@ class PoseGraphOptimization(Scene):
         self.wait(1)
 
         # --- Act 2: Loop Closure ---
+        self.next_section("loop_closure")
         self.show_loop_closure_animation()
         self.wait(1)
 
         # --- Act 3: Optimization ---
+        self.next_section("optimization")
         self.show_optimization_animation()
         self.wait(3)
 
@@ -127,4 +182,121 @@ class PoseGraphOptimization(Scene):
 
         # Conclude with a success message
         final_text = Text("Graph is now globally consistent", color=GREEN_B, font_size=32).next_to(objective_function, UP, buff=0.5)
-        self.play(Write(final_text))
\ No newline at end of file
+        self.play(Write(final_text))
+
+
+class PoseGraphSparsity(ProfiledScene, Scene):
+    """
+    A Manim scene to visualize the sparsity of the pose graph Hessian H = JᵀΩJ.
+    1. Odometry alone gives a block-tridiagonal H.
+    2. Loop closures add off-diagonal blocks far from the diagonal.
+    3. Reverse Cuthill-McKee reordering pulls them back into a narrow band.
+    """
+    metadata = {
+        "order": 12,
+        "title": "Pose Graph Sparsity",
+        "description": "How loop closures spread the pose graph Hessian and how reordering restores its band.",
+        "complexity": "Advanced",
+        "icon": "fas fa-th",
+    }
+    num_nodes = 300
+    laps = 3
+    num_loop_closures = 40
+
+    def construct(self):
+        title = Text("Structure of the Pose Graph Hessian").scale(0.8).to_edge(UP)
+        self.play(Write(title))
+
+        graph, truth = make_loop_graph(self.num_nodes, laps=self.laps)
+        H_odometry, _ = assemble_hessian(graph)
+        closed = add_loop_closures(graph, truth, self.num_loop_closures, laps=self.laps, rng=np.random.default_rng(1))
+        H_closed, _ = assemble_hessian(closed)
+        _, H_reordered = reorder(H_closed)
+
+        panels = []
+        for matrix, label_text, color in [
+            (H_odometry, "Odometry only", BLUE),
+            (H_closed, "+ Loop closures", RED),
+            (H_reordered, "Reordered (RCM)", GREEN_B),
+        ]:
+            pattern = sparsity_pattern_mobject(matrix, height=3.2, color=color)
+            label = Text(label_text, font_size=26).next_to(pattern, UP, buff=0.2)
+            stats = Text(f"nnz {matrix.nnz:,}  |  bandwidth {bandwidth(matrix):,}", font_size=18).next_to(pattern, DOWN, buff=0.2)
+            panels.append(Group(label, pattern, stats))
+        Group(*panels).arrange(RIGHT, buff=0.6).shift(DOWN * 0.3)
+
+        objective = MathTex(r"H = \sum_{(i,j)} J_{ij}^T \mathbf{\Omega}_{ij} J_{ij}", font_size=36).next_to(title, DOWN, buff=0.2)
+        self.play(Write(objective))
+
+        for panel in panels:
+            self.play(FadeIn(panel, shift=UP * 0.2), run_time=1.2)
+            self.wait(1)
+
+        final_text = Text("Same nonzeros, far less fill-in during factorization", color=GREEN_B, font_size=28).to_edge(DOWN)
+        self.play(Write(final_text))
+        self.wait(3)
+
+
+
+class LargePoseGraphOptimization(ProfiledScene, Scene):
+    """
+    A large-scale variant of PoseGraphOptimization: thousands of poses driving
+    several laps with many loop closures. The node count is read from the
+    SLAM_POSE_GRAPH_NODES environment variable (e.g. 1000, 10000, 50000) when
+    the scene is set up, and the solve and geometry build times are recorded
+    in ``self.timings``. The solver stops at a looser tolerance than the small
+    scene's, so the animation does not spend iterations on invisible changes.
+    """
+    num_nodes = 10_000
+    laps = 10
+    loop_closure_ratio = 0.1
+    iterations = 15
+    tolerance = 1e-6
+
+    def setup(self):
+        super().setup()
+        self.num_nodes = int(os.environ.get("SLAM_POSE_GRAPH_NODES", self.num_nodes))
+
+    def construct(self):
+        self.timings = {}
+        title = Text(f"Pose Graph Optimization at Scale: {self.num_nodes:,} Poses").scale(0.7).to_edge(UP)
+        self.play(Write(title))
+
+        graph, truth = make_loop_graph(
+            self.num_nodes, laps=self.laps, num_loop_closures=int(self.num_nodes * self.loop_closure_ratio)
+        )
+        start = time.perf_counter()
+        history = optimize(graph, self.iterations, self.tolerance)
+        self.timings["solve"] = time.perf_counter() - start
+
+        # Fit the ground truth circle into the frame; drifted estimates may spill over
+        scale = 2.8 / np.abs(truth[:, :2]).max()
+        center = DOWN * 0.4
+        start = time.perf_counter()
+        frames = [build_graph_geometry(poses, graph.edge_from, graph.edge_to, scale, center) for poses in history]
+        self.timings["build"] = time.perf_counter() - start
+
+        trajectory, loop_edges = frames[0]
+        stats = Text(
+            f"{graph.num_nodes:,} nodes  |  {graph.num_edges:,} edges  |  solved in {self.timings['solve']:.2f}s",
+            font_size=24
+        ).to_edge(DOWN)
+        self.play(Create(trajectory), run_time=2)
+        self.play(FadeIn(loop_edges), Write(stats))
+        self.wait(1)
+
+        error_label = Text("Σ eᵀΩe", font_size=28).to_corner(UR).shift(DOWN * 0.6)
+        error_value = DecimalNumber(total_error(graph, history[0]), num_decimal_places=0, font_size=32).next_to(error_label, DOWN)
+        self.play(FadeIn(error_label), FadeIn(error_value))
+
+        for poses, (next_trajectory, next_loops) in zip(history[1:], frames[1:]):
+            self.play(
+                Transform(trajectory, next_trajectory),
+                Transform(loop_edges, next_loops),
+                error_value.animate.set_value(total_error(graph, poses)),
+                run_time=0.8
+            )
+
+        final_text = Text("Globally consistent", color=GREEN_B, font_size=32).next_to(title, DOWN)
+        self.play(Write(final_text))
+        self.wait(2)
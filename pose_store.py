@@ -0,0 +1,162 @@
+"""
+Compact storage for long pose trajectories.
+
+Poses in the scenes are built as ad hoc 4x4 ``np.eye(4)`` float64 matrices
+(128 bytes each). ``PoseStore`` keeps the same information as a unit
+quaternion plus translation (7 floats) in one contiguous structured array,
+optionally in float32 (28 bytes per pose), and persists it through
+``np.memmap`` so long trajectories can be paged in instead of loaded.
+"""
+
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+# Quaternions follow the scipy convention: (x, y, z, w)
+QUAT_FIELD = "q"
+TRANS_FIELD = "t"
+
+
+def pose_dtype(dtype=np.float32) -> np.dtype:
+    """Structured dtype for a single quaternion+translation pose."""
+    return np.dtype([(QUAT_FIELD, dtype, (4,)), (TRANS_FIELD, dtype, (3,))])
+
+
+def quaternions_to_matrices(quats: np.ndarray) -> np.ndarray:
+    """Convert (N, 4) xyzw quaternions to (N, 3, 3) rotation matrices."""
+    q = np.asarray(quats, dtype=np.float64)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    mats = np.empty(q.shape[:-1] + (3, 3))
+    mats[..., 0, 0] = 1 - 2 * (yy + zz)
+    mats[..., 0, 1] = 2 * (xy - wz)
+    mats[..., 0, 2] = 2 * (xz + wy)
+    mats[..., 1, 0] = 2 * (xy + wz)
+    mats[..., 1, 1] = 1 - 2 * (xx + zz)
+    mats[..., 1, 2] = 2 * (yz - wx)
+    mats[..., 2, 0] = 2 * (xz - wy)
+    mats[..., 2, 1] = 2 * (yz + wx)
+    mats[..., 2, 2] = 1 - 2 * (xx + yy)
+    return mats
+
+
+def matrices_to_quaternions(mats: np.ndarray) -> np.ndarray:
+    """Convert (N, 3, 3) rotation matrices to (N, 4) xyzw quaternions."""
+    m = np.asarray(mats, dtype=np.float64)
+    trace = m[..., 0, 0] + m[..., 1, 1] + m[..., 2, 2]
+    # One candidate per largest diagonal term keeps the division well conditioned
+    cands = np.stack([
+        np.stack([1 + 2 * m[..., 0, 0] - trace, m[..., 1, 0] + m[..., 0, 1],
+                  m[..., 2, 0] + m[..., 0, 2], m[..., 2, 1] - m[..., 1, 2]], axis=-1),
+        np.stack([m[..., 1, 0] + m[..., 0, 1], 1 + 2 * m[..., 1, 1] - trace,
+                  m[..., 2, 1] + m[..., 1, 2], m[..., 0, 2] - m[..., 2, 0]], axis=-1),
+        np.stack([m[..., 2, 0] + m[..., 0, 2], m[..., 2, 1] + m[..., 1, 2],
+                  1 + 2 * m[..., 2, 2] - trace, m[..., 1, 0] - m[..., 0, 1]], axis=-1),
+        np.stack([m[..., 2, 1] - m[..., 1, 2], m[..., 0, 2] - m[..., 2, 0],
+                  m[..., 1, 0] - m[..., 0, 1], 1 + trace], axis=-1),
+    ], axis=-2)
+    diag = np.stack([m[..., 0, 0], m[..., 1, 1], m[..., 2, 2], trace], axis=-1)
+    best = np.argmax(diag, axis=-1)
+    quats = np.take_along_axis(cands, best[..., None, None], axis=-2)[..., 0, :]
+    quats /= np.linalg.norm(quats, axis=-1, keepdims=True)
+    # Canonical sign: non-negative w
+    return np.where(quats[..., 3:] < 0, -quats, quats)
+
+
+class PoseStore:
+    """
+    A contiguous array of SE(3) poses stored as quaternion + translation.
+
+    ``positions`` and ``rotations`` are zero-copy views into the underlying
+    structured array, so writes through them update the store in place.
+    """
+
+    def __init__(self, data: np.ndarray):
+        if data.dtype.names != (QUAT_FIELD, TRANS_FIELD):
+            raise ValueError(f"Expected a pose structured array, got dtype {data.dtype}")
+        self.data = data
+
+    @classmethod
+    def empty(cls, n: int, dtype=np.float32) -> "PoseStore":
+        """Create a store of ``n`` identity poses."""
+        data = np.zeros(n, dtype=pose_dtype(dtype))
+        data[QUAT_FIELD][:, 3] = 1
+        return cls(data)
+
+    @classmethod
+    def from_arrays(cls, quats: np.ndarray, translations: np.ndarray, dtype=np.float32) -> "PoseStore":
+        """Build a store from (N, 4) xyzw quaternions and (N, 3) translations."""
+        quats = np.atleast_2d(quats)
+        translations = np.atleast_2d(translations)
+        if len(quats) != len(translations):
+            raise ValueError("quats and translations must have the same length")
+        store = cls.empty(len(quats), dtype)
+        store.rotations[:] = quats
+        store.positions[:] = translations
+        return store
+
+    @classmethod
+    def from_matrices(cls, mats: np.ndarray, dtype=np.float32) -> "PoseStore":
+        """Build a store from a (4, 4) or (N, 4, 4) array of homogeneous matrices."""
+        mats = np.asarray(mats)
+        if mats.ndim == 2:
+            mats = mats[None]
+        return cls.from_arrays(matrices_to_quaternions(mats[:, :3, :3]), mats[:, :3, 3], dtype)
+
+    @classmethod
+    def load(cls, path: Union[str, Path], mode: str = "r") -> "PoseStore":
+        """Memory-map a store previously written with ``save``."""
+        return cls(np.load(path, mmap_mode=mode))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the store to a ``.npy`` file through ``np.memmap``."""
+        out = np.lib.format.open_memmap(path, mode="w+", dtype=self.data.dtype, shape=self.data.shape)
+        out[:] = self.data
+        out.flush()
+        del out
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(N, 3) translation view."""
+        return self.data[TRANS_FIELD]
+
+    @property
+    def rotations(self) -> np.ndarray:
+        """(N, 4) xyzw quaternion view."""
+        return self.data[QUAT_FIELD]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def as_matrices(self) -> np.ndarray:
+        """Expand to (N, 4, 4) float64 homogeneous matrices."""
+        mats = np.zeros((len(self), 4, 4))
+        mats[:, :3, :3] = quaternions_to_matrices(self.rotations)
+        mats[:, :3, 3] = self.positions
+        mats[:, 3, 3] = 1
+        return mats
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index) -> "PoseStore":
+        data = self.data[index]
+        if data.ndim == 0:
+            data = data.reshape(1)
+        return PoseStore(data)
+
+
+def as_pose_matrices(poses) -> np.ndarray:
+    """Coerce a ``PoseStore``, a (4, 4) matrix or an (N, 4, 4) stack to (N, 4, 4)."""
+    if isinstance(poses, PoseStore):
+        return poses.as_matrices()
+    mats = np.asarray(poses, dtype=np.float64)
+    if mats.shape[-2:] != (4, 4):
+        raise ValueError(f"Expected 4x4 pose matrices, got shape {mats.shape}")
+    return mats[None] if mats.ndim == 2 else mats
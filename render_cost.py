@@ -0,0 +1,586 @@
+"""
+Render-cost estimates for scheduling scene renders.
+
+A scene's render time is dominated by how many frames it has, how many
+pixels each frame has and how many 3D surface faces are on screen while
+those frames are drawn. ``SceneCost`` holds those features, from one of two
+sources:
+
+* ``static_cost`` reads them off the scene source with ``ast`` (``play`` and
+  ``wait`` calls with literal run times, loops whose bounds are literals or
+  numeric constants assigned in the scene, surface constructors), without
+  importing manim. An ``if`` on a flag passed to a helper follows that
+  branch; otherwise only the busier branch counts.
+* ``measure_cost`` runs the scene headless (see ``dry_run``) and records the
+  exact run time of every ``play``/``wait`` and the faces on screen during it.
+
+``CostModel`` turns the features into seconds. It starts from rough
+defaults and is refitted from the wall-clock times of past renders, which
+``generate_previews.py`` records in ``media/render_costs.json`` together with
+measured costs.
+
+    python render_cost.py --profile preview             # estimates, longest first
+    python render_cost.py --measure SE3RelativePose     # refresh a dry-run measurement
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import tempfile
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from config import PROFILES, RenderProfile
+from scene_registry import SceneEntry, discover_scenes, filter_scenes
+
+DEFAULT_COST_FILE = Path(__file__).parent / "media" / "render_costs.json"
+# Target quality of plain ``manim -ql`` renders (no profile selected)
+LOW_QUALITY = RenderProfile("low", mesh_scale=1.0, frame_rate=15, pixel_width=854, pixel_height=480)
+
+# manim's defaults for a play() without run_time and a bare wait()
+DEFAULT_RUN_TIME = 1.0
+DEFAULT_WAIT_TIME = 1.0
+# Assumed iterations of a loop whose bound is only known at runtime
+DEFAULT_LOOP_ITERATIONS = 4
+# Faces of each 3D primitive at manim's default resolution
+NOMINAL_FACES = {
+    "Surface": 32 * 32,
+    "Sphere": 101 * 51,
+    "Dot3D": 8 * 8,
+    "Cylinder": 24 * 24,
+    "Line3D": 24 * 24,
+    "Cone": 36 * 24,
+    "Arrow3D": 24 * 24 + 36 * 24,
+    "Torus": 101 * 101,
+    "Cube": 6,
+    "Prism": 6,
+}
+# Project helpers that build one of the primitives above
+SURFACE_HELPERS = {
+    "cached_sphere": "Sphere",
+    "lod_sphere": "Sphere",
+    "cached_cylinder": "Cylinder",
+    "cached_arrow3d": "Arrow3D",
+    "lod_arrow3d": "Arrow3D",
+}
+
+# Timeout = max(MIN_TIMEOUT, TIMEOUT_FACTOR * predicted + TIMEOUT_SLACK) seconds
+MIN_TIMEOUT = 120.0
+TIMEOUT_FACTOR = 3.0
+TIMEOUT_SLACK = 60.0
+# Past renders kept for calibration, and needed before all coefficients are refitted
+MAX_HISTORY = 500
+# A scene's own latest renders that its timeout is based on, when it has some
+RECENT_RENDERS = 5
+MIN_CALIBRATION_SAMPLES = 6
+
+
+@dataclass
+class SceneCost:
+    """Cost features of one scene at one render profile."""
+
+    scene: str
+    profile: str
+    plays: float = 0.0
+    waits: float = 0.0
+    # Seconds of video
+    run_time: float = 0.0
+    frames: float = 0.0
+    # Frames times output megapixels
+    pixel_frames: float = 0.0
+    # Sum over frames of the 3D surface faces on screen
+    face_frames: float = 0.0
+    # Primitives built (static estimate) or peak count on screen (dry run), by type
+    surfaces: Dict[str, float] = field(default_factory=dict)
+    source: str = "static"
+    source_hash: str = ""
+
+    @property
+    def duration_label(self) -> str:
+        return f"{round(self.run_time)}s"
+
+    def features(self) -> np.ndarray:
+        return np.array([1.0, self.frames, self.pixel_frames, self.face_frames])
+
+    @classmethod
+    def from_record(cls, record: dict) -> "SceneCost":
+        return cls(**{k: v for k, v in record.items() if k in cls.__dataclass_fields__})
+
+
+@dataclass
+class CostModel:
+    """Linear model of render seconds from ``SceneCost`` features."""
+
+    # manim import, LaTeX and file writing
+    overhead: float = 10.0
+    per_frame: float = 0.01
+    per_megapixel_frame: float = 0.05
+    per_face_frame: float = 1e-4
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        return np.array([self.overhead, self.per_frame, self.per_megapixel_frame, self.per_face_frame])
+
+    def predict(self, cost: SceneCost) -> float:
+        """Expected wall-clock seconds to render ``cost``'s scene."""
+        return float(self.coefficients @ cost.features())
+
+    def timeout(self, cost: SceneCost, history: Sequence[float] = ()) -> float:
+        """
+        A render timeout that leaves room for a slow or busy machine.
+
+        ``history`` are the scene's own recent render times; a scene the
+        model underestimates gets its timeout from those instead.
+        """
+        expected = max(self.predict(cost), float(np.median(history)) if len(history) else 0.0)
+        return max(MIN_TIMEOUT, TIMEOUT_FACTOR * expected + TIMEOUT_SLACK)
+
+    @classmethod
+    def fit(cls, timings: Sequence[dict]) -> "CostModel":
+        """
+        Calibrate from past renders (``SceneCost`` fields plus ``seconds``).
+
+        With few samples the default coefficients are only rescaled by the
+        median ratio of actual to predicted time; with enough, all four are
+        refitted by non-negative least squares on relative error.
+        """
+        model = cls()
+        if not timings:
+            return model
+        features = np.array([SceneCost.from_record(t).features() for t in timings])
+        seconds = np.array([t["seconds"] for t in timings], dtype=float)
+        if len(timings) >= MIN_CALIBRATION_SAMPLES:
+            from scipy.optimize import nnls
+
+            weights = 1.0 / np.maximum(seconds, 1.0)
+            coefficients, _ = nnls(features * weights[:, None], seconds * weights)
+            if np.any(coefficients[1:] > 0):
+                return cls(*coefficients)
+        ratio = np.median(seconds / np.maximum(features @ model.coefficients, 1e-9))
+        return cls(*(model.coefficients * ratio))
+
+
+def get_target(profile: Optional[str]) -> RenderProfile:
+    """The profile a render targets; ``None`` means manim's ``-ql``."""
+    return PROFILES[profile] if profile else LOW_QUALITY
+
+
+def source_hash(entry: SceneEntry) -> str:
+    return hashlib.sha1(entry.path.read_bytes()).hexdigest()[:16]
+
+
+def _finish(cost: SceneCost, target: RenderProfile, face_seconds: float) -> SceneCost:
+    cost.frames = cost.run_time * target.frame_rate
+    cost.pixel_frames = cost.frames * target.pixel_width * target.pixel_height / 1e6
+    cost.face_frames = face_seconds * target.frame_rate
+    return cost
+
+
+# --- Static estimate -----------------------------------------------------------
+
+def _literal(node: Optional[ast.AST]):
+    """Literal value of ``node``, looking through wrappers such as ``scale_resolution((32, 32))``."""
+    if node is None:
+        return None
+    if isinstance(node, ast.Call) and len(node.args) == 1 and not node.keywords:
+        return _literal(node.args[0])
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+_OPERATORS = {
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.Div: lambda a, b: a / b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b,
+}
+
+
+def _name(node: ast.AST) -> Optional[str]:
+    """``x`` for a local name, ``self.x`` for an attribute of the scene."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+        return f"self.{node.attr}"
+    return None
+
+
+def _number(node: Optional[ast.AST], names: Optional[Dict[str, float]] = None) -> Optional[float]:
+    """
+    Numeric value of ``node``: a literal, or arithmetic on literals and the
+    numeric constants in ``names`` (such as ``num_steps + 1``).
+    """
+    names = names or {}
+    if isinstance(node, ast.BinOp) and type(node.op) in _OPERATORS:
+        left, right = _number(node.left, names), _number(node.right, names)
+        try:
+            return None if left is None or right is None else float(_OPERATORS[type(node.op)](left, right))
+        except ZeroDivisionError:
+            return None
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _number(node.operand, names)
+        return None if value is None else -value
+    if node is not None and _name(node) in names:
+        return names[_name(node)]
+    value = _literal(node)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _keyword(node: ast.Call, name: str) -> Optional[ast.AST]:
+    return next((k.value for k in node.keywords if k.arg == name), None)
+
+
+def _call_name(node: ast.Call) -> str:
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    return node.func.attr if isinstance(node.func, ast.Attribute) else ""
+
+
+def _is_self_call(node: ast.Call) -> bool:
+    func = node.func
+    return isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "self"
+
+
+def _iterations(node: ast.AST, names: Optional[Dict[str, float]] = None) -> float:
+    """Number of items ``node`` iterates over, if it can be read off the source."""
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return float(len(node.elts))
+    if isinstance(node, ast.Call):
+        name = _call_name(node)
+        if name == "range":
+            bounds = [_number(arg, names) for arg in node.args]
+            if bounds and None not in bounds:
+                start, stop, step = (0.0, bounds[0], 1.0) if len(bounds) == 1 else (bounds + [1.0])[:3]
+                return float(max(0, len(range(int(start), int(stop), int(step) or 1))))
+        elif name in ("enumerate", "reversed", "zip") and node.args:
+            return _iterations(node.args[0], names)
+        elif name == "linspace" and len(node.args) >= 3 and _number(node.args[2], names) is not None:
+            return _number(node.args[2], names)
+    return float(DEFAULT_LOOP_ITERATIONS)
+
+
+def _surface_faces(kind: str, node: ast.Call, mesh_scale: float) -> float:
+    if kind in ("Cube", "Prism"):
+        return float(NOMINAL_FACES[kind])
+    resolution = _literal(_keyword(node, "resolution"))
+    if isinstance(resolution, int):
+        faces = resolution ** 2
+    elif isinstance(resolution, (tuple, list)) and all(isinstance(r, int) for r in resolution):
+        faces = float(np.prod(resolution))
+    else:
+        faces = NOMINAL_FACES[kind]
+    return faces * mesh_scale ** 2
+
+
+class _StaticCounter(ast.NodeVisitor):
+    """Walk ``construct`` and the helpers it calls, weighting calls by loop counts."""
+
+    def __init__(self, methods: Dict[str, ast.FunctionDef], mesh_scale: float, constants: Optional[Dict[str, float]] = None):
+        self.methods = methods
+        self.mesh_scale = mesh_scale
+        # Numeric class attributes (``self.x``); each method adds its arguments and locals
+        self.constants = dict(constants or {})
+        self.names = dict(self.constants)
+        self.multiplier = 1.0
+        self.active = []
+        self.cost = SceneCost("", "")
+        self.surfaces = Counter()
+        self.faces = 0.0
+
+    def _repeat(self, count: float, nodes: Iterable[ast.AST]):
+        if not count:
+            return
+        self.multiplier *= count
+        for node in nodes:
+            self.visit(node)
+        self.multiplier /= count
+
+    def _forget(self, target: ast.AST):
+        for node in ast.walk(target):
+            self.names.pop(_name(node), None)
+
+    def visit_Assign(self, node):
+        self.visit(node.value)
+        value = _number(node.value, self.names)
+        for target in node.targets:
+            self._forget(target)
+            if value is not None and _name(target):
+                self.names[_name(target)] = value
+
+    def visit_AugAssign(self, node):
+        self.generic_visit(node)
+        self._forget(node.target)
+
+    def visit_For(self, node):
+        self.visit(node.iter)
+        count = _iterations(node.iter, self.names)
+        self._forget(node.target)
+        self._repeat(count, node.body)
+        for statement in node.orelse:
+            self.visit(statement)
+
+    def _arguments(self, call: ast.Call, method: ast.FunctionDef) -> Dict[str, float]:
+        """Parameters of ``method`` that ``call`` passes a known number or flag."""
+        passed = dict(zip([arg.arg for arg in method.args.args[1:]], call.args))
+        passed.update({keyword.arg: keyword.value for keyword in call.keywords if keyword.arg})
+        known = {}
+        for parameter, value in passed.items():
+            flag = _literal(value)
+            number = flag if isinstance(flag, bool) else _number(value, self.names)
+            if number is not None:
+                known[parameter] = number
+        return known
+
+    def _snapshot(self):
+        return (self.cost.plays, self.cost.waits, self.cost.run_time, self.faces, Counter(self.surfaces))
+
+    def _restore(self, snapshot):
+        self.cost.plays, self.cost.waits, self.cost.run_time, self.faces, surfaces = snapshot
+        self.surfaces = Counter(surfaces)
+
+    def visit_If(self, node):
+        """Follow a branch on a known flag, else count whichever branch plays more."""
+        self.visit(node.test)
+        if _name(node.test) in self.names:
+            for statement in node.body if self.names[_name(node.test)] else node.orelse:
+                self.visit(statement)
+            return
+        before = self._snapshot()
+        for statement in node.body:
+            self.visit(statement)
+        body = self._snapshot()
+        self._restore(before)
+        for statement in node.orelse:
+            self.visit(statement)
+        if body[:3] > self._snapshot()[:3]:
+            self._restore(body)
+
+    def visit_While(self, node):
+        self._repeat(float(DEFAULT_LOOP_ITERATIONS), [node.test] + node.body)
+
+    def visit_ListComp(self, node):
+        for generator in node.generators:
+            self.visit(generator.iter)
+        count = float(np.prod([_iterations(g.iter, self.names) for g in node.generators]))
+        parts = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+        self._repeat(count, parts + [condition for g in node.generators for condition in g.ifs])
+
+    visit_SetComp = visit_GeneratorExp = visit_DictComp = visit_ListComp
+
+    def visit_Call(self, node):
+        name = _call_name(node)
+        if _is_self_call(node) and name in ("play", "move_camera"):
+            run_time = _number(_keyword(node, "run_time"), self.names)
+            if run_time is None:
+                nested = (_number(_keyword(c, "run_time"), self.names) for c in ast.walk(node) if isinstance(c, ast.Call) and c is not node)
+                run_time = max((r for r in nested if r is not None), default=DEFAULT_RUN_TIME)
+            self.cost.plays += self.multiplier
+            self.cost.run_time += self.multiplier * run_time
+        elif _is_self_call(node) and name == "wait":
+            duration = _number(node.args[0] if node.args else _keyword(node, "duration"), self.names)
+            self.cost.waits += self.multiplier
+            self.cost.run_time += self.multiplier * (DEFAULT_WAIT_TIME if duration is None else duration)
+        elif _is_self_call(node) and name in self.methods and name not in self.active:
+            self.active.append(name)
+            caller, self.names = self.names, {**self.constants, **self._arguments(node, self.methods[name])}
+            for statement in self.methods[name].body:
+                self.visit(statement)
+            self.names = caller
+            self.active.pop()
+        kind = SURFACE_HELPERS.get(name, name)
+        if kind in NOMINAL_FACES:
+            self.surfaces[kind] += self.multiplier
+            self.faces += self.multiplier * _surface_faces(kind, node, self.mesh_scale)
+        self.generic_visit(node)
+
+
+def static_cost(entry: SceneEntry, profile: Optional[str] = None) -> SceneCost:
+    """Estimate ``entry``'s cost from its source alone."""
+    target = get_target(profile)
+    class_def = entry.class_def()
+    methods = {f.name: f for f in class_def.body if isinstance(f, ast.FunctionDef)}
+    constants = {}
+    for statement in class_def.body:
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1 and isinstance(statement.targets[0], ast.Name):
+            value = _number(statement.value)
+            if value is not None:
+                constants[f"self.{statement.targets[0].id}"] = value
+    counter = _StaticCounter(methods, target.mesh_scale, constants)
+    counter.active.append("construct")
+    for statement in methods["construct"].body if "construct" in methods else []:
+        counter.visit(statement)
+
+    cost = counter.cost
+    cost.scene, cost.profile, cost.source_hash = entry.name, target.name, source_hash(entry)
+    cost.run_time *= target.run_time_scale
+    cost.surfaces = {kind: round(count, 2) for kind, count in counter.surfaces.items()}
+    # Surfaces are assumed to stay on screen from the start
+    return _finish(cost, target, counter.faces * cost.run_time)
+
+
+# --- Dry-run measurement ---------------------------------------------------------
+
+def _on_screen(scene) -> Counter:
+    """Surface types and face count currently in ``scene``."""
+    from manim import Cube, Surface
+
+    counts = Counter()
+    for mob in scene.mobjects:
+        for member in mob.get_family():
+            if isinstance(member, (Surface, Cube)):
+                counts[type(member).__name__] += 1
+            elif hasattr(member, "u_index"):
+                counts["faces"] += 1
+    return counts
+
+
+def measure_cost(entry: SceneEntry, profile: Optional[str] = None) -> SceneCost:
+    """
+    Measure ``entry``'s cost with a headless run of its ``construct``.
+
+    The selected profile must already be active in this process
+    (``$SLAM_RENDER_PROFILE``), since the scene reads it at import time.
+    """
+    from dry_run import headless_scene
+
+    target = get_target(profile)
+    cost = SceneCost(entry.name, target.name, source="dry_run", source_hash=source_hash(entry))
+    peak = Counter()
+    face_seconds = [0.0]
+
+    with headless_scene(entry.load()) as scene:
+        renderer = scene.renderer
+        play = renderer.play
+
+        def measured_play(scene_, *args, **kwargs):
+            before = _on_screen(scene_)
+            start = renderer.time
+            result = play(scene_, *args, **kwargs)
+            elapsed = renderer.time - start
+            # FadeIn/Create add their surfaces during the play, FadeOut removes them after it
+            on_screen = before | _on_screen(scene_)
+            # wait() goes through play() with a single Wait animation
+            if scene_.animations and all(type(a).__name__ == "Wait" for a in scene_.animations):
+                cost.waits += 1
+            else:
+                cost.plays += 1
+            face_seconds[0] += on_screen.pop("faces", 0) * elapsed
+            for kind, count in on_screen.items():
+                peak[kind] = max(peak[kind], count)
+            return result
+
+        renderer.play = measured_play
+        scene.construct()
+        cost.run_time = renderer.time
+
+    cost.surfaces = dict(peak)
+    return _finish(cost, target, face_seconds[0])
+
+
+# --- Stored measurements and timings ---------------------------------------------
+
+def load_costs(path: Path = DEFAULT_COST_FILE) -> dict:
+    """Measured costs (``measured``: key -> record) and past render ``timings``."""
+    try:
+        data = json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        data = {}
+    data.setdefault("measured", {})
+    data.setdefault("timings", [])
+    return data
+
+
+def save_costs(data: dict, path: Path = DEFAULT_COST_FILE) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data["timings"] = data["timings"][-MAX_HISTORY:]
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp, path)
+
+
+def _measured_key(scene: str, target: str) -> str:
+    return f"{scene}@{target}"
+
+
+def store_measurement(data: dict, cost: SceneCost) -> None:
+    data["measured"][_measured_key(cost.scene, cost.profile)] = asdict(cost)
+
+
+def render_history(data: dict, cost: SceneCost) -> List[float]:
+    """Seconds of the latest ``RECENT_RENDERS`` renders of ``cost``'s scene at its profile."""
+    seconds = [t["seconds"] for t in data["timings"] if t["scene"] == cost.scene and t["profile"] == cost.profile]
+    return seconds[-RECENT_RENDERS:]
+
+
+def record_timing(data: dict, cost: SceneCost, seconds: float) -> None:
+    """Remember how long a render of ``cost``'s scene took, for calibration."""
+    data["timings"].append({**asdict(cost), "seconds": round(seconds, 3)})
+
+
+def estimate(entry: SceneEntry, profile: Optional[str] = None, data: Optional[dict] = None) -> SceneCost:
+    """
+    The stored dry-run measurement of ``entry`` if there is one, else the static estimate.
+
+    A measurement of an older version of the scene is still closer than the
+    static estimate; its ``source`` says it is stale.
+    """
+    target = get_target(profile)
+    record = (data or {}).get("measured", {}).get(_measured_key(entry.name, target.name))
+    if not record:
+        return static_cost(entry, profile)
+    cost = SceneCost.from_record(record)
+    if cost.source_hash != source_hash(entry):
+        cost.source = f"{cost.source} (stale)"
+    return cost
+
+
+def longest_first(entries: Iterable[SceneEntry], costs: Dict[str, SceneCost], model: CostModel) -> List[SceneEntry]:
+    """``entries`` ordered by predicted render time, longest first."""
+    return sorted(entries, key=lambda entry: model.predict(costs[entry.name]), reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate scene render costs.")
+    parser.add_argument("names", nargs="*", help="Only these scene classes (default: published scenes)")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=os.environ.get("SLAM_RENDER_PROFILE"))
+    parser.add_argument("--measure", action="store_true", help="Refresh dry-run measurements (imports manim)")
+    parser.add_argument("--costs", type=Path, default=DEFAULT_COST_FILE, help="Measurements and timings file")
+    args = parser.parse_args()
+
+    if args.measure and args.profile:
+        os.environ["SLAM_RENDER_PROFILE"] = args.profile
+    entries = filter_scenes(discover_scenes(), args.names or None, None if args.names else True)
+    data = load_costs(args.costs)
+    if args.measure:
+        for entry in entries:
+            try:
+                store_measurement(data, measure_cost(entry, args.profile))
+            except Exception as e:
+                print(f"❌ {entry.name}: {e}")
+        save_costs(data, args.costs)
+
+    model = CostModel.fit(data["timings"])
+    costs = {entry.name: estimate(entry, args.profile, data) for entry in entries}
+    print(f"{'scene':32s} {'plays':>6s} {'video':>7s} {'frames':>7s} {'faces·frames':>13s} {'render':>8s}  source")
+    for entry in longest_first(entries, costs, model):
+        cost = costs[entry.name]
+        print(
+            f"{entry.name:32s} {cost.plays + cost.waits:6.0f} {cost.run_time:6.1f}s {cost.frames:7.0f} "
+            f"{cost.face_frames:13.3g} {model.predict(cost):7.1f}s  {cost.source}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Asynchronous render orchestration with live progress.
+
+Each render is a subprocess started with ``asyncio.create_subprocess_exec``
+in its own process group. Its output is read while it runs: manim's progress
+bars (``Animation 12: Create(Circle): 45%|...``, ``Waiting 13: ...``) are
+turned into a fraction of the scene's plays and reported as they change,
+instead of only learning how a render went when it ended.
+
+``RenderOrchestrator`` runs the jobs with at most ``concurrency`` at a time,
+each only once its memory reservation fits the budget (``AsyncMemoryGate``).
+A job past its timeout, usually derived from the scene's past render times
+(``CostModel.timeout``), has its whole process group killed and is retried up
+to ``retries`` times. Cancelling the orchestrator, e.g. with Ctrl-C under
+``asyncio.run``, terminates every running render before it returns, so no
+manim or ffmpeg process is left behind.
+"""
+
+import asyncio
+import os
+import re
+import signal
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from memory_profile import AsyncMemoryGate
+
+# tqdm line of a manim play: "<desc>: <percent>%|"
+PROGRESS = re.compile(r"\b(?:Animation|Waiting) (\d+)\b.*?(\d{1,3})%\|")
+# Seconds a render gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE = 5.0
+# Progress reported to a log (not a terminal) in steps of this fraction
+LOG_STEP = 0.25
+
+
+@dataclass
+class RenderJob:
+    """One render subprocess."""
+
+    name: str
+    command: List[str]
+    timeout: float
+    # Plays and waits of the scene, to turn manim's play numbers into a fraction
+    plays: int = 0
+    memory_mb: float = 0.0
+
+
+@dataclass
+class RenderResult:
+    name: str
+    returncode: Optional[int]
+    seconds: float
+    stdout: str = ""
+    stderr: str = ""
+    timed_out: bool = False
+    attempts: int = 1
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+def parse_progress(line: str, plays: int) -> Optional[float]:
+    """Fraction of a scene done according to one progress line, or None."""
+    match = PROGRESS.search(line)
+    if match is None or plays <= 0:
+        return None
+    play, percent = int(match.group(1)), int(match.group(2))
+    return min(1.0, (play + percent / 100) / plays)
+
+
+async def _read_lines(stream: asyncio.StreamReader, sink: List[str], on_line: Callable[[str], None]) -> None:
+    """Collect ``stream`` and pass on every line, including tqdm's ``\\r`` redraws."""
+    pending = ""
+    while chunk := await stream.read(4096):
+        text = chunk.decode(errors="replace")
+        sink.append(text)
+        *lines, pending = re.split(r"[\r\n]", pending + text)
+        for line in lines:
+            on_line(line)
+    if pending:
+        on_line(pending)
+
+
+async def _stop(process: asyncio.subprocess.Process) -> None:
+    """Terminate ``process``'s group, killing it if it does not exit in time."""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            return
+        try:
+            await asyncio.wait_for(process.wait(), TERMINATE_GRACE)
+            return
+        except asyncio.TimeoutError:
+            continue
+
+
+async def run_job(
+    job: RenderJob,
+    on_progress: Callable[[str, float], None] = lambda name, fraction: None,
+    **kwargs,
+) -> RenderResult:
+    """
+    Run one attempt of ``job``; ``kwargs`` go to ``create_subprocess_exec`` (cwd, env).
+
+    A timeout is reported in the result; cancellation stops the render and
+    is re-raised.
+    """
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *job.command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        start_new_session=True, **kwargs,
+    )
+    stdout, stderr, done = [], [], [0.0]
+
+    def progress(line: str) -> None:
+        fraction = parse_progress(line, job.plays)
+        # Section renders in parallel interleave their plays; report the furthest
+        if fraction is not None and fraction > done[0]:
+            done[0] = fraction
+            on_progress(job.name, fraction)
+
+    timed_out = False
+    try:
+        await asyncio.wait_for(asyncio.gather(
+            _read_lines(process.stdout, stdout, progress),
+            _read_lines(process.stderr, stderr, progress),
+            process.wait(),
+        ), job.timeout)
+    except asyncio.TimeoutError:
+        timed_out = True
+        await _stop(process)
+    except asyncio.CancelledError:
+        await asyncio.shield(_stop(process))
+        raise
+    return RenderResult(
+        job.name, process.returncode, time.perf_counter() - start, "".join(stdout), "".join(stderr), timed_out,
+    )
+
+
+class ProgressBoard:
+    """
+    Live progress of the running renders.
+
+    On a terminal one status line is redrawn; in a log a line is printed
+    per ``LOG_STEP`` of each scene.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.live = self.stream.isatty()
+        self.running: Dict[str, float] = {}
+
+    def update(self, name: str, fraction: float) -> None:
+        previous = self.running.get(name, 0.0)
+        self.running[name] = fraction
+        if self.live:
+            status = " · ".join(f"{n} {f:4.0%}" for n, f in self.running.items())
+            self.stream.write(f"\r\033[K⏳ {status}")
+            self.stream.flush()
+        elif int(fraction / LOG_STEP) > int(previous / LOG_STEP):
+            print(f"⏳ {name}: {fraction:.0%}", file=self.stream, flush=True)
+
+    def finish(self, name: str) -> None:
+        self.running.pop(name, None)
+        if self.live:
+            # Clear the status line before the caller reports the result
+            self.stream.write("\r\033[K")
+            self.stream.flush()
+
+
+@dataclass
+class RenderOrchestrator:
+    """Runs render jobs concurrently within a process count and memory budget."""
+
+    concurrency: int = 1
+    memory_budget_mb: float = float("inf")
+    retries: int = 0
+    board: ProgressBoard = field(default_factory=ProgressBoard)
+    # Passed to create_subprocess_exec
+    cwd: Optional[Path] = None
+    env: Optional[Dict[str, str]] = None
+
+    async def _run(
+        self,
+        job: RenderJob,
+        slots: asyncio.Semaphore,
+        gate: AsyncMemoryGate,
+        on_attempt: Callable[[RenderResult], None],
+    ) -> RenderResult:
+        async with slots, gate.reserve(job.memory_mb):
+            try:
+                for attempt in range(self.retries + 1):
+                    result = await run_job(job, self.board.update, cwd=self.cwd, env=self.env)
+                    result.attempts = attempt + 1
+                    self.board.finish(job.name)
+                    on_attempt(result)
+                    if result.ok:
+                        break
+            finally:
+                self.board.finish(job.name)
+        return result
+
+    async def run(
+        self,
+        jobs: Sequence[RenderJob],
+        on_attempt: Callable[[RenderResult], None] = lambda result: None,
+        on_done: Callable[[RenderResult], None] = lambda result: None,
+    ) -> Dict[str, RenderResult]:
+        """
+        Run ``jobs``, in the given order as slots free up; returns the last attempt of each.
+
+        ``on_attempt`` sees every attempt (to report failures and retries),
+        ``on_done`` each job's final result as soon as it is known.
+        Cancelling stops all running renders and re-raises.
+        """
+        slots = asyncio.Semaphore(max(1, self.concurrency))
+        gate = AsyncMemoryGate(self.memory_budget_mb)
+        tasks = {
+            asyncio.ensure_future(self._run(job, slots, gate, on_attempt)): job.name for job in jobs
+        }
+        results = {}
+        try:
+            for future in asyncio.as_completed(tasks):
+                result = await future
+                results[result.name] = result
+                on_done(result)
+        finally:
+            # Cancelled (Ctrl-C) or a callback failed: stop whatever still runs
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return results
@@ -0,0 +1,452 @@
+"""
+Render farm mode: a job queue shared by any number of render workers.
+
+``generate_previews.py --queue`` puts its render jobs (scene, render profile,
+parameters and a cache key) into a SQLite database instead of rendering them
+itself. Workers, on the same machine or on others that mount the same
+directory, claim jobs one at a time, render them with ``sections.py`` and
+publish the video to a content-addressed store under its cache key, where the
+build picks it up.
+
+A claim is a lease: the worker renews it while it renders, and a job whose
+lease ran out (its worker died or lost the share) goes back to the queue for
+the next worker. A worker that lost its lease stops rendering and discards
+its result, so each job is published by exactly one worker. A render that
+runs past its job's timeout (from the cost model when the build queued it,
+else the worker's ``--timeout``) is stopped and counts as a failed attempt,
+instead of being kept leased forever. Jobs that fail ``MAX_ATTEMPTS`` times
+are marked failed.
+
+The cache key covers the scene's section code keys, the profile, the
+parameters and the manim version, so a job whose video is already in the
+store completes without rendering. Parameters are passed to the render as
+environment variables and are part of its section keys. Each job renders in
+its own work directory, with its own section cache and partial movie files,
+so jobs for the same scene never share or prune each other's files.
+
+    python render_queue.py worker                 # render until stopped
+    python render_queue.py worker --until-empty   # exit once the queue is drained
+    python render_queue.py status
+
+SQLite relies on file locks: on network filesystems they must work (NFSv4 or
+SMB with locking enabled), and the machines' clocks should agree to well
+within a lease.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from scene_registry import PROJECT_ROOT, SceneEntry
+
+DEFAULT_QUEUE = PROJECT_ROOT / "media" / "render_queue.db"
+DEFAULT_STORE = PROJECT_ROOT / "media" / "store"
+# Seconds a claim is valid without renewal; renewed every third of it
+LEASE_SECONDS = 120.0
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 2.0
+# Seconds a render may take when its job does not say
+RENDER_TIMEOUT = 3600.0
+# Seconds SQLite waits for another process's write lock
+LOCK_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    scene TEXT NOT NULL,
+    profile TEXT,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    error TEXT,
+    timeout REAL
+)
+"""
+STATUSES = ("queued", "running", "done", "failed")
+
+
+class LeaseLost(RuntimeError):
+    """Another worker took over the job after this worker's lease expired."""
+
+
+@dataclass
+class Job:
+    """One render in the queue."""
+
+    id: int
+    key: str
+    scene: str
+    profile: Optional[str]
+    params: Dict[str, str] = field(default_factory=dict)
+    status: str = "queued"
+    attempts: int = 0
+    worker: Optional[str] = None
+    lease_expires: Optional[float] = None
+    error: Optional[str] = None
+    # Seconds one attempt may take; None for the worker's default
+    timeout: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(**{**dict(row), "params": json.loads(row["params"])})
+
+
+def render_key(entry: SceneEntry, profile: Optional[str] = None, params: Optional[Dict[str, str]] = None) -> str:
+    """Cache key of a render: changes whenever the video could."""
+    from importlib.metadata import PackageNotFoundError, version
+
+    from sections import section_sources
+
+    try:
+        manim = version("manim")
+    except PackageNotFoundError:
+        manim = None
+    parts = [entry.name, section_sources(entry), profile, params or {}, manim]
+    return hashlib.sha1(json.dumps(parts, sort_keys=True).encode()).hexdigest()
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class RenderQueue:
+    """Render jobs in a SQLite database that several processes share."""
+
+    def __init__(self, path: Path = DEFAULT_QUEUE, max_attempts: int = MAX_ATTEMPTS):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._transaction() as db:
+            db.execute(SCHEMA)
+            if "timeout" not in {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}:
+                # Queue created before jobs had timeouts
+                db.execute("ALTER TABLE jobs ADD COLUMN timeout REAL")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """A write transaction, taken before reading so claims cannot race."""
+        db = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        db.row_factory = sqlite3.Row
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+    def enqueue(
+        self, scene: str, profile: Optional[str], params: Dict[str, str], key: str, timeout: Optional[float] = None,
+    ) -> Job:
+        """
+        Add a render, or return the job already queued under ``key``.
+
+        A failed job is queued again with fresh attempts and ``timeout``.
+        """
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR IGNORE INTO jobs (key, scene, profile, params, timeout) VALUES (?, ?, ?, ?, ?)",
+                (key, scene, profile, json.dumps(params, sort_keys=True), timeout),
+            )
+            db.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, timeout = ? "
+                "WHERE key = ? AND status = 'failed'",
+                (timeout, key),
+            )
+            return Job.from_row(db.execute("SELECT * FROM jobs WHERE key = ?", (key,)).fetchone())
+
+    def retry(self, key: str) -> None:
+        """Queue a finished job again, e.g. when its video was removed from the store."""
+        with self._transaction() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, error = NULL "
+                "WHERE key = ? AND status IN ('done', 'failed')",
+                (key,),
+            )
+
+    def claim(self, worker: str, lease: float = LEASE_SECONDS) -> Optional[Job]:
+        """Lease the oldest queued job, or one whose lease expired; None if there is none."""
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT * FROM jobs WHERE status = 'queued' OR (status = 'running' AND lease_expires < ?) ORDER BY id",
+                (now,),
+            ).fetchall()
+            for row in rows:
+                if row["attempts"] >= self.max_attempts:
+                    # Its worker died holding the last attempt
+                    db.execute(
+                        "UPDATE jobs SET status = 'failed', worker = NULL, error = 'lease expired' WHERE id = ?",
+                        (row["id"],),
+                    )
+                    continue
+                db.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, lease_expires = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (worker, now + lease, row["id"]),
+                )
+                return Job.from_row(db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+        return None
+
+    def _update_owned(self, job: Job, worker: str, assignments: str, *values) -> bool:
+        with self._transaction() as db:
+            cursor = db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ? AND status = 'running'",
+                (*values, job.id, worker),
+            )
+            return cursor.rowcount == 1
+
+    def renew(self, job: Job, worker: str, lease: float = LEASE_SECONDS) -> bool:
+        """Extend ``worker``'s lease on ``job``; False if it no longer holds it."""
+        return self._update_owned(job, worker, "lease_expires = ?", time.time() + lease)
+
+    def complete(self, job: Job, worker: str) -> bool:
+        return self._update_owned(job, worker, "status = 'done', lease_expires = NULL, error = NULL")
+
+    def fail(self, job: Job, worker: str, error: str) -> bool:
+        """Give ``job`` back to the queue, or mark it failed after its last attempt."""
+        status = "failed" if job.attempts >= self.max_attempts else "queued"
+        return self._update_owned(
+            job, worker, "status = ?, worker = NULL, lease_expires = NULL, error = ?", status, error[-4000:],
+        )
+
+    def release(self, job: Job, worker: str) -> bool:
+        """Hand ``job`` back without counting the attempt, e.g. when the worker is stopped."""
+        return self._update_owned(
+            job, worker, "status = 'queued', worker = NULL, lease_expires = NULL, attempts = attempts - 1",
+        )
+
+    def jobs(self, keys: Optional[List[str]] = None) -> List[Job]:
+        with self._transaction() as db:
+            rows = db.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+        return [Job.from_row(row) for row in rows if keys is None or row["key"] in keys]
+
+    def counts(self) -> Dict[str, int]:
+        counts = dict.fromkeys(STATUSES, 0)
+        for job in self.jobs():
+            counts[job.status] += 1
+        return counts
+
+
+class VideoStore:
+    """Rendered videos addressed by their cache key."""
+
+    def __init__(self, root: Path = DEFAULT_STORE):
+        self.root = Path(root)
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.mp4"
+
+    def has(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def put(self, key: str, video: Path) -> Path:
+        """Copy ``video`` in atomically: readers see the whole file or none."""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.stem}.{worker_name().replace(':', '-')}.partial")
+        shutil.copyfile(video, temporary)
+        os.replace(temporary, path)
+        return path
+
+
+def render_with_sections(job: Job, output: Path, stop: threading.Event) -> None:
+    """
+    Render ``job`` with ``sections.py``; stops the render once ``stop`` is set.
+
+    The section cache and manim's partial movie files go next to ``output``,
+    in the job's own work directory.
+    """
+    env = {**os.environ, **job.params}
+    work = output.parent
+    command = [
+        sys.executable, str(PROJECT_ROOT / "sections.py"), job.scene, "--output", str(output),
+        "--cache", str(work / "sections"), "--video-dir", str(work / "videos"),
+    ]
+    command += [arg for name, value in sorted(job.params.items()) for arg in ("--param", f"{name}={value}")]
+    if job.profile:
+        command += ["--profile", job.profile]
+    with subprocess.Popen(
+        command, cwd=PROJECT_ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        start_new_session=True,
+    ) as process:
+        # Drain the output in the background so the render never blocks on a full pipe
+        log = []
+        reader = threading.Thread(target=lambda: log.extend(process.stdout), daemon=True)
+        reader.start()
+        try:
+            while process.poll() is None:
+                if stop.wait(1.0):
+                    raise LeaseLost(job.key)
+        except BaseException:
+            # Lease lost, timed out or the worker is stopped: the render must not outlive it
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+            raise
+        reader.join()
+    if process.returncode != 0:
+        raise RuntimeError("".join(log[-40:]) or f"sections.py exited with {process.returncode}")
+
+
+@contextmanager
+def holding_lease(
+    queue: RenderQueue, job: Job, worker: str, lease: float, deadline: Optional[float] = None,
+) -> Iterator[threading.Event]:
+    """
+    Renew the lease on ``job`` in the background; the event is set once it is
+    lost, or once ``time.monotonic()`` passes ``deadline`` (renewal stops then).
+    """
+    lost, stop = threading.Event(), threading.Event()
+
+    def renew():
+        while True:
+            interval = lease / 3 if deadline is None else min(lease / 3, deadline - time.monotonic())
+            if stop.wait(max(0.0, interval)):
+                return
+            if deadline is not None and time.monotonic() >= deadline:
+                lost.set()
+                return
+            if not queue.renew(job, worker, lease):
+                lost.set()
+                return
+
+    thread = threading.Thread(target=renew, daemon=True)
+    thread.start()
+    try:
+        yield lost
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _failed(queue: RenderQueue, job: Job, worker: str, error: str) -> bool:
+    queue.fail(job, worker, error)
+    print(f"❌ {worker}: {job.scene} failed (attempt {job.attempts}/{queue.max_attempts}): {error}")
+    return False
+
+
+def process_job(
+    queue: RenderQueue,
+    store: VideoStore,
+    job: Job,
+    worker: str,
+    render: Callable[[Job, Path, threading.Event], None] = render_with_sections,
+    lease: float = LEASE_SECONDS,
+    timeout: float = RENDER_TIMEOUT,
+) -> bool:
+    """
+    Render one claimed job into the store; True if this worker completed it.
+
+    ``render(job, output, stop)`` must stop soon after ``stop`` is set: the
+    lease was lost, or the render ran past the job's timeout (``timeout``
+    if the job has none).
+    """
+    if store.has(job.key):
+        return queue.complete(job, worker)
+    store.root.mkdir(parents=True, exist_ok=True)
+    timeout = job.timeout or timeout
+    deadline = time.monotonic() + timeout
+    with tempfile.TemporaryDirectory(prefix="render-", dir=store.root) as work:
+        output = Path(work) / f"{job.scene}.mp4"
+        try:
+            with holding_lease(queue, job, worker, lease, deadline) as stop:
+                render(job, output, stop)
+            if stop.is_set():
+                raise LeaseLost(job.key)
+        except LeaseLost:
+            if time.monotonic() < deadline:
+                print(f"⚠️  {worker}: lease on {job.scene} expired, another worker took it over")
+                return False
+            return _failed(queue, job, worker, f"render timed out after {timeout:g}s")
+        except KeyboardInterrupt:
+            queue.release(job, worker)
+            raise
+        except Exception as e:
+            return _failed(queue, job, worker, str(e))
+        # Only the lease holder publishes
+        if not queue.renew(job, worker, lease):
+            return False
+        store.put(job.key, output)
+    return queue.complete(job, worker)
+
+
+def work(
+    queue: RenderQueue,
+    store: VideoStore,
+    worker: Optional[str] = None,
+    render: Callable[[Job, Path, threading.Event], None] = render_with_sections,
+    lease: float = LEASE_SECONDS,
+    poll: float = POLL_SECONDS,
+    until_empty: bool = False,
+    timeout: float = RENDER_TIMEOUT,
+) -> int:
+    """Claim and render jobs; returns how many this worker completed."""
+    worker = worker or worker_name()
+    completed = 0
+    while True:
+        job = queue.claim(worker, lease)
+        if job is None:
+            counts = queue.counts()
+            if until_empty and not counts["queued"] and not counts["running"]:
+                return completed
+            time.sleep(poll)
+            continue
+        print(f"🎬 {worker}: {job.scene} ({job.key[:12]}, attempt {job.attempts})")
+        if process_job(queue, store, job, worker, render, lease, timeout):
+            completed += 1
+            print(f"✅ {worker}: {job.scene} published")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render workers for a shared render queue.")
+    parser.add_argument("command", choices=["worker", "status"])
+    parser.add_argument("--queue", type=Path, default=DEFAULT_QUEUE, help="Queue database")
+    parser.add_argument("--store", type=Path, default=DEFAULT_STORE, help="Content-addressed video store")
+    parser.add_argument("--lease", type=float, default=LEASE_SECONDS, help="Seconds a claim lasts without renewal")
+    parser.add_argument(
+        "--timeout", type=float, default=RENDER_TIMEOUT,
+        help="Seconds a render may take if its job has no timeout of its own",
+    )
+    parser.add_argument("--until-empty", action="store_true", help="Exit once no job is queued or running")
+    args = parser.parse_args()
+
+    queue = RenderQueue(args.queue)
+    if args.command == "status":
+        for job in queue.jobs():
+            error = (job.error or "").strip().splitlines()
+            detail = job.worker if job.status == "running" else error[-1] if error else ""
+            print(f"{job.status:8s} {job.scene:32s} {job.profile or '-':8s} {job.key[:12]}  {detail}")
+        print(", ".join(f"{count} {status}" for status, count in queue.counts().items()))
+        return
+    try:
+        completed = work(
+            queue, VideoStore(args.store), lease=args.lease, until_empty=args.until_empty, timeout=args.timeout,
+        )
+    except KeyboardInterrupt:
+        # The job in progress was handed back to the queue
+        sys.exit(130)
+    print(f"🏁 {completed} jobs rendered")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Registry of the project's scenes, discovered without importing manim.
+
+Importing a scene module runs ``from manim import *``, which takes seconds.
+The registry instead parses the top-level modules with ``ast`` and records
+every class deriving from a ``...Scene`` base, together with the literal
+``metadata`` dict declared on the class (title, description, complexity,
+icon). Scenes with metadata are the ones published on the website.
+
+Listing and filtering is then a matter of milliseconds; ``SceneEntry.load``
+imports the module (and manim) only when the class is actually needed.
+
+    python scene_registry.py               # published scenes
+    python scene_registry.py --all --3d    # every ThreeDScene
+"""
+
+import argparse
+import ast
+import importlib
+import sys
+import warnings
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROJECT_ROOT = Path(__file__).parent
+# Class attribute holding a scene's website metadata
+METADATA_ATTRIBUTE = "metadata"
+
+
+@dataclass(frozen=True)
+class SceneEntry:
+    """One scene class found in the source tree."""
+
+    name: str
+    path: Path
+    lineno: int
+    bases: Tuple[str, ...]
+    metadata: Dict[str, object] = field(default_factory=dict, compare=False, hash=False)
+    docstring: str = field(default="", compare=False)
+
+    @property
+    def module(self) -> str:
+        return self.path.stem
+
+    @property
+    def is_3d(self) -> bool:
+        return "ThreeDScene" in self.bases
+
+    @property
+    def published(self) -> bool:
+        return bool(self.metadata)
+
+    def class_def(self) -> ast.ClassDef:
+        """The class's syntax tree."""
+        return next(
+            node for node in _parse(self.path).body
+            if isinstance(node, ast.ClassDef) and node.name == self.name
+        )
+
+    def load(self):
+        """Import the scene's module and return the scene class."""
+        if str(self.path.parent) not in sys.path:
+            sys.path.insert(0, str(self.path.parent))
+        return getattr(importlib.import_module(self.module), self.name)
+
+
+def _parse(path: Path) -> ast.Module:
+    with warnings.catch_warnings():
+        # Scene sources hold LaTeX in non-raw strings ("g \in SO(3)")
+        warnings.simplefilter("ignore", (DeprecationWarning, SyntaxWarning))
+        return ast.parse(path.read_text(), filename=str(path))
+
+
+def _base_name(node: ast.expr) -> str:
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return node.id if isinstance(node, ast.Name) else ""
+
+
+def _class_metadata(node: ast.ClassDef) -> Dict[str, object]:
+    for statement in node.body:
+        if (
+            isinstance(statement, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == METADATA_ATTRIBUTE for t in statement.targets)
+        ):
+            try:
+                return dict(ast.literal_eval(statement.value))
+            except (ValueError, TypeError):
+                raise ValueError(f"{node.name}.{METADATA_ATTRIBUTE} must be a literal dict") from None
+    return {}
+
+
+@lru_cache(maxsize=None)
+def _scenes_in(path: Path, mtime_ns: int) -> Tuple[SceneEntry, ...]:
+    entries = []
+    for node in _parse(path).body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        bases = tuple(_base_name(base) for base in node.bases)
+        if not any(base.endswith("Scene") for base in bases):
+            continue
+        entries.append(SceneEntry(
+            node.name, path, node.lineno, bases,
+            _class_metadata(node), ast.get_docstring(node) or "",
+        ))
+    return tuple(entries)
+
+
+def scenes_in(path: Path) -> List[SceneEntry]:
+    """Scene classes defined at the top level of ``path``, in source order."""
+    path = Path(path).resolve()
+    return list(_scenes_in(path, path.stat().st_mtime_ns))
+
+
+def discover_scenes(paths: Optional[Iterable[Path]] = None, root: Path = PROJECT_ROOT) -> List[SceneEntry]:
+    """Every scene in ``paths`` (default: the top-level modules of ``root``)."""
+    paths = sorted(Path(root).glob("*.py")) if paths is None else paths
+    return [entry for path in paths for entry in scenes_in(path)]
+
+
+def scene_modules(root: Path = PROJECT_ROOT) -> List[Path]:
+    """Top-level modules that define a manim scene."""
+    return sorted({entry.path for entry in discover_scenes(root=root)})
+
+
+def filter_scenes(
+    entries: Iterable[SceneEntry],
+    names: Optional[Iterable[str]] = None,
+    published: Optional[bool] = None,
+    three_d: Optional[bool] = None,
+    complexity: Optional[str] = None,
+) -> List[SceneEntry]:
+    """Entries matching every given criterion (``None`` means any)."""
+    names = set(names) if names else None
+    return [
+        entry for entry in entries
+        if (names is None or entry.name in names)
+        and (published is None or entry.published == published)
+        and (three_d is None or entry.is_3d == three_d)
+        and (complexity is None or entry.metadata.get("complexity") == complexity)
+    ]
+
+
+def find_scene(name: str, root: Path = PROJECT_ROOT) -> SceneEntry:
+    """The entry for scene class ``name``; ``KeyError`` if there is none."""
+    for entry in discover_scenes(root=root):
+        if entry.name == name:
+            return entry
+    raise KeyError(f"No scene named {name!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the project's scenes without importing manim.")
+    parser.add_argument("names", nargs="*", help="Only these scene classes")
+    parser.add_argument("--all", action="store_true", help="Include scenes not published on the website")
+    parser.add_argument("--3d", dest="three_d", action="store_true", default=None, help="Only ThreeDScenes")
+    parser.add_argument("--complexity", help="Only scenes of this complexity")
+    args = parser.parse_args()
+
+    entries = filter_scenes(
+        discover_scenes(), args.names, None if args.all else True, args.three_d, args.complexity,
+    )
+    for entry in entries:
+        title = entry.metadata.get("title", "")
+        print(f"{entry.path.name + ':' + str(entry.lineno):45s} {entry.name:32s} {title}")
+
+
+if __name__ == "__main__":
+    main()
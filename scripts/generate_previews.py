@@ -6,143 +6,381 @@ This script renders low-quality preview videos of all animations and
 creates a gallery page with embedded videos.
 """
 
+import argparse
+import asyncio
+import importlib.metadata
 import os
 import sys
 import subprocess
 import json
+import re
+import shutil
+import time
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from build_graph import BuildGraph  # noqa: E402
+from encoding_ladder import build_ladder, load_ladder, source_tags  # noqa: E402
+from encoding_ladder import settings_key as ladder_settings_key  # noqa: E402
+from memory_profile import memory_budget_mb, render_memory_mb, stored_memory  # noqa: E402
+from render_cost import (  # noqa: E402
+    DEFAULT_COST_FILE, CostModel, estimate, load_costs, record_timing, render_history, save_costs,
+)
+from render_orchestrator import RenderJob, RenderOrchestrator, RenderResult  # noqa: E402
+from render_queue import DEFAULT_QUEUE, POLL_SECONDS, RenderQueue, VideoStore, render_key  # noqa: E402
+from scene_registry import discover_scenes  # noqa: E402
+from sections import section_sources  # noqa: E402
+from site_assets import asset_sources, build_site, load_manifest, precompress  # noqa: E402
+from thumbnails import build_thumbnails, load_thumbnails  # noqa: E402
+from thumbnails import settings_key as thumbnail_settings_key  # noqa: E402
+
+
+def manim_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("manim")
+    except importlib.metadata.PackageNotFoundError:
+        return None
 
 
 class AnimationPreviewGenerator:
     """Generates preview videos and gallery for the website."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        jobs: int = 1,
+        measure: bool = False,
+        memory_budget: Optional[float] = None,
+        section_jobs: int = 1,
+        retries: int = 1,
+        params: Optional[Dict[str, str]] = None,
+        queue: Optional[Path] = None,
+        local_workers: int = 0,
+    ):
         self.project_root = Path(__file__).parent.parent
+        # Render profile from config.py (draft/preview/final), forwarded to each scene
+        self.profile = profile
+        # Parallel manim processes, and whether to refresh costs with a dry run first
+        self.jobs = max(1, jobs)
+        # Processes rendering the sections of one scene (sections.py -j)
+        self.section_jobs = max(1, section_jobs)
+        # Attempts after a timeout or crash, each resuming from checkpoints
+        self.retries = max(0, retries)
+        # Extra environment for every render, e.g. one point of a parameter sweep
+        self.params = params or {}
+        # Render farm mode: renders go to this queue for render_queue.py workers
+        self.queue = RenderQueue(queue) if queue else None
+        self.store = VideoStore()
+        self.local_workers = local_workers
+        self.measure = measure
+        self.cost_file = DEFAULT_COST_FILE
+        # Renders only start while their expected memory fits in the budget
+        self.memory_budget = memory_budget or memory_budget_mb()
         self.media_dir = self.project_root / "media"
         self.docs_dir = self.project_root / "docs"
         self.preview_dir = self.docs_dir / "previews"
+        # Encoded variants, posters and loops per scene class (see encode_previews)
+        self.ladder = {}
+        self.thumbnails = {}
+        # Fingerprinted site assets by logical path (see publish_assets)
+        self.assets = {}
+        # Incremental build state, see build_graph
+        self.graph = None
         
-        # Animation metadata
+        # Published scenes and their metadata, parsed from the scene sources
         self.animations = {
-            "so3_visualization.py": {
-                "class": "SO3RotationVisualization",
-                "title": "SO(3) Rotation Visualization",
-                "description": "Basic 3D rotation demonstrating elements of the Special Orthogonal group.",
-                "duration": "10s",
-                "complexity": "Beginner",
-                "icon": "fas fa-cube"
-            },
-            "so3_manifold_visualization.py": {
-                "class": "SO3ManifoldAndLieAlgebra",
-                "title": "SO(3) Manifold & Lie Algebra",
-                "description": "Visualization of the relationship between SO(3) manifold and its Lie algebra so(3).",
-                "duration": "15s",
-                "complexity": "Intermediate",
-                "icon": "fas fa-globe"
-            },
-            "so3_composition_vs_addition.py": {
-                "class": "SO3CompositionVsAddition",
-                "title": "Group Composition vs Algebra Addition",
-                "description": "Comparison of group composition in SO(3) with vector addition in so(3).",
-                "duration": "20s",
-                "complexity": "Advanced",
-                "icon": "fas fa-plus"
-            },
-            "se3_visualization.py": {
-                "class": "SE3Visualization",
-                "title": "SE(3) Rigid Body Motion",
-                "description": "Demonstration of rigid body motion combining rotation and translation.",
-                "duration": "12s",
-                "complexity": "Intermediate",
-                "icon": "fas fa-camera"
-            },
-            "se3_exponential_map.py": {
-                "class": "SE3ExponentialMap",
-                "title": "SE(3) Exponential Map",
-                "description": "Conversion from twist vectors to transformation matrices via exponential mapping.",
-                "duration": "18s",
-                "complexity": "Advanced",
-                "icon": "fas fa-expand-arrows-alt"
-            },
-            "se3_relative_pose.py": {
-                "class": "SE3RelativePose",
-                "title": "SE(3) Relative Pose",
-                "description": "Relative pose transformations between camera positions.",
-                "duration": "15s",
-                "complexity": "Intermediate",
-                "icon": "fas fa-exchange-alt"
-            },
-            "bch_commutator_visualization.py": {
-                "class": "BCHCommutatorVisualization",
-                "title": "BCH Formula Commutator",
-                "description": "Visualization of the Baker-Campbell-Hausdorff formula commutator terms.",
-                "duration": "12s",
-                "complexity": "Advanced",
-                "icon": "fas fa-brackets-curly"
-            },
-            "pose_graph_optimization_visualization.py": {
-                "class": "PoseGraphOptimization",
-                "title": "Pose Graph Optimization",
-                "description": "Visualization of drift accumulation and correction through loop closures.",
-                "duration": "25s",
-                "complexity": "Advanced",
-                "icon": "fas fa-sitemap"
-            },
-            "slam_keyframes_visualization.py": {
-                "class": "SLAMKeyframesVisualization",
-                "title": "SLAM Keyframes Management",
-                "description": "Managing computational complexity with keyframe-based SLAM.",
-                "duration": "20s",
-                "complexity": "Intermediate",
-                "icon": "fas fa-key"
-            }
+            entry.path.name: {"class": entry.name, **entry.metadata}
+            for entry in sorted(
+                (e for e in discover_scenes(root=self.project_root) if e.published),
+                key=lambda e: e.metadata.get("order", float("inf")),
+            )
         }
     
-    def generate_previews(self) -> bool:
-        """Generate preview videos for all animations."""
+    def generate_previews(self, filenames: Optional[List[str]] = None) -> bool:
+        """Generate preview videos for ``filenames`` (default: all animations), longest render first."""
         print("🎬 Generating preview videos...")
         
         # Create preview directory
         self.preview_dir.mkdir(exist_ok=True)
         
-        success_count = 0
-        total_count = len(self.animations)
+        env = {**os.environ, **self.params}
+        if self.profile:
+            env["SLAM_RENDER_PROFILE"] = self.profile
+            print(f"Using render profile: {self.profile}")
         
-        for filename, metadata in self.animations.items():
-            print(f"Rendering {filename}...")
-            
-            try:
-                # Render low-quality preview
-                result = subprocess.run([
-                    "uv", "run", "manim", 
-                    "-pql",  # Preview quality, low
-                    "--format", "mp4",
-                    "--output_file", metadata["class"],
-                    filename,
-                    metadata["class"]
-                ], cwd=self.project_root, capture_output=True, text=True, timeout=300)
-                
-                if result.returncode == 0:
-                    # Move video to previews directory
-                    source_video = self.media_dir / "videos" / f"{metadata['class']}.mp4"
-                    if source_video.exists():
-                        target_video = self.preview_dir / f"{metadata['class']}.mp4"
-                        source_video.rename(target_video)
-                        success_count += 1
-                        print(f"✅ {filename} rendered successfully")
+        # Before any render starts, farmed out or not: renders don't take the LaTeX lock
+        self.precompile_text(env)
+        if self.queue is not None:
+            self.estimate_costs()
+            return self.render_with_queue(filenames or list(self.animations))
+        
+        if self.measure:
+            self.measure_costs(env)
+        self.estimate_costs()
+        
+        # Longest job first keeps the slots busy until the end
+        queue = sorted(filenames or self.animations, key=lambda f: self.model.predict(self.costs[f]), reverse=True)
+        print(f"Rendering {len(queue)} scenes with {self.jobs} worker(s) within {self.memory_budget:.0f} MB")
+        
+        orchestrator = RenderOrchestrator(
+            concurrency=self.jobs, memory_budget_mb=self.memory_budget, retries=self.retries,
+            cwd=self.project_root, env=env,
+        )
+        rendered = []
+        
+        def finish(result: RenderResult) -> None:
+            if self.finish_preview(result):
+                rendered.append(result.name)
+        
+        try:
+            asyncio.run(orchestrator.run([self.render_job(f) for f in queue], self.report_attempt, finish))
+        except KeyboardInterrupt:
+            print(f"\n🛑 Cancelled; running renders were stopped, {len(rendered)} finished previews kept")
+            raise
+        finally:
+            save_costs(self.cost_data, self.cost_file)
+        
+        print(f"\n🎉 Generated {len(rendered)}/{len(queue)} preview videos")
+        return len(rendered) > 0
+    
+    def render_job(self, filename: str) -> RenderJob:
+        """
+        The render of one scene, reusing unchanged sections.
+
+        Its timeout comes from the scene's recent render times, or the cost
+        model for a scene without any. A retry resumes from the plays the
+        previous attempt finished (see checkpoints.py).
+        """
+        metadata = self.animations[filename]
+        cost = self.costs[filename]
+        timeout = self.model.timeout(cost, render_history(self.cost_data, cost))
+        print(f"Queued {metadata['class']} (expected {self.model.predict(cost):.0f}s, timeout {timeout:.0f}s)")
+        return RenderJob(
+            metadata["class"],
+            # Render low-quality preview (or the profile's quality), only the changed sections
+            [
+                "uv", "run", "python", "sections.py",
+                metadata["class"],
+                "--output", str(self.media_dir / "videos" / f"{metadata['class']}.mp4"),
+                "--jobs", str(self.section_jobs),
+                # Part of the section keys, so another sweep point does not reuse these sections
+                *(arg for name, value in sorted(self.params.items()) for arg in ("--param", f"{name}={value}")),
+            ],
+            timeout,
+            plays=round(cost.plays + cost.waits),
+            memory_mb=self.memory[filename] * self.section_jobs,
+        )
+    
+    def report_attempt(self, result: RenderResult) -> None:
+        if result.timed_out:
+            print(f"⏰ Timeout rendering {result.name} after {result.seconds:.0f}s")
+        elif not result.ok:
+            print(f"❌ Failed to render {result.name}: {result.stdout}{result.stderr}")
+        if not result.ok and result.attempts <= self.retries:
+            print(f"🔁 Retrying {result.name} from its checkpoints ({result.attempts}/{self.retries})")
+    
+    def finish_preview(self, result: RenderResult) -> bool:
+        """Move a finished render into the previews directory and record it."""
+        if not result.ok:
+            return False
+        filename = next(f for f, metadata in self.animations.items() if metadata["class"] == result.name)
+        # Move video to previews directory
+        source_video = self.media_dir / "videos" / f"{result.name}.mp4"
+        if not source_video.exists():
+            print(f"⚠️  Video file not found for {filename}")
+            return False
+        source_video.rename(self.preview_dir / f"{result.name}.mp4")
+        if self.graph is not None:
+            self.graph.record(f"render:{result.name}")
+        # Renders that reused cached sections or checkpoints would skew the cost model
+        rendered = re.search(r"rendered (\d+)/(\d+) sections", result.stdout)
+        if result.attempts == 1 and rendered is not None and rendered.group(1) == rendered.group(2):
+            record_timing(self.cost_data, self.costs[filename], result.seconds)
+        print(f"✅ {filename} rendered successfully in {result.seconds:.0f}s")
+        return True
+    
+    def render_with_queue(self, filenames: List[str]) -> bool:
+        """
+        Enqueue the renders for the render farm and wait for their videos.
+
+        Any ``render_queue.py worker`` sharing the queue and store renders
+        them (``self.local_workers`` are started here), each render within the
+        same timeout as a local one. Videos already in the store under the same
+        cache key are not rendered again.
+        """
+        entries = {entry.name: entry for entry in discover_scenes(root=self.project_root)}
+        pending = {}
+        for filename in filenames:
+            scene = self.animations[filename]["class"]
+            key = render_key(entries[scene], self.profile, self.params)
+            cost = self.costs[filename]
+            timeout = self.model.timeout(cost, render_history(self.cost_data, cost))
+            job = self.queue.enqueue(scene, self.profile, self.params, key, timeout)
+            if job.status == "done" and not self.store.has(key):
+                self.queue.retry(key)
+            pending[key] = filename
+        print(f"📮 Queued {len(pending)} renders in {self.queue.path}")
+        
+        workers = [
+            subprocess.Popen(
+                [sys.executable, "render_queue.py", "worker", "--until-empty", "--queue", str(self.queue.path)],
+                cwd=self.project_root, env={**os.environ, **self.params},
+            )
+            for _ in range(self.local_workers)
+        ]
+        if not workers:
+            print("Waiting for workers (python render_queue.py worker)...")
+        
+        rendered = []
+        try:
+            while pending:
+                for job in self.queue.jobs(list(pending)):
+                    filename = pending[job.key]
+                    if job.status == "done" and self.store.has(job.key):
+                        shutil.copyfile(self.store.path(job.key), self.preview_dir / f"{job.scene}.mp4")
+                        if self.graph is not None:
+                            self.graph.record(f"render:{job.scene}")
+                        rendered.append(filename)
+                        print(f"✅ {filename} rendered by the farm")
+                    elif job.status == "failed":
+                        print(f"❌ Failed to render {filename} after {job.attempts} attempts: {job.error}")
                     else:
-                        print(f"⚠️  Video file not found for {filename}")
-                else:
-                    print(f"❌ Failed to render {filename}: {result.stderr}")
-                    
-            except subprocess.TimeoutExpired:
-                print(f"⏰ Timeout rendering {filename}")
-            except Exception as e:
-                print(f"❌ Error rendering {filename}: {e}")
+                        continue
+                    del pending[job.key]
+                if pending:
+                    time.sleep(POLL_SECONDS)
+        except KeyboardInterrupt:
+            print(f"\n🛑 Stopped waiting; {len(pending)} renders stay queued for the workers")
+            raise
+        finally:
+            for worker in workers:
+                worker.terminate()
+                worker.wait()
         
-        print(f"\n🎉 Generated {success_count}/{total_count} preview videos")
-        return success_count > 0
+        print(f"\n🎉 Generated {len(rendered)}/{len(filenames)} preview videos")
+        return len(rendered) > 0
+    
+    def measure_costs(self, env: Dict[str, str]) -> None:
+        """Refresh the dry-run cost and memory measurements."""
+        print("📏 Measuring scene costs and memory with a dry run...")
+        scenes = [metadata["class"] for metadata in self.animations.values()]
+        for script in ("render_cost.py", "memory_profile.py"):
+            try:
+                result = subprocess.run(
+                    ["uv", "run", "python", script, "--measure", "--costs", str(self.cost_file)] + scenes,
+                    cwd=self.project_root, env=env, capture_output=True, text=True, timeout=1200
+                )
+                if script == "memory_profile.py":
+                    print(result.stdout.strip())
+                if result.returncode != 0:
+                    print(f"⚠️  {script} reported problems; missing measurements fall back to defaults\n{result.stderr}")
+            except (subprocess.TimeoutExpired, OSError) as e:
+                print(f"⚠️  Skipping {script}: {e}")
+    
+    def estimate_costs(self) -> None:
+        """Load measurements and past timings, and fill in each scene's real duration."""
+        self.cost_data = load_costs(self.cost_file)
+        self.model = CostModel.fit(self.cost_data["timings"])
+        entries = {entry.name: entry for entry in discover_scenes(root=self.project_root)}
+        self.costs = {
+            filename: estimate(entries[metadata["class"]], self.profile, self.cost_data)
+            for filename, metadata in self.animations.items()
+        }
+        self.memory = {
+            filename: render_memory_mb(stored_memory(entries[metadata["class"]], self.profile, self.cost_data), self.profile)
+            for filename, metadata in self.animations.items()
+        }
+        for filename, metadata in self.animations.items():
+            metadata["duration"] = self.costs[filename].duration_label
+    
+    def precompile_text(self, env: Dict[str, str]) -> None:
+        """Fill manim's LaTeX/Text caches in parallel before the serial renders."""
+        print("🔤 Pre-compiling LaTeX and text...")
+        try:
+            result = subprocess.run(
+                ["uv", "run", "python", "tex_precompile.py"],
+                cwd=self.project_root, env=env, capture_output=True, text=True, timeout=600
+            )
+            print(result.stdout.strip())
+            if result.returncode != 0:
+                print(f"⚠️  Some text will be compiled during rendering instead:\n{result.stderr}")
+        except (subprocess.TimeoutExpired, OSError) as e:
+            print(f"⚠️  Skipping text pre-compilation: {e}")
+    
+    def build_graph(self, ladder: bool = True) -> BuildGraph:
+        """
+        The site build as a dependency graph with the state of the last build.
+
+        Each scene's preview depends on its section code keys and the render
+        profile; the ladder and thumbnails on the previews; the gallery on
+        their manifests and the scene metadata; the published assets on the
+        pages and media; the metadata file on all manifests. Renders have no
+        action here, ``generate_previews`` records them.
+        """
+        graph = self.graph = BuildGraph()
+        entries = {entry.name: entry for entry in discover_scenes(root=self.project_root)}
+        previews = [self.preview_dir / f"{metadata['class']}.mp4" for metadata in self.animations.values()]
+        for metadata, preview in zip(self.animations.values(), previews):
+            graph.add(f"render:{metadata['class']}", outputs=[preview], values={
+                "profile": self.profile,
+                "params": self.params,
+                "manim": manim_version(),
+                # Comments, docstrings and metadata do not change these (see sections.py)
+                "sections": section_sources(entries[metadata["class"]], self.project_root),
+            })
+        
+        # Manifests of the steps that did not run stand in for their results
+        manifests = [self.preview_dir / "thumbnails.json"]
+        self.thumbnails = load_thumbnails(self.preview_dir)
+        if ladder:
+            manifests.append(self.preview_dir / "ladder.json")
+            self.ladder = load_ladder(self.preview_dir)
+            graph.add("ladder", self.encode_previews, inputs=previews, outputs=manifests[1:],
+                      values=ladder_settings_key())
+        self.assets = load_manifest(self.docs_dir)
+        graph.add("thumbnails", self.create_thumbnails, inputs=previews, outputs=manifests[:1],
+                  values=thumbnail_settings_key())
+        graph.add("gallery", self.create_gallery_page, inputs=[*manifests, Path(__file__)],
+                  outputs=[self.docs_dir / "gallery.html"], values={"animations": self.animations, "ladder": ladder})
+        graph.add("publish", self.publish_site, inputs=lambda: [
+            self.docs_dir / "index.html", self.docs_dir / "gallery.html", self.project_root / "site_assets.py",
+            *(self.docs_dir / name for name in asset_sources(self.docs_dir)),
+        ], outputs=[self.docs_dir / "assets.json"], after=["ladder", "thumbnails"] if ladder else ["thumbnails"])
+        graph.add("metadata", self.create_metadata_file, inputs=[*manifests, self.docs_dir / "assets.json"],
+                  outputs=[self.docs_dir / "animations.json"], values=self.animations)
+        return graph
+    
+    def _rendered_previews(self) -> Dict[str, Path]:
+        return {
+            metadata["class"]: self.preview_dir / f"{metadata['class']}.mp4"
+            for metadata in self.animations.values()
+            if (self.preview_dir / f"{metadata['class']}.mp4").exists()
+        }
+    
+    def create_thumbnails(self) -> bool:
+        """Extract a poster frame and a short loop from each rendered preview."""
+        print("🖼️  Creating posters and animated thumbnails...")
+        try:
+            self.thumbnails = build_thumbnails(self._rendered_previews(), self.preview_dir, jobs=self.jobs)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"⚠️  Skipping thumbnails, the gallery shows videos without posters: {e}")
+            return False
+        print(f"✅ Thumbnails for {len(self.thumbnails)} scenes")
+        return True
+    
+    def encode_previews(self) -> bool:
+        """Encode the rendered previews into the resolution/codec ladder."""
+        print("🎞️  Encoding preview ladder...")
+        sources = self._rendered_previews()
+        try:
+            self.ladder = build_ladder(sources, self.preview_dir, jobs=self.jobs)
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"⚠️  Skipping the encoding ladder, the gallery uses the rendered MP4s: {e}")
+            return False
+        variants = sum(len(v) for v in self.ladder.values())
+        print(f"✅ {variants} variants for {len(self.ladder)} scenes")
+        return True
     
     def create_gallery_page(self) -> None:
         """Create a gallery page with embedded videos."""
@@ -194,6 +432,10 @@ class AnimationPreviewGenerator:
             height: 100%;
             border-radius: 8px;
         }}
+        .video-container .loop-preview {{
+            cursor: pointer;
+            object-fit: cover;
+        }}
         .video-info {{
             padding: 1.5rem;
         }}
@@ -260,11 +502,28 @@ class AnimationPreviewGenerator:
             video_exists = (self.preview_dir / f"{metadata['class']}.mp4").exists()
             
             if video_exists:
+                # Smallest playable variant first; the rendered MP4 when there is no ladder
+                sources = self.ladder.get(metadata["class"])
+                source_html = (
+                    source_tags(sources, indent=" " * 16) if sources
+                    else f'                <source src="{video_path}" type="video/mp4">'
+                )
+                # Nothing is fetched before play but the poster; the loop loads when on screen
+                thumbnails = self.thumbnails.get(metadata["class"])
+                poster_html = loop_html = ""
+                if thumbnails:
+                    poster_html = (
+                        f' poster="previews/{thumbnails.poster}"'
+                        f' data-poster-fallback="previews/{thumbnails.poster_jpeg}"'
+                    )
+                    if thumbnails.loop:
+                        loop_html = f"""
+            <video class="loop-preview" muted loop playsinline preload="none" aria-hidden="true" data-src="previews/{thumbnails.loop}"></video>"""
                 video_html = f"""
-            <video controls>
-                <source src="{video_path}" type="video/mp4">
+            <video class="gallery-video" controls preload="none"{poster_html}>
+{source_html}
                 Your browser does not support the video tag.
-            </video>"""
+            </video>{loop_html}"""
             else:
                 video_html = f"""
             <div style="display: flex; align-items: center; justify-content: center; height: 100%; background: linear-gradient(135deg, #1a1a2e, #16213e); color: #00d4ff;">
@@ -299,68 +558,162 @@ class AnimationPreviewGenerator:
         main_page = self.docs_dir / "index.html"
         if main_page.exists():
             with open(main_page, 'r') as f:
-                content = f.read()
-            
-            # Add gallery link to navigation
-            content = content.replace(
-                '<li><a href="#getting-started">Get Started</a></li>',
-                '<li><a href="#getting-started">Get Started</a></li>\n                <li><a href="gallery.html">Gallery</a></li>'
-            )
+                original = f.read()
             
-            # Add gallery button to hero section
-            content = content.replace(
-                '<a href="#animations" class="btn btn-secondary">\n                        <i class="fas fa-eye"></i> View Animations\n                    </a>',
-                '<a href="#animations" class="btn btn-secondary">\n                        <i class="fas fa-eye"></i> View Animations\n                    </a>\n                    <a href="gallery.html" class="btn btn-secondary">\n                        <i class="fas fa-play-circle"></i> Watch Videos\n                    </a>'
-            )
+            replacements = [
+                # Add gallery link to navigation
+                (
+                    '<li><a href="#getting-started">Get Started</a></li>',
+                    '<li><a href="#getting-started">Get Started</a></li>\n                <li><a href="gallery.html">Gallery</a></li>'
+                ),
+                # Add gallery button to hero section
+                (
+                    '<a href="#animations" class="btn btn-secondary">\n                        <i class="fas fa-eye"></i> View Animations\n                    </a>',
+                    '<a href="#animations" class="btn btn-secondary">\n                        <i class="fas fa-eye"></i> View Animations\n                    </a>\n                    <a href="gallery.html" class="btn btn-secondary">\n                        <i class="fas fa-play-circle"></i> Watch Videos\n                    </a>'
+                ),
+            ]
+            content = original
+            for old, new in replacements:
+                # Already applied by an earlier build; replacing again would duplicate the link
+                if new not in content:
+                    content = content.replace(old, new)
             
-            with open(main_page, 'w') as f:
-                f.write(content)
+            if content != original:
+                with open(main_page, 'w') as f:
+                    f.write(content)
             
             print("✅ Main page updated")
     
+    def publish_assets(self) -> None:
+        """Fingerprint and precompress the site's assets and point the pages at them."""
+        print("🔖 Fingerprinting site assets...")
+        self.assets = build_site(self.docs_dir)
+        print(f"✅ {len(self.assets)} assets fingerprinted (docs/assets.json)")
+    
+    def publish_site(self) -> None:
+        """Link the gallery from the main page, then fingerprint the assets both pages use."""
+        self.update_main_page()
+        self.publish_assets()
+    
+    def _published(self, name: Optional[str]) -> Optional[str]:
+        """Fingerprinted path of ``previews/<name>`` (the plain path before publish_assets)."""
+        if name is None:
+            return None
+        asset = self.assets.get(f"previews/{name}")
+        return asset.file if asset else f"previews/{name}"
+    
     def create_metadata_file(self) -> None:
         """Create a JSON metadata file for the animations."""
         metadata_file = self.docs_dir / "animations.json"
+        # A copy: the scene metadata itself is an input of the build graph
+        animations = {filename: dict(metadata) for filename, metadata in self.animations.items()}
         
         # Add file existence status
-        for filename, metadata in self.animations.items():
+        for filename, metadata in animations.items():
             video_path = self.preview_dir / f"{metadata['class']}.mp4"
             metadata['has_preview'] = video_path.exists()
             metadata['filename'] = filename
+            # Fingerprinted names, with the hash and size to cache and verify them by
+            preview = self.assets.get(f"previews/{metadata['class']}.mp4")
+            metadata['preview'] = (
+                {"file": preview.file, "sha256": preview.sha256, "bytes": preview.bytes} if preview else None
+            )
+            metadata['variants'] = [self._published(v.file) for v in self.ladder.get(metadata['class'], [])]
+            thumbnails = self.thumbnails.get(metadata['class'])
+            metadata['poster'] = self._published(thumbnails.poster) if thumbnails else None
         
         with open(metadata_file, 'w') as f:
-            json.dump(self.animations, f, indent=2)
+            json.dump(animations, f, indent=2)
+        precompress(metadata_file)
         
         print(f"✅ Metadata file created: {metadata_file}")
 
 
 def main():
     """Main function to generate all previews and update the website."""
-    generator = AnimationPreviewGenerator()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--profile", choices=["draft", "preview", "final"],
+        default=os.environ.get("SLAM_RENDER_PROFILE"),
+        help="Render quality profile (default: $SLAM_RENDER_PROFILE, else manim's -ql settings)"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+        help="Scenes rendered in parallel (default: half the CPUs)"
+    )
+    parser.add_argument(
+        "--measure", action="store_true",
+        help="Measure scene costs with a dry run before scheduling (default: static estimates)"
+    )
+    parser.add_argument(
+        "--memory-budget", type=float, default=None, metavar="MB",
+        help="Memory all parallel renders may use together (default: $SLAM_MEMORY_BUDGET_MB, else 75%% of RAM)"
+    )
+    parser.add_argument(
+        "--section-jobs", type=int, default=1,
+        help="Processes rendering the sections of each scene, for long multi-act scenes (default: 1)"
+    )
+    parser.add_argument(
+        "--no-ladder", action="store_true",
+        help="Skip encoding the multi-resolution H.264/VP9/AV1 variants of each preview"
+    )
+    parser.add_argument(
+        "--retries", type=int, default=1,
+        help="Retries of a timed-out or failed render, resuming where it stopped (default: 1)"
+    )
+    parser.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Environment variable for every render, part of the render cache key (repeatable)"
+    )
+    parser.add_argument(
+        "--queue", type=Path, nargs="?", const=DEFAULT_QUEUE, default=None, metavar="DB",
+        help=f"Render farm mode: queue the renders for render_queue.py workers (default DB: {DEFAULT_QUEUE})"
+    )
+    parser.add_argument(
+        "--local-workers", type=int, default=0,
+        help="With --queue, also start this many workers on this machine"
+    )
+    args = parser.parse_args()
+    if any("=" not in param for param in args.param):
+        parser.error("--param expects NAME=VALUE")
+    
+    generator = AnimationPreviewGenerator(
+        profile=args.profile, jobs=args.jobs, measure=args.measure, memory_budget=args.memory_budget,
+        section_jobs=args.section_jobs, retries=args.retries,
+        params=dict(param.split("=", 1) for param in args.param), queue=args.queue,
+        local_workers=args.local_workers,
+    )
     
     print("🚀 SLAM Animation Preview Generator")
     print("=" * 40)
     
+    # Only the steps whose inputs changed since the last build run
+    generator.estimate_costs()
+    graph = generator.build_graph(ladder=not args.no_ladder)
+    stale = graph.stale()
+    if not stale:
+        print("✨ Website is up to date, nothing to rebuild")
+        return
+    print(f"🔧 Out of date: {', '.join(stale)}")
+    
     # Generate preview videos
-    if generator.generate_previews():
-        # Create gallery page
-        generator.create_gallery_page()
-        
-        # Update main page
-        generator.update_main_page()
-        
-        # Create metadata file
-        generator.create_metadata_file()
-        
-        print("\n🎉 Website generation completed!")
-        print("\nNext steps:")
-        print("1. Commit the generated files to your repository")
-        print("2. Enable GitHub Pages in your repository settings")
-        print("3. Set the source to the 'docs' folder")
-        print("4. Your website will be available at: https://yourusername.github.io/slam-manim-visualizations")
-    else:
-        print("\n❌ Failed to generate previews. Check your Manim installation.")
-        sys.exit(1)
+    renders = [f for f, metadata in generator.animations.items() if f"render:{metadata['class']}" in stale]
+    try:
+        if renders and not generator.generate_previews(renders):
+            print("\n❌ Failed to generate previews. Check your Manim installation.")
+            sys.exit(1)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    
+    # Ladder, thumbnails, gallery page, main page and assets, metadata file
+    rebuilt = graph.build()
+    
+    print(f"\n🎉 Website generation completed! Rebuilt: {', '.join(rebuilt) or 'nothing'}")
+    print("\nNext steps:")
+    print("1. Commit the generated files to your repository")
+    print("2. Enable GitHub Pages in your repository settings")
+    print("3. Set the source to the 'docs' folder")
+    print("4. Your website will be available at: https://yourusername.github.io/slam-manim-visualizations")
 
 
 if __name__ == "__main__":
@@ -2,17 +2,31 @@ import numpy as np
 from scipy.spatial.transform import Rotation as R
 from manim import *
 
-class SE3ExponentialMap(ThreeDScene):
+from config import ProfiledScene, get_camera_orientation, scale_resolution
+from geometry_cache import cached_arrow3d
+from static_layers import StaticLayerScene
+
+class SE3ExponentialMap(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene to visualize the SE(3) exponential map, which converts
     a 6D twist vector from the se(3) algebra into a 4x4 transformation
     matrix in the SE(3) group.
     """
+    metadata = {
+        "order": 5,
+        "title": "SE(3) Exponential Map",
+        "description": "Conversion from twist vectors to transformation matrices via exponential mapping.",
+        "complexity": "Advanced",
+        "icon": "fas fa-expand-arrows-alt",
+    }
+
     def construct(self):
         # --- 1. Scene Setup ---
-        self.set_camera_orientation(phi=75 * DEGREES, theta=-80 * DEGREES, zoom=0.8)
+        phi, theta, zoom = get_camera_orientation("default")
+        self.set_camera_orientation(phi=phi * DEGREES, theta=theta * DEGREES, zoom=zoom)
         title = Text("The SE(3) Exponential Map: From Twist to Transformation").scale(0.7).to_edge(UP)
         self.add_fixed_in_frame_mobjects(title)
+        self.mark_static(title)
 
         # --- 2. Define and Visualize the Input Twist Vector ---
         twist_vector = np.array([0.5, 0.5, 2.0, 0, 0, PI/2]) # v, w
@@ -24,8 +38,8 @@ class SE3ExponentialMap(ThreeDScene):
         input_title = Text("Input: 6D Twist Vector", font_size=28).next_to(input_area, UP, buff=-0.5)
         twist_label = MathTex(r"\xi = (v, \omega) \in \mathfrak{se}(3)", font_size=36).next_to(input_title, DOWN, buff=0.2)
         
-        v_arrow = Arrow3D(ORIGIN, v_vec, color=BLUE, resolution=8)
-        w_arrow = Arrow3D(ORIGIN, w_vec, color=RED, resolution=8)
+        v_arrow = cached_arrow3d(ORIGIN, v_vec, color=BLUE, resolution=scale_resolution(8))
+        w_arrow = cached_arrow3d(ORIGIN, w_vec, color=RED, resolution=scale_resolution(8))
         v_label = MathTex("v", color=BLUE).next_to(v_arrow.get_end(), RIGHT)
         w_label = MathTex(r"\omega", color=RED).next_to(w_arrow.get_end(), UP)
         
@@ -98,6 +112,7 @@ class SE3ExponentialMap(ThreeDScene):
             VGroup(output_title, output_label, matrix_template).animate.to_edge(RIGHT)
         )
         self.add(axes)
+        self.mark_static(axes)
         self.play(FadeIn(cube))
         self.wait(1)
 
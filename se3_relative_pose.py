@@ -2,18 +2,33 @@ import numpy as np
 from scipy.spatial.transform import Rotation as R
 from manim import *
 
-class SE3RelativePose(ThreeDScene):
+from lie_groups import relative_pose
+from pose_store import PoseStore
+from config import ProfiledScene, scale_resolution
+from geometry_cache import cached_cylinder
+from static_layers import StaticLayerScene
+
+class SE3RelativePose(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene to visualize the SE(3) transformation that maps
     one camera pose to another.
     """
+    metadata = {
+        "order": 6,
+        "title": "SE(3) Relative Pose",
+        "description": "Relative pose transformations between camera positions.",
+        "complexity": "Intermediate",
+        "icon": "fas fa-exchange-alt",
+    }
+
     def create_camera_object(self, color=GRAY_BROWN):
         """Creates a VGroup representing a simple camera."""
         camera_body = Prism(dimensions=[0.7, 1.0, 0.5]).set_color(color)
-        camera_lens = Cylinder(
+        camera_lens = cached_cylinder(
             radius=0.2,
             height=0.4,
-            direction=OUT
+            direction=OUT,
+            resolution=scale_resolution((24, 24))
         ).set_color(DARK_GRAY).next_to(camera_body, OUT, buff=0)
         # Add a small "up" indicator
         up_indicator = Triangle(fill_opacity=1, color=RED).scale(0.1).next_to(camera_body, UP, buff=0)
@@ -29,21 +44,19 @@ class SE3RelativePose(ThreeDScene):
         title = Text("Relative SE(3) Transformation Between Poses").scale(0.7).to_edge(UP)
         self.add_fixed_in_frame_mobjects(title)
         self.add(axes, world_label)
+        self.mark_static(axes, world_label, title)
 
         # --- 2. Define Two Camera Poses (4x4 Homogeneous Matrices) ---
-        # Pose A: The starting pose of the camera in the world frame
-        rot_A_mat = R.from_euler('xyz', [10, 70, 0], degrees=True).as_matrix()
-        trans_A_vec = np.array([-2, -1, 0.5])
-        pose_A = np.eye(4)
-        pose_A[:3, :3] = rot_A_mat
-        pose_A[:3, 3] = trans_A_vec
-
-        # Pose B: The target pose of the camera in the world frame
-        rot_B_mat = R.from_euler('xyz', [-20, -45, 15], degrees=True).as_matrix()
-        trans_B_vec = np.array([2, 2, -0.5])
-        pose_B = np.eye(4)
-        pose_B[:3, :3] = rot_B_mat
-        pose_B[:3, 3] = trans_B_vec
+        # Both poses live in one compact quaternion+translation store
+        poses = PoseStore.from_arrays(
+            R.from_euler('xyz', [[10, 70, 0], [-20, -45, 15]], degrees=True).as_quat(),
+            np.array([
+                [-2, -1, 0.5],   # Pose A: The starting pose of the camera in the world frame
+                [2, 2, -0.5],    # Pose B: The target pose of the camera in the world frame
+            ]),
+            dtype=np.float64
+        )
+        pose_A, pose_B = poses.as_matrices()
 
         # --- 3. Create and Place the Camera Objects ---
         camera_A = self.create_camera_object(color=BLUE)
@@ -63,8 +76,7 @@ class SE3RelativePose(ThreeDScene):
 
         # --- 4. Calculate and Explain the Relative Transformation ---
         # The transformation from A to B is: T_BA = inv(T_WA) * T_WB
-        pose_A_inv = np.linalg.inv(pose_A)
-        relative_pose_B_from_A = pose_A_inv @ pose_B
+        relative_pose_B_from_A = relative_pose(poses[0], poses[1])[0]
 
         formula = MathTex(
             r"T_{BA} = T_{WA}^{-1} \cdot T_{WB}",
@@ -1,15 +1,28 @@
 import numpy as np
 from manim import *
 
-class SE3Visualization(ThreeDScene):
+from config import ProfiledScene, get_camera_orientation, scale_resolution
+from geometry_cache import cached_cylinder
+from static_layers import StaticLayerScene
+
+class SE3Visualization(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene to visualize a transformation in the Special Euclidean group SE(3),
     which represents a full rigid-body motion (rotation and translation).
     This is often called a "twist".
     """
+    metadata = {
+        "order": 4,
+        "title": "SE(3) Rigid Body Motion",
+        "description": "Demonstration of rigid body motion combining rotation and translation.",
+        "complexity": "Intermediate",
+        "icon": "fas fa-camera",
+    }
+
     def construct(self):
         # --- 1. Scene Setup ---
-        self.set_camera_orientation(phi=70 * DEGREES, theta=-110 * DEGREES, zoom=0.9)
+        phi, theta, zoom = get_camera_orientation("se3")
+        self.set_camera_orientation(phi=phi * DEGREES, theta=theta * DEGREES, zoom=zoom)
         axes = ThreeDAxes(
             x_range=[-5, 5, 1],
             y_range=[-5, 5, 1],
@@ -24,14 +37,17 @@ class SE3Visualization(ThreeDScene):
         self.add_fixed_in_frame_mobjects(title, subtitle)
 
         self.add(axes)
+        # Only the camera and its trace change during the 8 s twist
+        self.mark_static(axes, title, subtitle)
 
         # --- 2. Create a Camera-like Object ---
         # We'll build a simple camera from primitive shapes to represent our rigid body.
         camera_body = Prism(dimensions=[1, 1.5, 0.7]).set_color(GRAY_BROWN)
-        camera_lens = Cylinder(
+        camera_lens = cached_cylinder(
             radius=0.3,
             height=0.6,
-            direction=OUT
+            direction=OUT,
+            resolution=scale_resolution((24, 24))
         ).set_color(DARK_GRAY).next_to(camera_body, OUT, buff=0)
         
         camera_object = VGroup(camera_body, camera_lens)
@@ -0,0 +1,513 @@
+"""
+Section-level partial rendering with a per-section video cache.
+
+A scene is split into named sections by ``self.next_section("name")`` calls
+written directly in its ``construct`` (whatever precedes the first call is
+manim's ``autocreated`` section). Each section is cached as its own video,
+keyed by
+
+* its code: the syntax tree of its statements in ``construct``, of the
+  scene methods and module functions they use, the class attributes, and the
+  sources of the project modules the scene imports (comments and formatting
+  do not count), and
+* its input state: a digest of the mobjects on screen, the camera, the locals
+  of ``construct``, the attributes ``construct`` assigned to the scene and
+  the random number generators at the moment the section starts. It is taken
+  from a headless replay of ``construct`` (see ``dry_run``), so an edit to an
+  earlier section that changes what a later one starts from invalidates the
+  later one too.
+
+Parameters passed with ``--param NAME=VALUE`` (e.g. one point of a sweep,
+read by the scene from the environment) are part of every key as well: a
+scene may read them where neither its code nor its start state shows it,
+such as in ``setup`` or in a class attribute.
+
+Only sections without a cached video are rendered; manim runs the others with
+``skip_animations`` to rebuild the state. The cached videos are then joined
+with ffmpeg's concat demuxer, which copies the streams without re-encoding.
+
+With ``--jobs N`` the sections to render are spread over N processes. Each
+process replays ``construct`` with animations skipped up to its section,
+renders that section only and stops, so a long scene takes about as long as
+its longest section (plus the replay) instead of the sum of all of them.
+
+    python sections.py PoseGraphOptimization --list     # keys and cache status
+    python sections.py PoseGraphOptimization            # -> media/videos/PoseGraphOptimization.mp4
+    python sections.py SLAMKeyframesVisualization -j 3  # one process per section
+    python sections.py LargePoseGraphOptimization --param SLAM_POSE_GRAPH_NODES=1000
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from checkpoints import checkpointed, clear_checkpoints
+from config import PROFILE_ENV_VAR, PROFILES, profile_environment
+from render_cost import get_target
+from scene_registry import METADATA_ATTRIBUTE, PROJECT_ROOT, SceneEntry, _parse, discover_scenes, filter_scenes
+
+SECTION_CACHE_DIR = PROJECT_ROOT / "media" / "sections"
+DEFAULT_VIDEO_DIR = PROJECT_ROOT / "media" / "videos"
+# manim's name for the section before the first next_section call
+FIRST_SECTION = "autocreated"
+FFMPEG = "ffmpeg"
+# Scenes that draw random noise are seeded so section states are reproducible
+SEED = 0
+
+
+@dataclass(frozen=True)
+class Section:
+    """One section of a scene and the cache key of its video."""
+
+    scene: str
+    target: str
+    index: int
+    name: str
+    # play()/wait() calls in the section; sections without any have no video
+    plays: int
+    key: str
+
+    @property
+    def filename(self) -> str:
+        return f"{self.scene}.{self.target}.{self.index:02d}.{self.key}.mp4"
+
+
+def _digest(*parts: str) -> str:
+    hasher = hashlib.sha1()
+    for part in parts:
+        hasher.update(part.encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()[:16]
+
+
+# --- Section code ------------------------------------------------------------------
+
+def _section_name(statement: ast.stmt) -> Optional[str]:
+    """The name if ``statement`` is a ``self.next_section(...)`` call, else None."""
+    call = statement.value if isinstance(statement, ast.Expr) else None
+    if not (
+        isinstance(call, ast.Call)
+        and isinstance(call.func, ast.Attribute)
+        and call.func.attr == "next_section"
+        and isinstance(call.func.value, ast.Name)
+        and call.func.value.id == "self"
+    ):
+        return None
+    name = call.args[0] if call.args else next((k.value for k in call.keywords if k.arg == "name"), None)
+    if name is None:
+        return "unnamed"
+    if not (isinstance(name, ast.Constant) and isinstance(name.value, str)):
+        raise ValueError(f"line {statement.lineno}: section names must be string literals")
+    return name.value
+
+
+def _local_modules(tree: ast.Module, root: Path, seen: Set[Path]) -> List[Path]:
+    """Project modules imported by ``tree``, transitively."""
+    found = []
+    for node in tree.body:
+        names = [a.name for a in node.names] if isinstance(node, ast.Import) else []
+        if isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        for name in names:
+            path = root / f"{name.split('.')[0]}.py"
+            if path.exists() and path not in seen:
+                seen.add(path)
+                found.append(path)
+                found.extend(_local_modules(_parse(path), root, seen))
+    return found
+
+
+def section_sources(entry: SceneEntry, root: Path = PROJECT_ROOT) -> List[Tuple[str, str]]:
+    """``(name, code digest)`` of each section of ``entry``, in order."""
+    tree = _parse(entry.path)
+    class_def = entry.class_def()
+    functions = {
+        node.name: node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.ClassDef))
+    }
+    methods = {node.name: node for node in class_def.body if isinstance(node, ast.FunctionDef)}
+    if "construct" not in methods:
+        return [(FIRST_SECTION, _digest())]
+
+    # Shared by every section: imports and constants, class attributes, imported project modules
+    shared = [ast.dump(node) for node in tree.body if not isinstance(node, (ast.FunctionDef, ast.ClassDef))]
+    shared += [
+        ast.dump(node) for node in class_def.body
+        if not isinstance(node, ast.FunctionDef)
+        and not (isinstance(node, ast.Assign) and any(getattr(t, "id", None) == METADATA_ATTRIBUTE for t in node.targets))
+        and not (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant))
+    ]
+    seen = {Path(entry.path).resolve()}
+    shared += [hashlib.sha1(path.read_bytes()).hexdigest() for path in _local_modules(tree, Path(root), seen)]
+
+    def closure(nodes: Iterable[ast.AST]) -> List[str]:
+        """Dumps of the methods and module functions ``nodes`` use, transitively."""
+        used, pending = {}, list(nodes)
+        while pending:
+            for node in ast.walk(pending.pop()):
+                if isinstance(node, ast.Attribute) and getattr(node.value, "id", None) == "self":
+                    definition = methods.get(node.attr)
+                elif isinstance(node, ast.Name):
+                    definition = functions.get(node.id)
+                else:
+                    continue
+                if definition is not None and id(definition) not in used:
+                    used[id(definition)] = definition
+                    pending.append(definition)
+        return sorted(ast.dump(node) for node in used.values())
+
+    sections = [(FIRST_SECTION, [])]
+    for statement in methods["construct"].body:
+        name = _section_name(statement)
+        if name is not None:
+            sections.append((name, []))
+        else:
+            sections[-1][1].append(statement)
+    return [
+        (name, _digest(*shared, *(ast.dump(s) for s in statements), *closure(statements)))
+        for name, statements in sections
+    ]
+
+
+# --- Section input state -----------------------------------------------------------
+
+def _update_state(hasher, value, seen: Set[int]) -> None:
+    """Feed a stable (id-free) description of ``value`` to ``hasher``."""
+    if id(value) in seen:
+        hasher.update(b"<seen>")
+        return
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes, np.generic)):
+        hasher.update(repr(value).encode())
+        return
+    if isinstance(value, np.ndarray):
+        hasher.update(f"{value.dtype}{value.shape}".encode())
+        hasher.update(np.ascontiguousarray(value).tobytes())
+        return
+    seen.add(id(value))
+    hasher.update(type(value).__name__.encode())
+    if hasattr(value, "get_family") and hasattr(value, "points"):
+        # A mobject: its geometry, style and submobjects
+        for attr in ("points", "fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "pixel_array"):
+            if getattr(value, attr, None) is not None:
+                _update_state(hasher, np.asarray(getattr(value, attr)), seen)
+        for submobject in value.submobjects:
+            _update_state(hasher, submobject, seen)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _update_state(hasher, item, seen)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            hasher.update(repr(key).encode())
+            _update_state(hasher, value[key], seen)
+
+
+def state_digest(values: Dict[str, object]) -> str:
+    """Digest of named values (mobjects, arrays, numbers, containers of them)."""
+    hasher = hashlib.sha1()
+    for name in sorted(values):
+        hasher.update(name.encode())
+        _update_state(hasher, values[name], set())
+    return hasher.hexdigest()[:16]
+
+
+def _scene_state(scene, construct_locals: Dict[str, object], attributes: Iterable[str]) -> str:
+    from static_layers import _family, camera_state
+
+    fixed = getattr(scene.renderer.camera, "fixed_in_frame_mobjects", set())
+    return state_digest({
+        "mobjects": scene.mobjects,
+        "fixed_in_frame": [i for i, mob in enumerate(_family(scene.mobjects)) if mob in fixed],
+        "camera": list(camera_state(scene.renderer.camera)),
+        "locals": {k: v for k, v in construct_locals.items() if k != "self"},
+        "attributes": {name: getattr(scene, name) for name in attributes if hasattr(scene, name)},
+        "numpy_random": list(np.random.get_state()[1:]),
+        "random": list(random.getstate()[1]),
+    })
+
+
+def seed_rngs() -> None:
+    np.random.seed(SEED)
+    random.seed(SEED)
+
+
+def section_states(scene_cls) -> List[Tuple[str, str, int]]:
+    """``(name, state digest, plays)`` of each section, from a headless replay of ``construct``."""
+    from dry_run import headless_scene
+
+    seed_rngs()
+    with headless_scene(scene_cls) as scene:
+        renderer = scene.renderer
+        baseline = set(vars(scene))
+        new_attributes = lambda: sorted(set(vars(scene)) - baseline)
+        sections = [[FIRST_SECTION, _scene_state(scene, {}, ()), renderer.num_plays]]
+
+        def next_section(name="unnamed", *args, **kwargs):
+            construct_locals = sys._getframe(1).f_locals
+            sections.append([name, _scene_state(scene, construct_locals, new_attributes()), renderer.num_plays])
+
+        scene.next_section = next_section
+        scene.construct()
+        ends = [start for _, _, start in sections[1:]] + [renderer.num_plays]
+    return [(name, state, end - start) for (name, state, start), end in zip(sections, ends)]
+
+
+def plan_sections(
+    entry: SceneEntry, profile: Optional[str] = None, params: Optional[Dict[str, str]] = None,
+) -> List[Section]:
+    """
+    The sections of ``entry`` with their cache keys (runs ``construct`` headless).
+
+    ``params`` are the environment variables the render is parameterised
+    with; they must already be set in ``os.environ``.
+    """
+    import manim
+
+    sources = section_sources(entry)
+    states = section_states(entry.load())
+    if [name for name, _ in sources] != [name for name, _, _ in states]:
+        raise ValueError(
+            f"{entry.name}: sections must start with self.next_section('...') statements in construct itself"
+        )
+    target = get_target(profile)
+    profile_key = repr(sorted(asdict(target).items()))
+    params_key = json.dumps(params or {}, sort_keys=True)
+    return [
+        Section(
+            entry.name, target.name, index, name, plays,
+            _digest(entry.name, str(index), name, code, state, profile_key, params_key, manim.__version__),
+        )
+        for index, ((name, code), (_, state, plays)) in enumerate(zip(sources, states))
+    ]
+
+
+# --- Rendering, caching and stitching ---------------------------------------------
+
+def missing_sections(sections: Iterable[Section], cache_dir: Path = SECTION_CACHE_DIR) -> List[Section]:
+    """Sections with plays whose video is not cached yet."""
+    return [s for s in sections if s.plays and not (Path(cache_dir) / s.filename).exists()]
+
+
+def render_sections(
+    scene_cls,
+    indices: Iterable[int],
+    profile: Optional[str] = None,
+    video_dir: Optional[Path] = None,
+) -> Dict[int, Path]:
+    """
+    Render only the sections at ``indices``; the ones before are replayed with
+    animations skipped and ``construct`` stops after the last of them.
+    Returns the video manim wrote for each of them.
+
+    Finished plays are kept as checkpoints until the render completes, so
+    rendering the same sections again after a crash or timeout resumes at
+    the first play that was not finished (see ``checkpoints``).
+    """
+    from manim import tempconfig
+    from manim.utils.exceptions import EndSceneEarlyException
+
+    indices = set(indices)
+    # Partial movie files are the checkpoints: cache them, and keep all of them until the end
+    settings = {"save_sections": True, "disable_caching": False, "max_files_cached": -1}
+    if profile is None:
+        settings["quality"] = "low_quality"
+    if video_dir is not None:
+        # Concurrent renders of one scene must not share partial movie files
+        settings["video_dir"] = str(video_dir)
+    with tempconfig(settings):
+        seed_rngs()
+        scene = scene_cls()
+        writer = scene.renderer.file_writer
+        by_index = {0: writer.sections[0]}
+        if 0 not in indices:
+            writer.sections[0].skip_animations = True
+            writer.sections[0].video = None
+
+        start_section = scene.next_section
+
+        def next_section(name="unnamed", *args, skip_animations=False, **kwargs):
+            index = len(by_index)
+            if index > max(indices):
+                raise EndSceneEarlyException()
+            start_section(name, *args, skip_animations=skip_animations or index not in indices, **kwargs)
+            by_index[index] = writer.sections[-1]
+
+        scene.next_section = next_section
+        with checkpointed(scene) as report:
+            scene.render()
+        clear_checkpoints(writer.partial_movie_directory)
+    if report.reused:
+        print(f"⏩ {scene_cls.__name__}: resumed at play {report.resumed_from}, {len(report.reused)} plays from checkpoints")
+    return {
+        index: writer.sections_output_dir / section.video
+        for index, section in by_index.items()
+        if index in indices and section.video and (writer.sections_output_dir / section.video).exists()
+    }
+
+
+def _render_in_child(entry: SceneEntry, index: int, profile: Optional[str], video_dir: Path) -> Optional[str]:
+    video = render_sections(entry.load(), [index], profile, video_dir).get(index)
+    return None if video is None else str(video)
+
+
+def render_parallel(
+    entry: SceneEntry,
+    sections: Iterable[Section],
+    profile: Optional[str] = None,
+    jobs: int = 2,
+    work_dir: Path = SECTION_CACHE_DIR / "work",
+    render=_render_in_child,
+) -> Dict[int, Path]:
+    """
+    Render each of ``sections`` in its own process, most plays first.
+
+    ``render(entry, index, profile, video_dir)`` runs in the child and returns
+    the video path or None; each section gets its own ``video_dir``.
+    """
+    context = multiprocessing.get_context("spawn")
+    ordered = sorted(sections, key=lambda s: s.plays, reverse=True)
+    with profile_environment(profile), ProcessPoolExecutor(max_workers=jobs, mp_context=context) as pool:
+        futures = {
+            s.index: pool.submit(render, entry, s.index, profile, Path(work_dir) / f"{entry.name}.{s.index:02d}")
+            for s in ordered
+        }
+        videos = {index: future.result() for index, future in futures.items()}
+    return {index: Path(video) for index, video in videos.items() if video is not None}
+
+
+def store_section(section: Section, video: Path, cache_dir: Path = SECTION_CACHE_DIR) -> Path:
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return Path(shutil.move(str(video), cache_dir / section.filename))
+
+
+def prune_cache(sections: List[Section], cache_dir: Path = SECTION_CACHE_DIR) -> List[Path]:
+    """Delete cached videos of the same scene and target that ``sections`` no longer use."""
+    if not sections:
+        return []
+    keep = {s.filename for s in sections}
+    stale = [
+        path for path in Path(cache_dir).glob(f"{sections[0].scene}.{sections[0].target}.*.mp4")
+        if path.name not in keep
+    ]
+    for path in stale:
+        path.unlink()
+    return stale
+
+
+def concat_videos(videos: List[Path], output: Path, ffmpeg: str = FFMPEG) -> Path:
+    """Join ``videos`` into ``output`` by copying their streams (no re-encoding)."""
+    if not videos:
+        raise ValueError("No videos to concatenate")
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    listing = output.with_suffix(".concat.txt")
+    listing.write_text("".join(f"file '{Path(v).resolve().as_posix()}'\n" for v in videos))
+    try:
+        subprocess.run(
+            [ffmpeg, "-y", "-loglevel", "error", "-nostdin", "-f", "concat", "-safe", "0",
+             "-i", str(listing), "-c", "copy", str(output)],
+            check=True,
+        )
+    finally:
+        listing.unlink()
+    return output
+
+
+def build_scene(
+    entry: SceneEntry,
+    output: Optional[Path] = None,
+    profile: Optional[str] = None,
+    cache_dir: Path = SECTION_CACHE_DIR,
+    force: bool = False,
+    jobs: int = 1,
+    params: Optional[Dict[str, str]] = None,
+    video_dir: Optional[Path] = None,
+) -> Tuple[Path, List[Section], List[Section]]:
+    """
+    Render the sections of ``entry`` that changed and stitch the full video.
+
+    ``video_dir`` is where manim writes its partial movie files (default:
+    manim's own); renders running side by side each need their own.
+    Returns the video, every section, and the sections that had to be rendered.
+    """
+    sections = plan_sections(entry, profile, params)
+    stale = [s for s in sections if s.plays] if force else missing_sections(sections, cache_dir)
+    if stale:
+        work_dir = Path(cache_dir) / "work"
+        if jobs > 1 and len(stale) > 1:
+            videos = render_parallel(entry, stale, profile, jobs, work_dir)
+        else:
+            videos = render_sections(entry.load(), [s.index for s in stale], profile, video_dir)
+        for section in stale:
+            if section.index not in videos:
+                raise RuntimeError(f"{entry.name}: manim wrote no video for section {section.name!r}")
+            store_section(section, videos[section.index], cache_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    prune_cache(sections, cache_dir)
+    output = output or DEFAULT_VIDEO_DIR / f"{entry.name}.mp4"
+    concat_videos([Path(cache_dir) / s.filename for s in sections if s.plays], output)
+    return output, sections, stale
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render scenes section by section, reusing unchanged sections.")
+    parser.add_argument("names", nargs="+", help="Scene classes")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default=os.environ.get(PROFILE_ENV_VAR))
+    parser.add_argument("--output", type=Path, help="Video file (only with a single scene)")
+    parser.add_argument("--cache", type=Path, default=SECTION_CACHE_DIR, help="Section video cache")
+    parser.add_argument("--video-dir", type=Path, help="Directory for manim's partial movie files")
+    parser.add_argument(
+        "--param", action="append", default=[], metavar="NAME=VALUE",
+        help="Environment variable for the render, part of the section keys (repeatable)",
+    )
+    parser.add_argument("--list", action="store_true", help="Only show the sections and whether they are cached")
+    parser.add_argument("--force", action="store_true", help="Re-render every section")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="Render sections in this many processes")
+    args = parser.parse_args()
+    if any("=" not in param for param in args.param):
+        parser.error("--param expects NAME=VALUE")
+
+    if args.profile:
+        os.environ[PROFILE_ENV_VAR] = args.profile
+    # Set before the scenes are imported: they may read them at class level
+    params = dict(param.split("=", 1) for param in args.param)
+    os.environ.update(params)
+    entries = filter_scenes(discover_scenes(), args.names)
+    if args.output and len(entries) > 1:
+        parser.error("--output needs a single scene")
+    failed = False
+    for entry in entries:
+        try:
+            if args.list:
+                sections = plan_sections(entry, args.profile, params)
+                missing = set(missing_sections(sections, args.cache))
+                for s in sections:
+                    status = "empty" if not s.plays else "render" if s in missing else "cached"
+                    print(f"{entry.name:32s} {s.index:2d} {s.name:24s} {s.plays:4d} plays  {s.key}  {status}")
+                continue
+            output, sections, rendered = build_scene(
+                entry, args.output, args.profile, args.cache, args.force, args.jobs, params, args.video_dir,
+            )
+            names = ", ".join(s.name for s in rendered)
+            total = sum(1 for s in sections if s.plays)
+            print(f"✅ {entry.name}: rendered {len(rendered)}/{total} sections{f' ({names})' if names else ''} -> {output}")
+        except Exception as e:
+            failed = True
+            print(f"❌ {entry.name}: {e}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
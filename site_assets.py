@@ -0,0 +1,222 @@
+"""
+Fingerprinted, precompressed static assets for the website.
+
+Every asset the pages load (stylesheet, script, preview videos, posters) is
+copied to a name containing a hash of its content, ``styles.css`` ->
+``styles.3f9a0c2b71.css``, and the references in the HTML pages are rewritten
+to those names. A fingerprinted file never changes, so it can be served with
+``Cache-Control: immutable``, and a redeploy only uploads the files whose
+content changed. Text files (fingerprinted CSS/JS, the pages and the JSON
+manifests) also get ``.gz`` and, with the ``brotli`` package, ``.br`` siblings
+for servers that send precompressed files (``gzip_static``/``brotli_static``).
+
+``assets.json`` records each asset's fingerprinted file, SHA-256 and size, and
+those of its compressed siblings:
+
+    python site_assets.py docs
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import re
+import shutil
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import manifests
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+MANIFEST_FILE = "assets.json"
+# Files referenced from the pages, relative to the site root
+ASSET_PATTERNS = (
+    "styles.css", "script.js",
+    "previews/*.mp4", "previews/*.webm", "previews/*.jpg", "previews/*.webp",
+)
+# Pages whose references are rewritten; they keep their names
+PAGES = ("index.html", "gallery.html")
+TEXT_SUFFIXES = {".css", ".js", ".html", ".json", ".svg"}
+HASH_LENGTH = 10
+FINGERPRINT = re.compile(rf"\.[0-9a-f]{{{HASH_LENGTH}}}(?=\.[^./]+$)")
+# HTML attributes that hold asset URLs
+URL_ATTRIBUTE = re.compile(r'\b(src|href|poster|data-src|data-poster-fallback)="([^"#?]+)"')
+ENCODINGS = {".gz": "gzip", ".br": "br"}
+
+
+@dataclass
+class Asset:
+    """A fingerprinted asset and its precompressed siblings."""
+
+    file: str
+    sha256: str
+    bytes: int
+    # Encoding ("gzip"/"br") -> {"file", "bytes"} of the compressed sibling
+    encodings: Dict[str, dict] = field(default_factory=dict)
+
+
+def sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def fingerprinted(name: str, digest: str) -> str:
+    """``previews/Scene.mp4`` -> ``previews/Scene.<hash>.mp4``."""
+    path = Path(name)
+    return path.with_name(f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}").as_posix()
+
+
+def logical_name(name: str) -> str:
+    """Undo ``fingerprinted``; other names are returned unchanged."""
+    return FINGERPRINT.sub("", name, count=1)
+
+
+def is_fingerprinted(name: str) -> bool:
+    return FINGERPRINT.search(Path(name).name) is not None
+
+
+def asset_sources(root: Path, patterns: Iterable[str] = ASSET_PATTERNS) -> List[str]:
+    """Asset paths under ``root`` (relative, POSIX), without earlier fingerprinted copies."""
+    root = Path(root)
+    names = {
+        path.relative_to(root).as_posix()
+        for pattern in patterns
+        for path in root.glob(pattern)
+        if path.is_file() and not is_fingerprinted(path.name) and ".partial" not in path.name
+    }
+    return sorted(names)
+
+
+def _copy(source: Path, target: Path) -> None:
+    # Not a hard link: sources are rewritten in place (editors, ffmpeg -y),
+    # which would change the "immutable" copy with them
+    temporary = target.with_name(target.name + ".partial")
+    shutil.copyfile(source, temporary)
+    os.replace(temporary, target)
+
+
+def fingerprint_assets(root: Path, patterns: Iterable[str] = ASSET_PATTERNS) -> Dict[str, Asset]:
+    """
+    Copy each asset to its fingerprinted name, logical name -> ``Asset``.
+
+    Fingerprinted copies of earlier versions (and their compressed siblings)
+    are deleted.
+    """
+    root = Path(root)
+    assets = {}
+    for name in asset_sources(root, patterns):
+        source = root / name
+        digest = sha256(source)
+        asset = Asset(fingerprinted(name, digest), digest, source.stat().st_size)
+        if not (root / asset.file).exists():
+            _copy(source, root / asset.file)
+        assets[name] = asset
+
+    current = {asset.file for asset in assets.values()}
+    for pattern in patterns:
+        pattern = Path(pattern)
+        for path in root.glob(str(pattern.with_name(f"{pattern.stem}.*{pattern.suffix}"))):
+            name = path.relative_to(root).as_posix()
+            if is_fingerprinted(path.name) and name not in current:
+                for stale in (path, *(path.with_name(path.name + suffix) for suffix in ENCODINGS)):
+                    stale.unlink(missing_ok=True)
+    return assets
+
+
+def rewrite_references(html: str, assets: Dict[str, Asset]) -> str:
+    """Point every asset URL in ``html`` at the current fingerprinted file."""
+    def replace(match):
+        attribute, url = match.groups()
+        asset = assets.get(logical_name(url))
+        return f'{attribute}="{asset.file}"' if asset else match.group(0)
+
+    return URL_ATTRIBUTE.sub(replace, html)
+
+
+def precompress(path: Path) -> Dict[str, dict]:
+    """
+    Write ``.gz``/``.br`` siblings of a text file, encoding -> {"file", "bytes"}.
+
+    Output is deterministic (no timestamp in the gzip header) so unchanged
+    files produce unchanged siblings; siblings that would not be smaller are
+    not written.
+    """
+    path = Path(path)
+    data = path.read_bytes()
+    compressed = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed[".br"] = brotli.compress(data, quality=11)
+    encodings = {}
+    for suffix, content in compressed.items():
+        sibling = path.with_name(path.name + suffix)
+        if len(content) >= len(data):
+            sibling.unlink(missing_ok=True)
+            continue
+        if not sibling.exists() or sibling.read_bytes() != content:
+            sibling.write_bytes(content)
+        encodings[ENCODINGS[suffix]] = {"file": sibling.name, "bytes": len(content)}
+    return encodings
+
+
+def load_manifest(root: Path) -> Dict[str, Asset]:
+    records = manifests.read_manifest(Path(root) / MANIFEST_FILE)
+    return {name: Asset(**record) for name, record in records.items()}
+
+
+def save_manifest(root: Path, assets: Dict[str, Asset]) -> None:
+    manifests.write_manifest(Path(root) / MANIFEST_FILE, {name: asdict(asset) for name, asset in assets.items()})
+
+
+def build_site(root: Path, pages: Iterable[str] = PAGES, extra_text: Iterable[str] = ()) -> Dict[str, Asset]:
+    """
+    Fingerprint the assets under ``root``, rewrite ``pages`` to use them and
+    precompress the text files.
+
+    ``extra_text`` are further files (such as ``animations.json``) that keep
+    their names but are precompressed. Writes and returns the manifest.
+    """
+    root = Path(root)
+    assets = fingerprint_assets(root)
+    for page in pages:
+        path = root / page
+        if path.exists():
+            html = path.read_text()
+            rewritten = rewrite_references(html, assets)
+            if rewritten != html:
+                path.write_text(rewritten)
+
+    for asset in assets.values():
+        if Path(asset.file).suffix in TEXT_SUFFIXES:
+            asset.encodings = precompress(root / asset.file)
+    save_manifest(root, assets)
+    for name in (*pages, *extra_text, MANIFEST_FILE):
+        if (root / name).exists():
+            precompress(root / name)
+    return assets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress the website's assets.")
+    parser.add_argument("root", type=Path, nargs="?", default=Path(__file__).parent / "docs")
+    args = parser.parse_args()
+
+    assets = build_site(args.root, extra_text=["animations.json"])
+    if brotli is None:
+        print("⚠️  brotli is not installed, writing .gz files only")
+    for name, asset in assets.items():
+        sizes = ", ".join(f"{encoding} {info['bytes']:,} B" for encoding, info in asset.encodings.items())
+        print(f"🔖 {name} -> {asset.file} ({asset.bytes:,} B{', ' + sizes if sizes else ''})")
+    sys.exit(0 if assets else 1)
+
+
+if __name__ == "__main__":
+    main()
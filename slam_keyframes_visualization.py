@@ -1,11 +1,21 @@
 import numpy as np
 from manim import *
 
-class SLAMKeyframesVisualization(Scene):
+from config import ProfiledScene
+
+class SLAMKeyframesVisualization(ProfiledScene, Scene):
     """
     A Manim scene to visualize why Keyframes are essential for managing
     computational complexity in real-time SLAM systems.
     """
+    metadata = {
+        "order": 9,
+        "title": "SLAM Keyframes Management",
+        "description": "Managing computational complexity with keyframe-based SLAM.",
+        "complexity": "Intermediate",
+        "icon": "fas fa-key",
+    }
+
     def construct(self):
         # --- General Scene Setup ---
         title = Text("Managing SLAM Complexity with Keyframes").scale(0.8).to_edge(UP)
@@ -15,6 +25,7 @@ class SLAMKeyframesVisualization(Scene):
         camera_path = Ellipse(width=8, height=4, color=GRAY).shift(DOWN * 0.5)
 
         # --- Act 1: The Naive "All-Frames" Approach ---
+        self.next_section("all_frames")
         subtitle_naive = Text("Naive Approach: Every Frame is a Pose", font_size=32).to_corner(UL)
         self.play(Write(subtitle_naive))
 
@@ -44,6 +55,7 @@ class SLAMKeyframesVisualization(Scene):
         )
 
         # --- Act 2: The Smart "Keyframe" Approach ---
+        self.next_section("keyframes")
         subtitle_kf = Text("Smart Approach: Use Keyframes", font_size=32).to_corner(UL)
         self.play(Write(subtitle_kf))
 
@@ -2,18 +2,31 @@ import numpy as np
 from scipy.spatial.transform import Rotation
 from manim import *
 
-class SO3CompositionVsAddition(ThreeDScene):
+from config import ProfiledScene
+from level_of_detail import lod_arrow3d, lod_sphere
+from static_layers import StaticLayerScene
+
+class SO3CompositionVsAddition(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene that contrasts the composition of two rotations in the SO(3) group
     with the addition of their corresponding vectors in the so(3) Lie algebra.
     It demonstrates that for small rotations, addition in the algebra approximates
     composition in the group.
     """
+    metadata = {
+        "order": 3,
+        "title": "Group Composition vs Algebra Addition",
+        "description": "Comparison of group composition in SO(3) with vector addition in so(3).",
+        "complexity": "Advanced",
+        "icon": "fas fa-plus",
+    }
+
     def construct(self):
         # --- 1. Scene Setup ---
         self.set_camera_orientation(phi=60 * DEGREES, theta=-100 * DEGREES, zoom=0.8)
         title = Text("Group Composition vs. Algebra Addition").scale(0.8).to_edge(UP)
         self.add_fixed_in_frame_mobjects(title)
+        self.mark_static(title)
 
         # Create the three visual areas
         manifold_group, algebra_group, object_group = self.setup_visual_areas()
@@ -26,6 +39,7 @@ class SO3CompositionVsAddition(ThreeDScene):
         self.wait(0.5)
 
         # --- 2. Run comparison for LARGE rotations ---
+        self.next_section("large_rotations")
         subtitle_large = Text("Case 1: Large Rotations", font_size=32).to_corner(UL)
         self.add_fixed_in_frame_mobjects(subtitle_large)
         self.play(Write(subtitle_large))
@@ -55,6 +69,7 @@ class SO3CompositionVsAddition(ThreeDScene):
         self.wait(1)
 
         # --- 4. Run comparison for SMALL rotations ---
+        self.next_section("small_rotations")
         subtitle_small = Text("Case 2: Small Rotations (The Approximation)", font_size=32).to_corner(UL)
         self.add_fixed_in_frame_mobjects(subtitle_small)
         self.play(Write(subtitle_small))
@@ -74,7 +89,7 @@ class SO3CompositionVsAddition(ThreeDScene):
         """Creates and positions the manifold, algebra, and object displays."""
         # Manifold (Sphere)
         manifold_group = VGroup()
-        sphere = Sphere(radius=2, resolution=(32, 32)).set_color(BLUE).set_opacity(0.2)
+        sphere = lod_sphere(self, radius=2).set_color(BLUE).set_opacity(0.2)
         identity_dot = Dot3D(sphere.get_top(), color=YELLOW)
         manifold_group.add(sphere, identity_dot).move_to(LEFT * 4)
 
@@ -90,6 +105,7 @@ class SO3CompositionVsAddition(ThreeDScene):
         cube.set_default_tex("cube") # Name for easy retrieval
         object_group.add(axes, cube).move_to(RIGHT * 4)
 
+        self.mark_static(sphere, plane, axes)
         return manifold_group, algebra_group, object_group
 
     def run_comparison(self, v1_vec, v2_vec, manifold_group, algebra_group, object_group):
@@ -99,10 +115,10 @@ class SO3CompositionVsAddition(ThreeDScene):
         cube = object_group.get_submob_by_tex("cube")
         
         # --- Part A: Vector addition in the algebra ---
-        v1_arrow = Arrow3D(plane.get_center(), plane.get_center() + v1_vec, color=RED)
-        v2_arrow = Arrow3D(plane.get_center(), plane.get_center() + v2_vec, color=ORANGE)
+        v1_arrow = lod_arrow3d(self, plane.get_center(), plane.get_center() + v1_vec, color=RED)
+        v2_arrow = lod_arrow3d(self, plane.get_center(), plane.get_center() + v2_vec, color=ORANGE)
         v_sum_vec = v1_vec + v2_vec
-        v_sum_arrow = Arrow3D(plane.get_center(), plane.get_center() + v_sum_vec, color=TEAL, thickness=0.03)
+        v_sum_arrow = lod_arrow3d(self, plane.get_center(), plane.get_center() + v_sum_vec, color=TEAL, thickness=0.03)
         
         self.play(GrowArrow(v1_arrow), GrowArrow(v2_arrow))
         self.play(TransformFromCopy(VGroup(v1_arrow, v2_arrow), v_sum_arrow))
@@ -1,20 +1,34 @@
 import numpy as np
 from manim import (
-    ThreeDScene, Text, MathTex, VGroup, Sphere, Dot3D, Cube, ThreeDAxes, Square,
-    Arrow3D, ArcBetweenPoints, FadeIn, FadeOut, Create, Write, GrowArrow, Rotate,
+    ThreeDScene, Text, MathTex, VGroup, Dot3D, Cube, ThreeDAxes, Square,
+    ArcBetweenPoints, FadeIn, FadeOut, Create, Write, GrowArrow, Rotate,
     ORIGIN, UP, DOWN, LEFT, RIGHT, PURPLE, BLUE, YELLOW, GREEN, RED, ORANGE,
     DEGREES, smooth, normalize
 )
 
-class SO3ManifoldAndLieAlgebra(ThreeDScene):
+from config import ProfiledScene, get_camera_orientation, scale_resolution
+from geometry_cache import cached_arrow3d
+from level_of_detail import lod_sphere
+from static_layers import StaticLayerScene
+
+class SO3ManifoldAndLieAlgebra(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene visualizing the relationship between the SO(3) manifold,
     represented by a sphere, and its Lie algebra so(3), represented by
     the tangent space at the identity element.
     """
+    metadata = {
+        "order": 2,
+        "title": "SO(3) Manifold & Lie Algebra",
+        "description": "Visualization of the relationship between SO(3) manifold and its Lie algebra so(3).",
+        "complexity": "Intermediate",
+        "icon": "fas fa-globe",
+    }
+
     def construct(self):
         # --- Scene and Camera Setup ---
-        self.set_camera_orientation(phi=65 * DEGREES, theta=-120 * DEGREES, zoom=0.9)
+        phi, theta, zoom = get_camera_orientation("so3")
+        self.set_camera_orientation(phi=phi * DEGREES, theta=theta * DEGREES, zoom=zoom)
         
         # Add a title that remains fixed on the screen
         title = Text("SO(3) Manifold & its Lie Algebra so(3)").scale(0.8).to_edge(UP)
@@ -22,10 +36,8 @@ class SO3ManifoldAndLieAlgebra(ThreeDScene):
 
         # --- Group 1: The Manifold (Sphere) ---
         manifold_group = VGroup()
-        manifold_sphere = Sphere(
-            radius=2, 
-            resolution=(32, 32) # Higher resolution for smoothness
-        ).set_color(BLUE).set_opacity(0.2)
+        # Tessellation follows the sphere's projected size (up to 32x32)
+        manifold_sphere = lod_sphere(self, radius=2).set_color(BLUE).set_opacity(0.2)
         
         manifold_label = Text("SO(3) Manifold\n(Space of Rotations)").scale(0.6).next_to(manifold_sphere, DOWN, buff=0.3)
 
@@ -60,6 +72,9 @@ class SO3ManifoldAndLieAlgebra(ThreeDScene):
         object_group.add(axes, cube, object_label)
         object_group.move_to(RIGHT * 4)
 
+        # Backgrounds that only change when the camera moves or they are animated
+        self.mark_static(title, manifold_sphere, manifold_label, tangent_plane, algebra_label, axes, object_label)
+
         # --- Animation Sequence ---
         self.play(
             FadeIn(manifold_group, shift=DOWN),
@@ -85,11 +100,11 @@ class SO3ManifoldAndLieAlgebra(ThreeDScene):
         rotation_angle = algebra_vector_length # Angle is the vector's magnitude
         rotation_axis = algebra_vector_direction # Axis is the vector's direction
 
-        algebra_vector = Arrow3D(
+        algebra_vector = cached_arrow3d(
             start=tangent_plane.get_center(),
             end=tangent_plane.get_center() + algebra_vector_direction * algebra_vector_length,
             color=RED,
-            resolution=12
+            resolution=scale_resolution(12)
         )
         algebra_vector_label = MathTex(r"\mathbf{v} \in \mathfrak{so}(3)", color=RED).scale(0.8).next_to(algebra_vector, DOWN, buff=0.2)
 
@@ -172,11 +187,11 @@ class SO3ManifoldAndLieAlgebra(ThreeDScene):
         rotation_angle_small = algebra_vector_length_small
         rotation_axis_small = algebra_vector_direction_small
 
-        algebra_vector_small = Arrow3D(
+        algebra_vector_small = cached_arrow3d(
             start=tangent_plane.get_center(),
             end=tangent_plane.get_center() + algebra_vector_direction_small * algebra_vector_length_small,
             color=RED,
-            resolution=8
+            resolution=scale_resolution(8)
         )
         algebra_vector_label_small = MathTex(r"\mathbf{v}_{\text{small}}", color=RED).scale(0.7).next_to(algebra_vector_small, DOWN, buff=0.1)
 
@@ -1,11 +1,22 @@
 import numpy as np
 from manim import *
 
-class SO3RotationVisualization(ThreeDScene):
+from config import ProfiledScene
+from static_layers import StaticLayerScene
+
+class SO3RotationVisualization(ProfiledScene, StaticLayerScene, ThreeDScene):
     """
     A Manim scene to visualize a 3D rotation, representing an element
     of the Special Orthogonal group SO(3).
     """
+    metadata = {
+        "order": 1,
+        "title": "SO(3) Rotation Visualization",
+        "description": "Basic 3D rotation demonstrating elements of the Special Orthogonal group.",
+        "complexity": "Beginner",
+        "icon": "fas fa-cube",
+    }
+
     def construct(self):
         # Set up the 3D coordinate system for context
         axes = ThreeDAxes(
@@ -29,6 +40,7 @@ class SO3RotationVisualization(ThreeDScene):
 
         # Display the axes and the cube in their initial state
         self.add(axes, cube)
+        self.mark_static(axes, title)
         self.wait(1)
 
         # Animate the rotation of the cube. This transformation is an
@@ -0,0 +1,143 @@
+"""
+Static-layer caching for scenes with a large unchanging background.
+
+manim's Cairo renderer already paints the mobjects that precede the first
+moving one (in draw order) into a background image once per ``play``. That
+prefix is fragile: a single mobject with an updater (a ``TracedPath``, a
+level-of-detail sphere) or an unlucky ``add`` order makes everything after it
+re-rasterize on every frame, and the background is recomputed for every
+``play`` even when nothing in it changed.
+
+``StaticLayerScene`` lets a scene mark mobjects as static explicitly. Marked
+mobjects are kept out of the per-frame set regardless of their position or
+updaters, unless an animation targets them or (for 3D mobjects) the camera
+is moving. The rasterized background is cached by camera state and by a
+fingerprint of the static mobjects, so consecutive plays with the same camera
+reuse it.
+
+The static layer is composited underneath everything that moves, so mark
+backgrounds (axes, planes, translucent manifolds, titles) rather than
+objects that should occlude moving ones.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Background images kept per scene; one per distinct camera state / static set
+STATIC_CACHE_SIZE = 8
+
+
+def _family(mobjects):
+    seen, out = set(), []
+    for mob in mobjects:
+        for member in mob.get_family():
+            if id(member) not in seen:
+                seen.add(id(member))
+                out.append(member)
+    return out
+
+
+def camera_state(camera) -> tuple:
+    """Everything about the camera that changes how a static mobject projects."""
+    state = [tuple(np.round(camera.frame_center, 9)), camera.frame_width, camera.frame_height]
+    for getter in ("get_phi", "get_theta", "get_gamma", "get_zoom", "get_focal_distance"):
+        if hasattr(camera, getter):
+            state.append(round(float(getattr(camera, getter)()), 9))
+    return tuple(state)
+
+
+def fingerprint(mobjects) -> str:
+    """
+    Hash of the points and style of ``mobjects`` and all their submobjects,
+    cheap next to rasterizing them.
+
+    Groups, axes and text keep their geometry in their children, so an edit
+    to a child outside ``play`` (``become``, ``set_color``, ``shift``) must
+    change the hash too.
+    """
+    hasher = hashlib.sha1()
+    for mob in _family(mobjects):
+        hasher.update(str(id(mob)).encode())
+        hasher.update(np.ascontiguousarray(mob.points).tobytes())
+        for attr in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas"):
+            values = getattr(mob, attr, None)
+            if values is not None:
+                hasher.update(np.ascontiguousarray(values).tobytes())
+    return hasher.hexdigest()
+
+
+class StaticLayerScene:
+    """
+    Scene mixin with explicitly static, cached background layers.
+
+    Place it before the manim base class, e.g.
+    ``class MyScene(ProfiledScene, StaticLayerScene, ThreeDScene)``, and call
+    ``self.mark_static(axes, title)`` in ``construct``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._static_marked = []
+        self._static_cache = OrderedDict()
+        self.static_cache_hits = 0
+        self.static_cache_misses = 0
+        if hasattr(self.renderer, "save_static_frame_data"):
+            self._render_static = self.renderer.save_static_frame_data
+            self.renderer.save_static_frame_data = self._cached_static_frame
+
+    def mark_static(self, *mobjects):
+        """Render ``mobjects`` into the cached background while they are not animated."""
+        for mob in mobjects:
+            if all(mob is not marked for marked in self._static_marked):
+                self._static_marked.append(mob)
+        return mobjects[0] if len(mobjects) == 1 else mobjects
+
+    def unmark_static(self, *mobjects):
+        self._static_marked = [m for m in self._static_marked if all(m is not mob for mob in mobjects)]
+
+    def _camera_is_moving(self, animations) -> bool:
+        trackers = getattr(self.renderer.camera, "get_value_trackers", lambda: [])()
+        trackers = trackers + [getattr(self.renderer.camera, "_frame_center", None)]
+        animated = {id(m) for m in _family(anim.mobject for anim in animations)}
+        return any(t is not None and id(t) in animated for t in trackers)
+
+    def get_moving_mobjects(self, *animations):
+        moving = super().get_moving_mobjects(*animations)
+        if not self._static_marked:
+            return moving
+
+        camera_moving = self._camera_is_moving(animations)
+        fixed = getattr(self.renderer.camera, "fixed_in_frame_mobjects", set())
+        animated = {id(m) for m in _family(anim.mobject for anim in animations)}
+        static = set()
+        for mob in self._static_marked:
+            if camera_moving and mob not in fixed:
+                continue
+            family = mob.get_family()
+            if not any(id(m) in animated for m in family):
+                static.update(id(m) for m in family)
+
+        # Drop static members, and containers whose family would pull them back in
+        return [
+            mob for mob in _family(moving)
+            if id(mob) not in static and not any(id(m) in static for m in mob.get_family())
+        ]
+
+    def _cached_static_frame(self, scene, static_mobjects):
+        if not static_mobjects:
+            return self._render_static(scene, static_mobjects)
+        key = (camera_state(self.renderer.camera), fingerprint(static_mobjects))
+        image = self._static_cache.get(key)
+        if image is None:
+            self.static_cache_misses += 1
+            image = self._render_static(scene, static_mobjects)
+            self._static_cache[key] = image
+            if len(self._static_cache) > STATIC_CACHE_SIZE:
+                self._static_cache.popitem(last=False)
+        else:
+            self.static_cache_hits += 1
+            self._static_cache.move_to_end(key)
+            self.renderer.static_image = image
+        return image
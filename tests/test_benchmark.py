@@ -0,0 +1,48 @@
+"""
+Tests for the benchmark runner.
+"""
+
+import pytest
+
+from benchmark import KERNELS, bench_geometry, bench_kernels, compare, load_results, measure, save_results
+
+
+def test_measure_respects_round_limits():
+    """Test rounds fill the time budget within the min/max bounds."""
+    calls = []
+    result = measure(lambda: calls.append(1), min_time=0.0, min_rounds=3, max_rounds=10)
+    assert result["rounds"] == 3 and len(calls) == 4
+    assert 0 <= result["min"] <= result["median"]
+    assert measure(lambda: None, min_time=1.0, max_rounds=10)["rounds"] == 10
+
+
+def test_every_kernel_runs_on_single_and_batched_inputs():
+    """Test each kernel benchmark builds its inputs and runs at small sizes."""
+    results = bench_kernels(sizes=(1, 10), min_time=0.0)
+    assert set(results) == {f"kernel/{name}/{n}" for name in KERNELS for n in (1, 10)}
+
+
+def test_compare_flags_slowdowns_per_group(tmp_path):
+    """Test only benchmarks beyond their group's tolerance are reported."""
+    baseline = {
+        "kernel/so3_exp/1000": {"min": 1.0, "median": 1.0, "rounds": 3},
+        "construct/SE3RelativePose": {"min": 1.0, "median": 1.0, "rounds": 1},
+    }
+    path = save_results(baseline, tmp_path / "baseline.json")
+    current = {
+        "kernel/so3_exp/1000": {"min": 1.4, "median": 1.4, "rounds": 3},
+        "construct/SE3RelativePose": {"min": 1.4, "median": 1.4, "rounds": 1},
+        "kernel/so3_exp/1": {"min": 9.0, "median": 9.0, "rounds": 3},
+    }
+    regressions = compare(current, load_results(path))
+    assert [r[0] for r in regressions] == ["kernel/so3_exp/1000"]
+    assert regressions[0][3] == pytest.approx(1.4)
+    assert compare(current, baseline, {"kernel": 1.5}) == []
+    assert len(compare(current, baseline, {"construct": 1.1})) == 2
+
+
+def test_geometry_benchmarks_cover_built_and_cached_primitives():
+    """Test every cached primitive is timed both ways."""
+    pytest.importorskip("manim")
+    results = bench_geometry(min_time=0.0)
+    assert set(results) == {f"geometry/{name}/{how}" for name in ("sphere", "cylinder", "arrow3d") for how in ("built", "cached")}
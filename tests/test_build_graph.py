@@ -0,0 +1,75 @@
+"""
+Tests for the incremental build graph.
+"""
+
+import pytest
+
+from build_graph import BuildGraph
+
+
+def make_graph(tmp_path, calls, values=None):
+    """source.txt -> upper.txt -> page.html, the page also depending on ``values``."""
+    def upper():
+        calls.append("upper")
+        (tmp_path / "upper.txt").write_text((tmp_path / "source.txt").read_text().upper())
+
+    def page():
+        calls.append("page")
+        (tmp_path / "page.html").write_text(f"<p>{(tmp_path / 'upper.txt').read_text()}</p>")
+
+    graph = BuildGraph(tmp_path / "state.json")
+    # Added out of order: the files decide the order
+    graph.add("page", page, inputs=[tmp_path / "upper.txt"], outputs=[tmp_path / "page.html"], values=values)
+    graph.add("upper", upper, inputs=[tmp_path / "source.txt"], outputs=[tmp_path / "upper.txt"])
+    return graph
+
+
+def test_steps_run_in_dependency_order_then_not_again(tmp_path):
+    """Test a first build runs every step and an unchanged rebuild runs none."""
+    (tmp_path / "source.txt").write_text("hello")
+    calls = []
+    assert make_graph(tmp_path, calls).build() == ["upper", "page"]
+    assert make_graph(tmp_path, calls).stale() == []
+    assert make_graph(tmp_path, calls).build() == []
+    assert calls == ["upper", "page"]
+
+
+def test_only_changed_inputs_rerun(tmp_path):
+    """Test a changed value only reruns its step, a changed file everything downstream."""
+    (tmp_path / "source.txt").write_text("hello")
+    calls = []
+    make_graph(tmp_path, calls, values={"title": "a"}).build()
+    assert make_graph(tmp_path, calls, values={"title": "b"}).build() == ["page"]
+    (tmp_path / "source.txt").write_text("world")
+    assert make_graph(tmp_path, calls, values={"title": "b"}).stale() == ["upper", "page"]
+
+
+def test_unchanged_upstream_output_skips_downstream(tmp_path):
+    """Test a step that reran to the same output does not rerun the steps after it."""
+    (tmp_path / "source.txt").write_text("hello")
+    calls = []
+    make_graph(tmp_path, calls).build()
+    (tmp_path / "source.txt").write_text("HELLO")
+    assert make_graph(tmp_path, calls).build() == ["upper"]
+
+
+def test_missing_output_or_failure_reruns(tmp_path):
+    """Test deleted outputs are rebuilt and failed steps are not recorded."""
+    (tmp_path / "source.txt").write_text("hello")
+    make_graph(tmp_path, []).build()
+    (tmp_path / "page.html").unlink()
+    assert make_graph(tmp_path, []).build() == ["page"]
+
+    graph = BuildGraph(tmp_path / "failing.json")
+    graph.add("fails", lambda: False, inputs=[tmp_path / "source.txt"])
+    graph.build()
+    assert graph.stale() == ["fails"]
+
+
+def test_cycles_are_rejected(tmp_path):
+    """Test two steps reading each other's outputs cannot be ordered."""
+    graph = BuildGraph(tmp_path / "state.json")
+    graph.add("a", inputs=[tmp_path / "b.txt"], outputs=[tmp_path / "a.txt"])
+    graph.add("b", inputs=[tmp_path / "a.txt"], outputs=[tmp_path / "b.txt"])
+    with pytest.raises(ValueError, match="depend on each other"):
+        graph.order()
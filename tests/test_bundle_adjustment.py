@@ -0,0 +1,80 @@
+"""
+Tests for the sparse bundle adjustment solver.
+"""
+
+import time
+from dataclasses import replace
+
+import numpy as np
+
+from bundle_adjustment import (
+    make_synthetic_problem,
+    reprojection_residuals,
+    rms_error,
+    schur_step,
+    solve_bundle_adjustment,
+)
+from lie_groups import se3_exp
+
+
+def test_noise_free_problem_has_zero_residual():
+    """Test the synthetic generator projects ground truth onto the observations."""
+    problem, (cameras, points) = make_synthetic_problem(pixel_noise=0.0)
+    assert rms_error(reprojection_residuals(problem, cameras, points)) < 1e-9
+
+
+def test_error_decreases_to_noise_floor():
+    """Test the solver drives RMS error down to the measurement noise."""
+    problem, _ = make_synthetic_problem(pixel_noise=0.5, seed=1)
+    result = solve_bundle_adjustment(problem)
+    assert all(b <= a for a, b in zip(result.rms_history, result.rms_history[1:]))
+    assert result.rms_history[-1] < 1.0 < result.rms_history[0]
+
+
+def test_schur_step_matches_dense_solve():
+    """Test the Schur complement step equals solving the full normal equations, with and without a fixed camera."""
+    problem, _ = make_synthetic_problem(num_cameras=4, num_points=15, observations_per_point=3, seed=2)
+    damping = 1e-3
+
+    # Finite-difference the full Jacobian in the same left-perturbation parameterization
+    x0 = np.zeros(4 * 6 + 15 * 3)
+
+    def residual(x):
+        cams = se3_exp(x[:24].reshape(4, 6)) @ problem.cameras
+        pts = problem.points + x[24:].reshape(15, 3)
+        return reprojection_residuals(problem, cams, pts).ravel()
+
+    r0 = residual(x0)
+    eps = 1e-6
+    J = np.stack([(residual(x0 + eps * e) - r0) / eps for e in np.eye(len(x0))], axis=1)
+    for fixed in [(), (0,)]:
+        delta_cam, delta_point = schur_step(replace(problem, fixed_cameras=fixed), problem.cameras, problem.points, damping)
+        # Only the free cameras' and the points' columns take part
+        free = np.ones(len(x0), dtype=bool)
+        for camera in fixed:
+            free[camera * 6:(camera + 1) * 6] = False
+        H = J[:, free].T @ J[:, free]
+        H += damping * np.diag(np.diag(H))
+        full = np.zeros(len(x0))
+        full[free] = np.linalg.solve(H, -J[:, free].T @ r0)
+        step = np.concatenate([delta_cam.ravel(), delta_point.ravel()])
+        assert np.allclose(J @ step, J @ full, atol=1e-3)
+        assert all(np.all(delta_cam[camera] == 0) for camera in fixed)
+
+
+def test_fixed_camera_keeps_its_pose():
+    """Test the gauge camera of the synthetic problem is not moved by the solver."""
+    problem, _ = make_synthetic_problem(seed=1)
+    assert problem.fixed_cameras == (0,)
+    result = solve_bundle_adjustment(problem, max_iterations=5)
+    assert np.array_equal(result.cameras[0], problem.cameras[0])
+    assert not np.allclose(result.cameras[1], problem.cameras[1])
+
+
+def test_large_problem_runs_in_seconds():
+    """Test hundreds of cameras and thousands of points solve quickly on CPU."""
+    problem, _ = make_synthetic_problem(num_cameras=200, num_points=3000, observations_per_point=8)
+    start = time.perf_counter()
+    result = solve_bundle_adjustment(problem, max_iterations=5)
+    assert time.perf_counter() - start < 10.0
+    assert result.rms_history[-1] < 1.0
@@ -0,0 +1,89 @@
+"""
+Tests for the render checkpoint index.
+"""
+
+import pytest
+
+from checkpoints import (
+    CHECKPOINT_FILE, Checkpoint, ResumeReport, checkpointed, clear_checkpoints, load_checkpoints, save_checkpoints,
+    valid_checkpoints,
+)
+
+
+def write_play(directory, play, content=b"frames"):
+    path = directory / f"hash{play}.mp4"
+    path.write_bytes(content)
+    return Checkpoint(play, path.stem, path.name, len(content))
+
+
+def test_index_round_trip(tmp_path):
+    """Test the index is read back as written, with no temporary file left."""
+    checkpoints = {play: write_play(tmp_path, play) for play in (2, 0, 1)}
+    save_checkpoints(tmp_path, checkpoints)
+    assert load_checkpoints(tmp_path) == checkpoints
+    assert sorted(p.name for p in tmp_path.iterdir() if not p.name.endswith(".mp4")) == [CHECKPOINT_FILE]
+
+
+def test_missing_or_corrupt_index_means_no_checkpoints(tmp_path):
+    """Test a fresh directory or an unreadable index starts from play zero."""
+    assert load_checkpoints(tmp_path) == {}
+    (tmp_path / CHECKPOINT_FILE).write_text("[{\"play\": 0,")
+    assert load_checkpoints(tmp_path) == {}
+
+
+def test_only_intact_files_are_valid(tmp_path):
+    """Test truncated and deleted partial movies are not reused."""
+    checkpoints = {play: write_play(tmp_path, play) for play in range(4)}
+    save_checkpoints(tmp_path, checkpoints)
+    (tmp_path / checkpoints[1].file).write_bytes(b"fra")
+    (tmp_path / checkpoints[3].file).unlink()
+    assert sorted(valid_checkpoints(tmp_path)) == [0, 2]
+
+
+def test_clear_removes_checkpoints_and_interrupted_writes(tmp_path):
+    """Test clearing deletes indexed and half-written files but nothing else."""
+    save_checkpoints(tmp_path, {0: write_play(tmp_path, 0)})
+    (tmp_path / "hash1.partial.mp4").write_bytes(b"half")
+    (tmp_path / "other.mp4").write_bytes(b"unrelated")
+    clear_checkpoints(tmp_path)
+    assert [p.name for p in tmp_path.iterdir()] == ["other.mp4"]
+
+
+def test_resume_report():
+    """Test the resume point is the first play that was rendered again."""
+    assert ResumeReport(reused=[], rendered=[0, 1]).resumed_from == 0
+    assert ResumeReport(reused=[0, 1, 2, 4], rendered=[3, 5]).resumed_from == 3
+    assert ResumeReport(reused=[0, 1], rendered=[]).resumed_from == 2
+
+
+def test_interrupted_render_resumes_from_its_checkpoints(tmp_path):
+    """Test a render killed after two plays reuses them and renders only the rest."""
+    manim = pytest.importorskip("manim")
+
+    class Tiny(manim.Scene):
+        crash_at = None
+
+        def construct(self):
+            for k in range(3):
+                if k == self.crash_at:
+                    raise RuntimeError("worker killed")
+                self.play(manim.FadeIn(manim.Square().shift(k * manim.RIGHT)), run_time=0.2)
+
+    settings = {
+        "media_dir": str(tmp_path), "disable_caching": False, "max_files_cached": -1,
+        "pixel_width": 64, "pixel_height": 36, "frame_rate": 5,
+    }
+    with manim.tempconfig(settings):
+        Tiny.crash_at = 2
+        scene = Tiny()
+        with pytest.raises(RuntimeError, match="worker killed"), checkpointed(scene):
+            scene.render()
+        directory = scene.renderer.file_writer.partial_movie_directory
+        assert sorted(valid_checkpoints(directory)) == [0, 1]
+
+        Tiny.crash_at = None
+        scene = Tiny()
+        with checkpointed(scene) as report:
+            scene.render()
+    assert (report.reused, report.rendered) == ([0, 1], [2])
+    assert sorted(valid_checkpoints(directory)) == [0, 1, 2]
@@ -2,8 +2,15 @@
 Tests for the configuration module.
 """
 
+import os
+
 import pytest
-from config import ANIMATION, COLORS, MATH, SCENE, get_resolution, get_camera_orientation
+
+import config
+from config import (
+    ANIMATION, COLORS, MATH, SCENE, PROFILE_ENV_VAR, PROFILES, ProfiledScene,
+    get_camera_orientation, get_profile, get_resolution, profile_environment, scale_resolution
+)
 
 
 def test_animation_config():
@@ -50,4 +57,91 @@ def test_get_camera_orientation():
     assert get_camera_orientation("default") == (75, -80, 0.8)
     assert get_camera_orientation("so3") == (65, -120, 0.9)
     assert get_camera_orientation("se3") == (70, -110, 0.9)
-    assert get_camera_orientation("invalid") == (75, -80, 0.8)  # default 
\ No newline at end of file
+    assert get_camera_orientation("invalid") == (75, -80, 0.8)  # default 
+
+def test_render_profiles():
+    """Test the render profiles get cheaper from final to draft."""
+    draft, preview, final = (PROFILES[name] for name in ("draft", "preview", "final"))
+    assert final.mesh_scale == 1.0 and final.run_time_scale == 1.0
+    assert draft.mesh_scale < preview.mesh_scale < final.mesh_scale
+    assert draft.frame_rate < preview.frame_rate < final.frame_rate
+    assert draft.pixel_width * draft.pixel_height < final.pixel_width * final.pixel_height
+
+
+def test_get_profile(monkeypatch):
+    """Test get_profile name lookup and environment fallback."""
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    assert get_profile().name == "final"
+    monkeypatch.setenv(PROFILE_ENV_VAR, "draft")
+    assert get_profile().name == "draft"
+    assert get_profile("preview").name == "preview"
+    with pytest.raises(ValueError):
+        get_profile("ultra")
+
+
+def test_scale_resolution(monkeypatch):
+    """Test scale_resolution follows the active profile with a floor."""
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    assert scale_resolution(24) == 24
+    assert scale_resolution((32, 16)) == (32, 16)
+    monkeypatch.setenv(PROFILE_ENV_VAR, "draft")
+    assert scale_resolution(24) == 6
+    assert scale_resolution((32, 8)) == (8, config.MIN_MESH_RESOLUTION)
+    assert get_resolution("high") == (8, 8)
+
+
+def test_profile_environment(monkeypatch):
+    """Test profile_environment sets the profile variable and restores it afterwards."""
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    with profile_environment("draft"):
+        assert os.environ[PROFILE_ENV_VAR] == "draft"
+    assert PROFILE_ENV_VAR not in os.environ
+    monkeypatch.setenv(PROFILE_ENV_VAR, "preview")
+    with profile_environment("final"):
+        assert os.environ[PROFILE_ENV_VAR] == "final"
+    with profile_environment(None):
+        assert os.environ[PROFILE_ENV_VAR] == "preview"
+    assert os.environ[PROFILE_ENV_VAR] == "preview"
+
+
+def test_profiled_play_scales_each_animation(monkeypatch):
+    """Test a profile stretches every animation of a play by its own run_time."""
+    class Animation:
+        def __init__(self, run_time):
+            self.run_time = run_time
+
+    class Base:
+        def play(self, *animations, **kwargs):
+            return [anim.run_time for anim in animations], kwargs
+
+    class Scene(ProfiledScene, Base):
+        pass
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, "draft")
+    # Only the run times matter here, not manim's frame rate and size
+    monkeypatch.setattr(config, "apply_profile", lambda: None)
+    assert Scene().play(Animation(1.0), Animation(3.0)) == ([0.25, 0.75], {})
+    assert Scene().play(Animation(1.0), run_time=2.0) == ([1.0], {"run_time": 0.5})
+
+
+def test_profiled_wait_is_scaled_once(monkeypatch):
+    """Test a wait, which manim plays as a Wait animation, is stretched by the profile only once."""
+    class Wait:
+        def __init__(self, run_time):
+            self.run_time = run_time
+
+    class Base:
+        def play(self, *animations, **kwargs):
+            self.played = [anim.run_time for anim in animations]
+
+        def wait(self, duration=1.0):
+            self.play(Wait(run_time=duration))
+
+    class Scene(ProfiledScene, Base):
+        pass
+
+    monkeypatch.setenv(PROFILE_ENV_VAR, "draft")
+    monkeypatch.setattr(config, "apply_profile", lambda: None)
+    scene = Scene()
+    scene.wait(2.0)
+    assert scene.played == [0.5]
@@ -0,0 +1,78 @@
+"""
+Tests for the headless numerics dry run.
+"""
+
+import json
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation
+
+from dry_run import export_numerics, flatten_numerics, record_numerics
+from imu_preintegration import PreintegratedImu
+from lie_groups import relative_pose
+from pose_store import PoseStore
+
+
+class FakeScene:
+    def helper(self, angle):
+        rot = Rotation.from_rotvec([0, 0, angle])
+        label = "not numeric"
+        return rot.as_rotvec()
+
+    def construct(self):
+        v1 = np.array([2.5, 0.0, 0.0])
+        v2 = np.array([0.0, 2.0, 0.0])
+        v_commutator = np.cross(v1, v2)
+        poses = PoseStore.from_arrays([[0, 0, 0, 1], [0, 0, 0, 1]], [[0, 0, 0], [1, 2, 3]], dtype=np.float64)
+        relative = relative_pose(poses[0], poses[1])[0]
+        steps = [0.1, 0.2, 0.3]
+        mixed = [object(), 1.0]
+        flag = True
+        for angle in (0.5, 1.5):
+            self.helper(angle)
+        self.timings = {"solve": 0.25, "build": 0.5}
+
+
+def test_record_numerics_captures_locals_and_attributes():
+    """Test construct and helper locals are captured, with calls numbered."""
+    values = record_numerics(FakeScene())
+    np.testing.assert_allclose(values["construct.v_commutator"], [0, 0, 5])
+    np.testing.assert_allclose(values["construct.relative"][:3, 3], [1, 2, 3])
+    assert values["construct.poses"].shape == (2, 4, 4)
+    np.testing.assert_allclose(values["construct.steps"], [0.1, 0.2, 0.3])
+    assert "construct.mixed" not in values and "construct.flag" not in values
+    np.testing.assert_allclose(values["helper#1.angle"], 0.5)
+    np.testing.assert_allclose(values["helper#2.rot"], Rotation.from_rotvec([0, 0, 1.5]).as_matrix())
+    assert "helper#2.label" not in values
+    assert values["self.timings.solve"] == 0.25
+
+
+def test_flatten_numerics_expands_dataclasses():
+    """Test numeric dataclass fields become separate entries."""
+    values = flatten_numerics("preint", PreintegratedImu.identity((2,)), {})
+    assert values["preint.delta_R"].shape == (2, 3, 3)
+    assert values["preint.covariance"].shape == (2, 9, 9)
+
+
+def test_export_numerics_round_trip(tmp_path):
+    """Test the JSON and NPZ artifacts hold the same values."""
+    values = {"construct.T": np.eye(4), "construct.n": np.asarray(3)}
+    paths = export_numerics(values, tmp_path, "Demo")
+    payload = json.loads(paths["json"].read_text())
+    assert payload["construct.T"]["shape"] == [4, 4]
+    np.testing.assert_array_equal(payload["construct.T"]["value"], np.eye(4))
+    with np.load(paths["npz"]) as npz:
+        np.testing.assert_array_equal(npz["construct.T"], np.eye(4))
+        assert int(npz["construct.n"]) == 3
+
+
+def test_dry_run_scene_matches_kernels():
+    """Test a real scene's dry run reports the relative pose it animates."""
+    pytest.importorskip("manim")
+    from dry_run import dry_run_scene
+    from se3_relative_pose import SE3RelativePose
+
+    values = dry_run_scene(SE3RelativePose)
+    pose_A, pose_B = values["construct.pose_A"], values["construct.pose_B"]
+    np.testing.assert_allclose(values["construct.relative_pose_B_from_A"], np.linalg.inv(pose_A) @ pose_B, atol=1e-12)
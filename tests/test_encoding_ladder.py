@@ -0,0 +1,98 @@
+"""
+Tests for the preview encoding ladder.
+"""
+
+import shutil
+
+import pytest
+
+from encoding_ladder import (
+    CODECS, Rung, Variant, complexity_class, encoder_args, ladder_rungs, preview_sources, rung_kbps, settings_key,
+    source_tags, up_to_date,
+)
+
+ALL_ENCODERS = {"libx264", "libvpx-vp9", "libsvtav1"}
+
+
+def test_rungs_never_upscale_and_follow_encoders():
+    """Test rungs stop at the source height, a small source keeps its own, and missing codecs are skipped."""
+    rungs = ladder_rungs(480, {"libx264", "libvpx-vp9"})
+    assert rungs == [Rung("vp9", 360), Rung("vp9", 480), Rung("h264", 360), Rung("h264", 480)]
+    assert ladder_rungs(241, {"libx264"}) == [Rung("h264", 240)]
+    assert rung_kbps(Rung("h264", 240), 0.05) < rung_kbps(Rung("h264", 360), 0.05)
+    assert {r.codec for r in ladder_rungs(1080, {"libx264", "libaom-av1"})} == {"h264", "av1"}
+
+
+def test_bitrate_follows_complexity_and_codec():
+    """Test busier scenes and less efficient codecs get higher bitrate caps."""
+    rung = Rung("h264", 720)
+    assert complexity_class(0.01) == "simple" and complexity_class(0.05) == "normal"
+    assert complexity_class(0.2) == "detailed"
+    assert rung_kbps(rung, 0.01) < rung_kbps(rung, 0.05) < rung_kbps(rung, 0.2)
+    assert rung_kbps(Rung("av1", 720), 0.05) < rung_kbps(Rung("vp9", 720), 0.05) < rung_kbps(rung, 0.05)
+
+
+def test_encoder_args_cap_quality_encodes():
+    """Test each encoder gets a quality target, a bitrate cap and the rung's height."""
+    simple = encoder_args(Rung("h264", 480), "libx264", 0.01, 30)
+    detailed = encoder_args(Rung("h264", 480), "libx264", 0.2, 30)
+    assert "scale=-2:480" in simple and "-maxrate" in simple and "+faststart" in simple
+    assert int(simple[simple.index("-crf") + 1]) > int(detailed[detailed.index("-crf") + 1])
+    assert simple[simple.index("-g") + 1] == "60"
+    vp9 = encoder_args(Rung("vp9", 360), "libvpx-vp9", 0.05, 15)
+    assert vp9[vp9.index("-b:v") + 1] == f"{rung_kbps(Rung('vp9', 360), 0.05)}k"
+
+
+def test_source_tags_prefer_efficient_codecs_and_small_screens():
+    """Test sources are ordered AV1, VP9, H.264, with media queries on all but each codec's largest."""
+    variants = [
+        Variant(f"S-{h}p-{c}.{CODECS[c].extension}", c, h, 100, CODECS[c].mime_type, 1)
+        for c in ("h264", "vp9", "av1") for h in (480, 360)
+    ]
+    lines = source_tags(variants).splitlines()
+    assert [line.split('"')[1] for line in lines] == [
+        "previews/S-360p-av1.webm", "previews/S-480p-av1.webm",
+        "previews/S-360p-vp9.webm", "previews/S-480p-vp9.webm",
+        "previews/S-360p-h264.mp4", "previews/S-480p-h264.mp4",
+    ]
+    assert all(("media=" in line) == ("360p" in line) for line in lines)
+    assert "type='video/webm; codecs=\"vp9\"'" in lines[2]
+
+
+def test_up_to_date_needs_same_source_settings_and_files(tmp_path):
+    """Test a ladder is reused only for the same preview, settings and existing files."""
+    (tmp_path / "S-360p-h264.mp4").write_bytes(b"x")
+    entry = {"source_hash": "abc", "settings": settings_key(), "variants": [{"file": "S-360p-h264.mp4"}]}
+    assert up_to_date(entry, "abc", tmp_path)
+    assert not up_to_date(entry, "def", tmp_path)
+    assert not up_to_date({**entry, "settings": "old"}, "abc", tmp_path)
+    assert not up_to_date(None, "abc", tmp_path)
+    assert not up_to_date({**entry, "failed": ["480p-h264"]}, "abc", tmp_path)
+    (tmp_path / "S-360p-h264.mp4").unlink()
+    assert not up_to_date(entry, "abc", tmp_path)
+
+
+def test_sources_skip_variants_and_fingerprinted_copies(tmp_path):
+    """Test only rendered previews are sources, not ladder variants or published copies."""
+    for name in ("Clip.mp4", "Clip-480p-h264.mp4", "Clip-loop.mp4", "Clip.0123456789.mp4", "Other.mp4"):
+        (tmp_path / name).write_bytes(b"")
+    assert preview_sources(tmp_path) == {"Clip": tmp_path / "Clip.mp4", "Other": tmp_path / "Other.mp4"}
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None or shutil.which("ffprobe") is None, reason="needs ffmpeg")
+def test_build_ladder(tmp_path):
+    """Test a short clip is encoded into every available rung."""
+    import subprocess
+
+    from encoding_ladder import build_ladder, load_manifest
+
+    source = tmp_path / "Clip.mp4"
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", "testsrc=s=854x480:d=1:r=15",
+         "-pix_fmt", "yuv420p", str(source)],
+        check=True,
+    )
+    ladder = build_ladder({"Clip": source}, tmp_path, jobs=2)
+    assert {v.height for v in ladder["Clip"]} == {360, 480}
+    assert all((tmp_path / v.file).stat().st_size > 0 for v in ladder["Clip"])
+    assert load_manifest(tmp_path)["Clip"]["complexity"] in ("simple", "normal", "detailed")
@@ -0,0 +1,84 @@
+"""
+Tests for the on-disk tessellation cache.
+"""
+
+import numpy as np
+
+from geometry_cache import (
+    CACHE_ENV_VAR, cache_dir, cache_key, cached_arrays, load_arrays, place_arrow, save_arrays
+)
+
+
+def test_cache_key_is_stable_and_parameter_sensitive():
+    """Test keys ignore argument order and change with any parameter."""
+    a = cache_key("sphere", radius=2, resolution=(32, 32))
+    assert a == cache_key("sphere", resolution=[32, 32], radius=2)
+    assert a != cache_key("sphere", radius=2, resolution=(16, 16))
+    assert a != cache_key("cylinder", radius=2, resolution=(32, 32))
+    assert cache_key("arrow3d", end=np.array([1.0, 0, 0])) == cache_key("arrow3d", end=[1.0, 0.0, 0.0])
+
+
+def test_load_arrays_memory_maps_npz_members(tmp_path):
+    """Test uncompressed .npz members round-trip as read-only memmaps."""
+    arrays = {
+        "points_0": np.random.default_rng(0).normal(size=(1024, 3)),
+        "offsets_0": np.arange(0, 1025, 16),
+        "uv_0": np.array([[0, 1], [2, 3]]),
+    }
+    path = save_arrays(tmp_path / "entry.npz", arrays)
+    loaded = load_arrays(path)
+    assert set(loaded) == set(arrays)
+    for name, value in arrays.items():
+        assert isinstance(loaded[name], np.memmap)
+        np.testing.assert_array_equal(loaded[name], value)
+    assert not loaded["points_0"].flags.writeable
+    assert list(tmp_path.iterdir()) == [path]  # No temporary files left behind
+
+
+def test_cached_arrays_builds_once(tmp_path):
+    """Test a miss builds and stores the entry and a hit reuses it."""
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"points_0": np.ones((4, 3))}
+
+    first = cached_arrays("sphere", build, directory=tmp_path, radius=1)
+    second = cached_arrays("sphere", build, directory=tmp_path, radius=1)
+    np.testing.assert_array_equal(first["points_0"], second["points_0"])
+    assert len(calls) == 1
+    cached_arrays("sphere", build, directory=tmp_path, radius=2)
+    assert len(calls) == 2
+
+
+def test_cached_arrays_rebuilds_corrupt_entry(tmp_path):
+    """Test a truncated entry is rebuilt rather than raising."""
+    build = lambda: {"points_0": np.zeros((2, 3))}
+    path = tmp_path / f"{cache_key('cube', side=1)}.npz"
+    path.write_bytes(b"not a zip file")
+    loaded = cached_arrays("cube", build, directory=tmp_path, side=1)
+    assert loaded["points_0"].shape == (2, 3)
+
+
+def test_cache_dir_env_override(tmp_path, monkeypatch):
+    """Test the cache directory can be redirected per render farm."""
+    monkeypatch.setenv(CACHE_ENV_VAR, str(tmp_path))
+    assert cache_dir() == tmp_path
+
+
+def test_place_arrow_moves_the_canonical_arrow_into_place():
+    """Test the unit shaft is stretched, the cone moved to the tip, and both rotated."""
+    height = 0.3
+    canonical = {
+        "points_0": np.array([[0.02, 0, 0], [0.02, 0, 1.0]]),
+        "points_1": np.array([[0.08, 0, 1.0], [0, 0, 1.0 + height]]),
+        "uv_0": np.array([[0, 0]]),
+    }
+    start, end = np.array([1.0, 0, 0]), np.array([1.0, 2.0, 0])
+    placed = place_arrow(canonical, start, end, height)
+    axis = placed["points_0"] - start
+    np.testing.assert_allclose(np.linalg.norm(axis, axis=1), [0.02, np.hypot(0.02, 2.0 - height)])
+    np.testing.assert_allclose(placed["points_1"][1], end, atol=1e-12)
+    np.testing.assert_allclose(placed["points_0"][1] - placed["points_0"][0], [0, 2.0 - height, 0], atol=1e-12)
+    assert placed["uv_0"] is canonical["uv_0"]
+    np.testing.assert_array_equal(canonical["points_0"][1], [0.02, 0, 1.0])
@@ -0,0 +1,55 @@
+"""
+Tests for golden-frame fingerprints, and the visual regression check itself.
+"""
+
+import numpy as np
+import pytest
+
+from golden_frames import (
+    MAX_HASH_DISTANCE, GoldenFrame, compare_frames, hash_distance, load_golden, perceptual_hash,
+    scene_fingerprints,
+)
+from scene_registry import discover_scenes, filter_scenes
+
+
+def frame_with_box(x0, y0, color=(255, 255, 255)):
+    frame = np.zeros((180, 320, 4), dtype=np.uint8)
+    frame[..., 3] = 255
+    frame[y0:y0 + 60, x0:x0 + 90, :3] = color
+    return frame
+
+
+def test_hash_tolerates_noise_but_not_moved_objects():
+    """Test pixel noise keeps the hash while a moved object changes it."""
+    reference = frame_with_box(40, 40)
+    noise = np.random.default_rng(0).integers(0, 6, reference.shape, dtype=np.uint8)
+    noisy = reference + noise
+    assert hash_distance(perceptual_hash(reference), perceptual_hash(noisy)) <= MAX_HASH_DISTANCE
+    moved = frame_with_box(190, 100)
+    assert hash_distance(perceptual_hash(reference), perceptual_hash(moved)) > MAX_HASH_DISTANCE
+
+
+def test_compare_frames_reports_changes():
+    """Test recolored, missing and extra frames are all reported."""
+    golden = [GoldenFrame.from_frame(t, frame_with_box(40, 40)).__dict__ for t in (1.0, 4.0)]
+    same = [GoldenFrame.from_frame(t, frame_with_box(40, 40)) for t in (1.0, 4.0)]
+    assert compare_frames(golden, same) == []
+
+    recolored = [GoldenFrame.from_frame(1.0, frame_with_box(40, 40, color=(255, 0, 0)))]
+    extra = GoldenFrame.from_frame(8.0, frame_with_box(40, 40))
+    problems = compare_frames(golden, recolored + [extra])
+    assert len(problems) == 3
+    assert "mean color" in problems[0] and "no frame" in problems[1] and "[8.0]" in problems[2]
+
+
+GOLDEN = load_golden()
+
+
+@pytest.mark.parametrize("entry", filter_scenes(discover_scenes(), published=True), ids=lambda e: e.name)
+def test_scene_matches_golden_frames(entry):
+    """Test each scene still looks like its stored golden frames."""
+    pytest.importorskip("manim")
+    if entry.name not in GOLDEN:
+        pytest.skip("no golden frames; run python golden_frames.py --update")
+    problems = compare_frames(GOLDEN[entry.name]["frames"], scene_fingerprints(entry.load()))
+    assert not problems, "\n".join(problems)
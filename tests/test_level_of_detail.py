@@ -0,0 +1,123 @@
+"""
+Tests for the projected-size level-of-detail selection.
+"""
+
+import types
+
+import numpy as np
+import pytest
+
+from config import PROFILE_ENV_VAR
+from level_of_detail import (
+    LOD_LEVELS,
+    add_level_of_detail,
+    perspective_factor,
+    profile_levels,
+    projected_radius,
+    required_resolution,
+    select_resolution,
+    silhouette_error,
+)
+
+
+def test_required_resolution_meets_error_bound():
+    """Test the required segment count keeps the silhouette error under the bound."""
+    for radius_px in (5.0, 50.0, 216.0, 1000.0):
+        n = int(np.ceil(required_resolution(radius_px, 1.0)))
+        assert silhouette_error(radius_px, n) <= 1.0 + 1e-9
+        assert silhouette_error(radius_px, n - 1) > 1.0 or n <= 3
+
+
+def test_select_resolution_grows_with_screen_size():
+    """Test larger projected sizes never select coarser levels."""
+    sizes = np.geomspace(1, 2000, 50)
+    chosen = [select_resolution(r) for r in sizes]
+    assert chosen == sorted(chosen)
+    assert chosen[0] == LOD_LEVELS[0]
+    assert chosen[-1] == LOD_LEVELS[-1]
+
+
+def test_translucent_surfaces_use_fewer_faces():
+    """Test a 20% opacity sphere drops below the opaque resolution."""
+    radius_px = projected_radius(2.0, pixels_per_unit=1920 / 14.222, zoom=0.8)
+    assert select_resolution(radius_px) == 32
+    assert select_resolution(radius_px, opacity=0.2) < 32
+
+
+def test_hysteresis_keeps_current_level_near_threshold():
+    """Test the current level is kept just across a switching threshold."""
+    levels = (8, 16)
+    # Radius at which exactly 8 segments meet a 1 px error
+    threshold = 1.0 / (1 - np.cos(np.pi / 8))
+    assert select_resolution(threshold * 1.05, levels) == 16
+    assert select_resolution(threshold * 1.05, levels, current=8) == 8
+    assert select_resolution(threshold * 2, levels, current=8) == 16
+
+
+def test_perspective_factor():
+    """Test objects towards the camera are magnified."""
+    assert perspective_factor(0.0, np.inf) == 1.0
+    assert perspective_factor(0.0, 20.0) == pytest.approx(1.0)
+    assert perspective_factor(10.0, 20.0) == pytest.approx(2.0)
+
+
+def test_profile_levels_are_capped(monkeypatch):
+    """Test the draft profile caps the finest level."""
+    monkeypatch.delenv(PROFILE_ENV_VAR, raising=False)
+    assert profile_levels(32)[-1] == 32
+    monkeypatch.setenv(PROFILE_ENV_VAR, "draft")
+    assert profile_levels(32)[-1] == 8
+    assert profile_levels(8) == (LOD_LEVELS[0],)
+
+
+class FakeGroup:
+    def __init__(self, *faces):
+        self.width = 1.0
+
+    def scale(self, factor):
+        return self
+
+    def move_to(self, point):
+        return self
+
+    def match_style(self, mobject):
+        return self
+
+
+class FakeArrow:
+    """Stands in for an Arrow3D: faces plus a ``cone`` attribute pointing at one of them."""
+
+    def __init__(self, level):
+        self.cone = f"cone{level}"
+        self.submobjects = [f"shaft{level}", self.cone]
+        self.width, self.opacity, self.updaters = 1.0, 1.0, []
+
+    def get_center(self):
+        return np.zeros(3)
+
+    def get_fill_opacity(self):
+        return self.opacity
+
+    def set_opacity(self, opacity):
+        self.opacity = opacity
+        return self
+
+    def add_updater(self, updater):
+        self.updaters.append(updater)
+
+    def get_group_class(self):
+        return FakeGroup
+
+
+def test_level_follows_later_opacity_and_keeps_the_tip():
+    """Test the first level is chosen on the first update, after set_opacity, and the cone follows each swap."""
+    scene = types.SimpleNamespace(camera=types.SimpleNamespace(pixel_width=1920, frame_width=14.2))
+    built = []
+    factory = lambda level: built.append(level) or FakeArrow(level)
+    arrow = add_level_of_detail(scene, FakeArrow(32), factory, radius=2.0, levels=(8, 16, 24, 32), initial_level=32)
+    arrow.set_opacity(0.2)
+    assert built == []
+    arrow.updaters[0](arrow)
+    assert arrow.submobjects == ["shaft24", "cone24"] and arrow.cone == "cone24"
+    arrow.set_opacity(1.0).updaters[0](arrow)
+    assert arrow.submobjects == ["shaft32", "cone32"] and arrow.cone == "cone32" and built == [24]
@@ -0,0 +1,27 @@
+"""
+Tests for the shared JSON manifests.
+"""
+
+from manifests import read_manifest, settings_key, write_manifest
+
+
+def test_manifest_round_trip(tmp_path):
+    """Test a written manifest reads back, leaving no temporary file behind."""
+    path = tmp_path / "ladder.json"
+    write_manifest(path, {"Clip": {"source": "abc", "failed": []}})
+    assert read_manifest(path) == {"Clip": {"source": "abc", "failed": []}}
+    assert [p.name for p in tmp_path.iterdir()] == ["ladder.json"]
+
+
+def test_missing_or_broken_manifest_reads_empty(tmp_path):
+    """Test a missing or truncated manifest is empty, so everything is generated again."""
+    path = tmp_path / "thumbnails.json"
+    assert read_manifest(path) == {}
+    path.write_text('{"Clip": {')
+    assert read_manifest(path) == {}
+
+
+def test_settings_key_follows_the_settings():
+    """Test the key changes with any setting and only then."""
+    assert settings_key(1080, 0.1) == settings_key(1080, 0.1)
+    assert settings_key(1080, 0.1) != settings_key(1080, 0.2)
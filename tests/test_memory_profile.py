@@ -0,0 +1,137 @@
+"""
+Tests for per-scene memory tracking and render budgets.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from memory_profile import (
+    DEFAULT_RENDER_MEMORY_MB, AsyncMemoryGate, MemoryGate, SceneMemory, act_markers, render_memory_mb,
+    track_memory,
+)
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.plays = 0
+
+    def play(self, scene, *animations, **kwargs):
+        self.plays += 1
+
+
+class FakeBaseScene:
+    def __init__(self):
+        self.renderer = FakeRenderer()
+        self.mobjects = []
+
+    def play(self, *animations, **kwargs):
+        self.renderer.play(self, *animations, **kwargs)
+
+
+class FakeScene(FakeBaseScene):
+    def construct(self):
+        self.play()
+        # --- Act 1: Grow ---
+        self.mobjects.append(bytearray(4 * 1024 * 1024))
+        self.play()
+        self.helper()
+        # --- Act 2: Shrink ---
+        self.mobjects.clear()
+        self.play()
+
+    def helper(self):
+        self.mobjects.append(bytearray(2 * 1024 * 1024))
+        self.play()
+
+
+class UnmarkedScene(FakeBaseScene):
+    def construct(self):
+        self.show_path()
+        self.play()
+
+    def show_path(self):
+        self.play()
+
+
+def test_act_markers_read_construct_comments():
+    """Test act titles and lines come from the ``# --- ... ---`` comments."""
+    markers = act_markers(Path(__file__), "FakeScene")
+    assert [title for _, title in markers] == ["Act 1: Grow", "Act 2: Shrink"]
+
+
+def test_track_memory_attributes_samples_to_acts():
+    """Test every play is sampled and heap growth lands in the act that caused it."""
+    scene = FakeScene()
+    with track_memory(scene, act_markers(Path(__file__), "FakeScene")) as memory:
+        scene.construct()
+    assert scene.renderer.plays == 4
+    assert [s.act for s in memory.samples] == ["construct", "Act 1: Grow", "Act 1: Grow", "Act 2: Shrink"]
+    acts = memory.acts
+    assert acts["Act 1: Grow"]["growth_mb"] == pytest.approx(6, abs=0.5)
+    assert acts["Act 2: Shrink"]["growth_mb"] == pytest.approx(-6, abs=0.5)
+    assert memory.peak_traced_mb >= 6
+    assert memory.peak_rss_mb >= memory.baseline_rss_mb > 0
+    # The renderer is restored afterwards
+    assert scene.renderer.play.__func__ is FakeRenderer.play
+
+
+def test_helpers_name_acts_without_markers():
+    """Test plays issued through a helper method are attributed to it."""
+    scene = UnmarkedScene()
+    with track_memory(scene) as memory:
+        scene.construct()
+    assert [s.act for s in memory.samples] == ["show_path", "construct"]
+
+
+def test_render_memory_estimate():
+    """Test unmeasured scenes get the default and measured ones add frame buffers."""
+    assert render_memory_mb(None) == DEFAULT_RENDER_MEMORY_MB
+    measured = SceneMemory("S", peak_rss_mb=500.0)
+    assert 500 < render_memory_mb(measured, "draft") < render_memory_mb(measured, "final")
+
+
+def test_memory_gate_limits_concurrency():
+    """Test jobs only overlap while their reservations fit in the budget."""
+    gate = MemoryGate(budget_mb=1000)
+    running, peak = [0], [0]
+    lock = threading.Lock()
+
+    def job(mb):
+        with gate.reserve(mb):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=job, args=(600,)) for _ in range(3)]
+    threads.append(threading.Thread(target=job, args=(5000,)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert peak[0] == 1 and gate.in_use_mb == 0
+
+
+def test_async_memory_gate_limits_concurrency():
+    """Test asyncio tasks only overlap while their reservations fit in the budget."""
+    gate = AsyncMemoryGate(budget_mb=1000)
+    running, peak = [0], [0]
+
+    async def job(mb):
+        async with gate.reserve(mb):
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+
+    async def main():
+        await asyncio.gather(job(400), job(400), job(400), job(5000))
+
+    asyncio.run(main())
+    assert peak[0] == 2 and gate.in_use_mb == 0
@@ -0,0 +1,85 @@
+"""
+Tests for the sparse pose graph assembly and solver.
+"""
+
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+from pose_graph import (
+    _edge_jacobians,
+    assemble_hessian,
+    bandwidth,
+    edge_errors,
+    make_loop_graph,
+    optimize,
+    reorder,
+    sparsity_image,
+    total_error,
+)
+
+
+def test_edge_jacobians_match_finite_differences():
+    """Test the analytic edge Jacobians against numeric differentiation."""
+    graph, _ = make_loop_graph(6, num_loop_closures=1)
+    A, B = _edge_jacobians(graph, graph.poses)
+    eps = 1e-7
+    for k in range(3):
+        step = np.zeros_like(graph.poses)
+        step[graph.edge_from[0], k] = eps
+        numeric_A = (edge_errors(graph, graph.poses + step)[0] - edge_errors(graph)[0]) / eps
+        step = np.zeros_like(graph.poses)
+        step[graph.edge_to[0], k] = eps
+        numeric_B = (edge_errors(graph, graph.poses + step)[0] - edge_errors(graph)[0]) / eps
+        assert np.allclose(A[0, :, k], numeric_A, atol=1e-5)
+        assert np.allclose(B[0, :, k], numeric_B, atol=1e-5)
+
+
+def test_loop_closure_corrects_drift():
+    """Test optimization of the scene's 11-node loop reduces the objective."""
+    graph, truth = make_loop_graph(11, num_loop_closures=1)
+    history = optimize(graph)
+    assert total_error(graph, history[-1]) < 0.01 * total_error(graph, history[0])
+    drift = np.linalg.norm(history[0][-1, :2] - truth[-1, :2])
+    assert np.linalg.norm(history[-1][-1, :2] - truth[-1, :2]) < drift
+
+
+def test_hessian_structure():
+    """Test odometry gives a block-tridiagonal Hessian and loop closures widen it."""
+    graph, _ = make_loop_graph(50, laps=2)
+    H, b = assemble_hessian(graph)
+    assert H.shape == (150, 150) and b.shape == (150,)
+    assert bandwidth(H) == 5
+    graph, _ = make_loop_graph(50, laps=2, num_loop_closures=10)
+    H_closed, _ = assemble_hessian(graph)
+    assert bandwidth(H_closed) > bandwidth(H)
+    assert abs(H_closed - H_closed.T).max() < 1e-6
+
+
+def test_reordering_reduces_bandwidth():
+    """Test reverse Cuthill-McKee narrows the band after loop closure."""
+    graph, _ = make_loop_graph(300, laps=3, num_loop_closures=40)
+    H, _ = assemble_hessian(graph)
+    perm, H_reordered = reorder(H)
+    assert sorted(perm) == list(range(H.shape[0]))
+    assert bandwidth(H_reordered) < bandwidth(H)
+    assert H_reordered.nnz == H.nnz
+
+
+def test_sparsity_image_is_cheap_for_large_patterns():
+    """Test a 30k x 30k pattern rasterizes to a small image quickly."""
+    graph, _ = make_loop_graph(10_000, laps=10, num_loop_closures=1000)
+    H, _ = assemble_hessian(graph)
+    start = time.perf_counter()
+    image = sparsity_image(H, resolution=256)
+    assert time.perf_counter() - start < 1.0
+    assert image.shape == (256, 256) and image.dtype == np.uint8
+    assert image[np.arange(256), np.arange(256)].all()
+
+
+def test_sparsity_image_small_matrix():
+    """Test small matrices map one entry per pixel."""
+    image = sparsity_image(sp.eye(4, format="csr"), resolution=512)
+    assert image.shape == (4, 4)
+    assert np.array_equal(image > 0, np.eye(4, dtype=bool))
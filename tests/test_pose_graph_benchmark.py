@@ -0,0 +1,59 @@
+"""
+Scalability gate for the large-scale pose graph scene.
+
+Solve, geometry build and single-frame render times are measured at several
+graph sizes and asserted against ``TARGETS`` (seconds). The 50k case is marked
+slow; run it with ``pytest -m slow``.
+"""
+
+import time
+
+import pytest
+
+from pose_graph import make_loop_graph, optimize
+
+TARGETS = {
+    1_000: {"solve": 1.0, "build": 0.5, "render": 2.0},
+    10_000: {"solve": 6.0, "build": 2.0, "render": 5.0},
+    50_000: {"solve": 20.0, "build": 8.0, "render": 15.0},
+}
+SIZES = [1_000, 10_000, pytest.param(50_000, marks=pytest.mark.slow)]
+# Solver settings of LargePoseGraphOptimization
+ITERATIONS, TOLERANCE = 15, 1e-6
+
+
+def make_graph(num_nodes):
+    return make_loop_graph(num_nodes, laps=10, num_loop_closures=num_nodes // 10)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+@pytest.mark.parametrize("num_nodes", SIZES)
+def test_solve_time(num_nodes):
+    """Test the Gauss-Newton solve stays within its time budget and converges."""
+    graph, _ = make_graph(num_nodes)
+    history, elapsed = timed(optimize, graph, ITERATIONS, TOLERANCE)
+    assert elapsed < TARGETS[num_nodes]["solve"]
+    assert len(history) < 16
+
+
+@pytest.mark.parametrize("num_nodes", SIZES)
+def test_geometry_build_and_render_time(num_nodes):
+    """Test building the scene geometry and rendering one frame stay within budget."""
+    manim = pytest.importorskip("manim")
+    from pose_graph_optimization_visualization import build_graph_geometry
+
+    graph, _ = make_graph(num_nodes)
+    (trajectory, loop_edges), build_time = timed(
+        build_graph_geometry, graph.poses, graph.edge_from, graph.edge_to, 0.1
+    )
+    assert build_time < TARGETS[num_nodes]["build"]
+
+    with manim.tempconfig({"quality": "low_quality"}):
+        camera = manim.Camera()
+        _, render_time = timed(camera.capture_mobjects, [trajectory, loop_edges])
+    assert render_time < TARGETS[num_nodes]["render"]
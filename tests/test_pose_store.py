@@ -0,0 +1,81 @@
+"""
+Tests for the compact pose store and the SE(3) kernels that consume it.
+"""
+
+import numpy as np
+import pytest
+from scipy.spatial.transform import Rotation as R
+
+from lie_groups import relative_pose, se3_exp, se3_inverse, se3_log, so3_exp, so3_log, transform_points
+from pose_store import PoseStore, as_pose_matrices
+
+
+def random_matrices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    mats = np.tile(np.eye(4), (n, 1, 1))
+    mats[:, :3, :3] = R.random(n, random_state=seed).as_matrix()
+    mats[:, :3, 3] = rng.normal(size=(n, 3))
+    return mats
+
+
+def test_round_trip_matrices():
+    """Test PoseStore reproduces the matrices it was built from."""
+    mats = random_matrices(50)
+    store = PoseStore.from_matrices(mats, dtype=np.float64)
+    assert np.allclose(store.as_matrices(), mats)
+
+
+def test_views_are_zero_copy():
+    """Test positions and rotations write through to the store."""
+    store = PoseStore.empty(4)
+    assert np.shares_memory(store.positions, store.data)
+    assert np.shares_memory(store.rotations, store.data)
+    store.positions[2] = [1, 2, 3]
+    assert np.allclose(store.as_matrices()[2, :3, 3], [1, 2, 3])
+
+
+def test_memory_per_pose():
+    """Test the compact layout uses less than half of a 4x4 float64 matrix."""
+    n = 1000
+    assert PoseStore.empty(n, np.float64).nbytes < np.zeros((n, 4, 4)).nbytes / 2
+    assert PoseStore.empty(n).nbytes == n * 7 * 4
+
+
+def test_memmap_persistence(tmp_path):
+    """Test save/load goes through a memory map."""
+    store = PoseStore.from_matrices(random_matrices(20))
+    path = tmp_path / "trajectory.npy"
+    store.save(path)
+    loaded = PoseStore.load(path)
+    assert isinstance(loaded.data, np.memmap)
+    assert np.array_equal(loaded.data, store.data)
+
+
+def test_kernels_accept_store():
+    """Test kernels give the same result for a PoseStore and 4x4 matrices."""
+    mats = random_matrices(10)
+    store = PoseStore.from_matrices(mats, dtype=np.float64)
+    assert np.allclose(relative_pose(store[:5], store[5:]), np.linalg.inv(mats[:5]) @ mats[5:])
+    assert np.allclose(se3_inverse(store), np.linalg.inv(mats))
+    points = np.ones((10, 3))
+    assert np.allclose(transform_points(store, points), transform_points(mats, points))
+
+
+def test_as_pose_matrices_rejects_bad_shape():
+    """Test pose coercion rejects non-4x4 input."""
+    with pytest.raises(ValueError):
+        as_pose_matrices(np.zeros((3, 3)))
+
+
+def test_so3_exp_log():
+    """Test so3_exp matches scipy and so3_log inverts it."""
+    rotvecs = R.random(100, random_state=1).as_rotvec()
+    assert np.allclose(so3_exp(rotvecs), R.from_rotvec(rotvecs).as_matrix())
+    assert np.allclose(so3_log(so3_exp(rotvecs)), rotvecs)
+    assert np.allclose(so3_exp(np.zeros(3)), np.eye(3))
+
+
+def test_se3_exp_log():
+    """Test se3_log inverts se3_exp, including the twist from SE3ExponentialMap."""
+    twists = np.vstack([[0.5, 0.5, 2.0, 0, 0, np.pi / 2], np.random.default_rng(2).normal(size=(20, 6)) * 0.5])
+    assert np.allclose(se3_log(se3_exp(twists)), twists)
@@ -0,0 +1,190 @@
+"""
+Tests for the render-cost estimator.
+"""
+
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+import render_cost
+from config import PROFILE_ENV_VAR, get_profile, scale_resolution
+from render_cost import (
+    MIN_TIMEOUT, RECENT_RENDERS, TIMEOUT_FACTOR, TIMEOUT_SLACK, CostModel, SceneCost, estimate, get_target,
+    load_costs, longest_first, measure_cost, record_timing, render_history, save_costs, static_cost,
+    store_measurement,
+)
+from scene_registry import discover_scenes, scenes_in
+
+DEMO_SCENE = textwrap.dedent('''
+    class CostDemo(ProfiledScene, ThreeDScene):
+        def construct(self):
+            spheres = [Sphere(resolution=(8, 8)) for _ in range(2)]
+            for k in range(3):
+                self.play(Rotate(spheres[0]), run_time=2)
+            self.play(Create(Cube(), run_time=1.5))
+            self.wait()
+            self.wait(0.5)
+            self.helper()
+
+        def helper(self):
+            for point in [1, 2]:
+                self.play(FadeIn(Dot()))
+            self.helper()
+''')
+
+
+@pytest.fixture
+def demo_entry(tmp_path):
+    path = tmp_path / "cost_demo.py"
+    path.write_text(DEMO_SCENE)
+    return scenes_in(path)[0]
+
+
+def test_static_cost_counts_loops_helpers_and_surfaces(demo_entry):
+    """Test plays, run time and faces are weighted by literal loop counts."""
+    cost = static_cost(demo_entry)
+    assert (cost.plays, cost.waits) == (6, 2)
+    # 3 x 2s, 1.5s from the animation's run_time, 1s + 0.5s waits, 2 x 1s in the helper
+    assert cost.run_time == pytest.approx(11.0)
+    assert cost.frames == pytest.approx(11.0 * get_target(None).frame_rate)
+    assert cost.surfaces == {"Sphere": 2, "Cube": 1}
+    assert cost.face_frames == pytest.approx((2 * 64 + 6) * cost.frames)
+
+
+def test_static_cost_follows_profile(demo_entry):
+    """Test the draft profile shortens the video and coarsens the meshes."""
+    final, draft = static_cost(demo_entry, "final"), static_cost(demo_entry, "draft")
+    assert draft.run_time == pytest.approx(final.run_time / 4)
+    assert draft.frames < final.frames / 4
+    assert draft.face_frames < final.face_frames
+
+
+def test_fit_recovers_coefficients():
+    """Test calibration recovers the coefficients behind synthetic timings."""
+    truth = CostModel(overhead=5.0, per_frame=0.02, per_megapixel_frame=0.1, per_face_frame=2e-5)
+    rng = np.random.default_rng(0)
+    timings = []
+    for _ in range(12):
+        frames = rng.uniform(100, 2000)
+        cost = SceneCost("s", "low", frames=frames, pixel_frames=frames * 0.4, face_frames=frames * rng.uniform(0, 5e4))
+        timings.append({**cost.__dict__, "seconds": truth.predict(cost)})
+    fitted = CostModel.fit(timings)
+    probe = SceneCost("p", "low", frames=900, pixel_frames=360, face_frames=9e6)
+    assert fitted.predict(probe) == pytest.approx(truth.predict(probe), rel=1e-3)
+
+
+def test_fit_with_few_samples_rescales_defaults():
+    """Test a couple of renders only rescale the default model."""
+    cost = SceneCost("s", "low", frames=300, pixel_frames=120)
+    timings = [{**cost.__dict__, "seconds": 2 * CostModel().predict(cost)}]
+    assert CostModel.fit(timings).predict(cost) == pytest.approx(2 * CostModel().predict(cost))
+    assert CostModel().timeout(SceneCost("tiny", "low")) == MIN_TIMEOUT
+
+
+def test_timeout_follows_the_scenes_own_renders(tmp_path):
+    """Test a scene the model underestimates gets its timeout from its recent render times."""
+    data = load_costs(tmp_path / "costs.json")
+    slow, other = SceneCost("slow", "low", frames=300), SceneCost("other", "low", frames=300)
+    for seconds in [1000.0] * RECENT_RENDERS + [200.0, 300.0]:
+        record_timing(data, slow, seconds)
+    record_timing(data, other, 5000.0)
+    history = render_history(data, slow)
+    assert len(history) == RECENT_RENDERS and sorted(history)[RECENT_RENDERS // 2] == 1000.0
+    assert CostModel().timeout(slow, history) == TIMEOUT_FACTOR * 1000.0 + TIMEOUT_SLACK
+    assert CostModel().timeout(slow, [0.1]) == CostModel().timeout(slow)
+
+
+def test_measurements_are_preferred(demo_entry, tmp_path):
+    """Test a stored dry-run measurement wins, flagged stale once the scene source changes."""
+    costs_file = tmp_path / "costs.json"
+    data = load_costs(costs_file)
+    measured = static_cost(demo_entry)
+    measured.source, measured.run_time = "dry_run", 42.0
+    store_measurement(data, measured)
+    record_timing(data, measured, 12.5)
+    save_costs(data, costs_file)
+
+    data = load_costs(costs_file)
+    assert data["timings"][0]["seconds"] == 12.5
+    assert estimate(demo_entry, None, data).run_time == 42.0
+    demo_entry.path.write_text(DEMO_SCENE + "\n# edited\n")
+    stale = estimate(demo_entry, None, data)
+    assert stale.run_time == 42.0 and stale.source == "dry_run (stale)"
+    assert estimate(demo_entry, "draft", data).source == "static"
+
+
+def test_loop_bounds_follow_local_constants_and_flags(tmp_path):
+    """Test loops over named constants and ifs on flags passed to helpers are counted."""
+    path = tmp_path / "loops.py"
+    path.write_text(textwrap.dedent('''
+        class Loops(Scene):
+            repeats = 2
+
+            def construct(self):
+                self.walk(animate=False)
+                self.walk(animate=True)
+
+            def walk(self, animate):
+                num_steps = 10
+                for i in range(1, num_steps + 1):
+                    self.play(Dot().animate.shift(UP), run_time=0.1)
+                    if animate:
+                        for _ in range(self.repeats):
+                            self.play(Flash(Dot()))
+                    elif i % 2:
+                        self.wait()
+                    else:
+                        self.play(FadeIn(Dot()))
+                        self.play(FadeOut(Dot()))
+    '''))
+    cost = static_cost(scenes_in(path)[0])
+    # 20 moves; the flagged walk flashes twice per step, the other plays its busier branch
+    assert (cost.plays, cost.waits) == (20 + 20 + 20, 0)
+    assert cost.run_time == pytest.approx(2.0 + 20 + 20)
+
+
+def test_longest_first_orders_published_scenes():
+    """Test the published scenes are scheduled by descending predicted time."""
+    entries = [entry for entry in discover_scenes() if entry.published]
+    model = CostModel()
+    costs = {entry.name: static_cost(entry, "preview") for entry in entries}
+    ordered = [model.predict(costs[entry.name]) for entry in longest_first(entries, costs, model)]
+    assert ordered == sorted(ordered, reverse=True)
+    # The sphere-heavy 3D scenes cost more than the flat 2D ones
+    assert ordered[0] > model.predict(costs["SLAMKeyframesVisualization"])
+    # Two walks of 100 steps; the keyframe walk plays twice per step
+    assert costs["SLAMKeyframesVisualization"].plays >= 300
+
+
+def test_measure_cli_selects_the_profile_in_process(monkeypatch, tmp_path):
+    """Test --profile reaches the scenes measured in this process, though config was imported first."""
+    # Recorded so the variable the CLI sets is removed again afterwards
+    monkeypatch.setenv(PROFILE_ENV_VAR, "final")
+    seen = []
+
+    def fake_measure(entry, profile):
+        seen.append((get_profile().name, scale_resolution(32)))
+        return SceneCost(entry.name, profile, source="dry_run")
+
+    monkeypatch.setattr(render_cost, "measure_cost", fake_measure)
+    argv = ["render_cost.py", "SE3RelativePose", "--measure", "--profile", "draft", "--costs", str(tmp_path / "costs.json")]
+    monkeypatch.setattr(sys, "argv", argv)
+    render_cost.main()
+    assert seen == [("draft", 8)]
+
+
+def test_surfaces_a_play_adds_count_for_that_play(tmp_path):
+    """Test a sphere faded in by the only play counts towards that play's faces."""
+    pytest.importorskip("manim")
+    path = tmp_path / "fade_demo.py"
+    path.write_text(textwrap.dedent('''
+        from manim import FadeIn, Sphere, ThreeDScene
+
+        class FadeDemo(ThreeDScene):
+            def construct(self):
+                self.play(FadeIn(Sphere(resolution=(4, 4))), run_time=2)
+    '''))
+    cost = measure_cost(scenes_in(path)[0])
+    assert cost.plays == 1 and cost.surfaces["Sphere"] == 1 and cost.face_frames > 0
@@ -0,0 +1,122 @@
+"""
+Tests for the asynchronous render orchestrator.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import textwrap
+import time
+
+import pytest
+
+from render_orchestrator import ProgressBoard, RenderJob, RenderOrchestrator, parse_progress
+
+# Prints manim-style progress bars for 2 plays, like tqdm redrawing with \r
+FAKE_RENDER = textwrap.dedent("""
+    import sys, time
+    for play in range(2):
+        for percent in (0, 50, 100):
+            sys.stderr.write(f"\\rAnimation {play}: Create(Circle):{percent:4d}%|##| 1/2 [00:00<00:00]")
+            sys.stderr.flush()
+            time.sleep(0.01)
+        sys.stderr.write("\\n")
+    print("rendered 1/1 sections")
+""")
+
+
+def python(code, name="job", timeout=10.0, **kwargs):
+    return RenderJob(name, [sys.executable, "-c", code], timeout, **kwargs)
+
+
+def quiet_board():
+    return ProgressBoard(io.StringIO())
+
+
+def assert_exits(pid, timeout=5.0):
+    """Wait for ``pid`` to be gone; a killed process nobody reaped yet (a zombie) counts as gone."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+            with open(f"/proc/{pid}/stat") as stat:
+                if stat.read().rsplit(")", 1)[1].split()[0] == "Z":
+                    return
+        except (ProcessLookupError, FileNotFoundError):
+            return
+        time.sleep(0.05)
+    raise AssertionError(f"process {pid} is still running")
+
+
+def test_progress_lines():
+    """Test play numbers and percentages become a fraction of the scene's plays."""
+    assert parse_progress("Animation 1: Create(Circle):  50%|#####     | 15/30", plays=4) == pytest.approx(0.375)
+    assert parse_progress("Waiting 3:  100%|##########| 30/30", plays=4) == 1.0
+    assert parse_progress("Rendering SE3RelativePose", plays=4) is None
+    assert parse_progress("Animation 1: Create(Circle):  50%|", plays=0) is None
+
+
+def test_progress_is_streamed_while_rendering():
+    """Test progress arrives during the render and output is still collected."""
+    board = quiet_board()
+    updates = []
+    board.update = lambda name, fraction: updates.append((name, fraction))
+    orchestrator = RenderOrchestrator(board=board)
+    results = asyncio.run(orchestrator.run([python(FAKE_RENDER, "Demo", plays=2)]))
+    assert results["Demo"].ok and "rendered 1/1 sections" in results["Demo"].stdout
+    fractions = [fraction for _, fraction in updates]
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0 and len(fractions) >= 4
+
+
+def test_concurrency_is_bounded():
+    """Test no more than ``concurrency`` renders run at once."""
+    code = "import time; time.sleep(0.2)"
+    orchestrator = RenderOrchestrator(concurrency=2, board=quiet_board())
+    start = time.perf_counter()
+    results = asyncio.run(orchestrator.run([python(code, f"job{k}") for k in range(4)]))
+    elapsed = time.perf_counter() - start
+    assert all(result.ok for result in results.values())
+    assert 0.4 <= elapsed < 0.8
+
+
+def test_timeout_kills_the_process_group_and_retries(tmp_path):
+    """Test a hanging render and its children are killed, then retried."""
+    pid_file = tmp_path / "child.pid"
+    code = textwrap.dedent(f"""
+        import subprocess, sys, pathlib
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        pathlib.Path({str(pid_file)!r}).write_text(str(child.pid))
+        child.wait()
+    """)
+    attempts = []
+    orchestrator = RenderOrchestrator(retries=1, board=quiet_board())
+    results = asyncio.run(orchestrator.run([python(code, timeout=1.0)], on_attempt=attempts.append))
+    assert [a.timed_out for a in attempts] == [True, True] and results["job"].attempts == 2
+    assert_exits(int(pid_file.read_text()))
+
+
+def test_cancellation_stops_running_renders(tmp_path):
+    """Test cancelling the orchestrator terminates its renders."""
+    pid_file = tmp_path / "render.pid"
+    code = f"import os, pathlib, time; pathlib.Path({str(pid_file)!r}).write_text(str(os.getpid())); time.sleep(60)"
+
+    async def cancel_soon():
+        task = asyncio.ensure_future(RenderOrchestrator(board=quiet_board()).run([python(code, timeout=60)]))
+        while not (pid_file.exists() and pid_file.read_text()):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_soon())
+    assert_exits(int(pid_file.read_text()))
+
+
+def test_log_progress_is_coarse():
+    """Test a log only gets a line per quarter of each scene."""
+    stream = io.StringIO()
+    board = ProgressBoard(stream)
+    for fraction in (0.1, 0.2, 0.3, 0.6, 0.7, 1.0):
+        board.update("Demo", fraction)
+    assert stream.getvalue().splitlines() == ["⏳ Demo: 30%", "⏳ Demo: 60%", "⏳ Demo: 100%"]
@@ -0,0 +1,111 @@
+"""
+Tests for the render farm queue, leases and video store.
+"""
+
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from render_queue import RenderQueue, VideoStore, process_job, work
+
+
+def fake_render(job, output, lease_lost):
+    """Stands in for sections.py: a video made of the scene name, logged per render."""
+    time.sleep(float(job.params.get("SECONDS", "0")))
+    if job.params.get("FAIL"):
+        raise RuntimeError("manim crashed")
+    with open(Path(job.params["LOG"]), "a") as log:
+        log.write(f"{job.scene}\n")
+    output.write_bytes(job.scene.encode())
+
+
+def run_worker(queue_path, store_path, name):
+    work(RenderQueue(queue_path), VideoStore(store_path), name, fake_render, lease=5.0, poll=0.05, until_empty=True)
+
+
+@pytest.fixture
+def farm(tmp_path):
+    return RenderQueue(tmp_path / "queue.db"), VideoStore(tmp_path / "store"), tmp_path / "renders.log"
+
+
+def test_enqueue_is_idempotent_per_cache_key(farm):
+    """Test the same render queued twice is one job, and claims go oldest first."""
+    queue, _, log = farm
+    first = queue.enqueue("A", "draft", {"LOG": str(log)}, "key-a")
+    assert queue.enqueue("A", "draft", {"LOG": str(log)}, "key-a").id == first.id
+    queue.enqueue("B", "draft", {"LOG": str(log)}, "key-b")
+    assert [queue.claim("w1").scene, queue.claim("w2").scene, queue.claim("w3")] == ["A", "B", None]
+
+
+def test_expired_lease_is_taken_over(farm):
+    """Test a job whose worker stopped renewing goes to the next worker, and the first loses it."""
+    queue, _, log = farm
+    queue.enqueue("A", None, {"LOG": str(log)}, "key-a")
+    stalled = queue.claim("w1", lease=0.05)
+    assert queue.claim("w2") is None
+    time.sleep(0.1)
+    taken = queue.claim("w2")
+    assert taken.worker == "w2" and taken.attempts == 2
+    assert not queue.renew(stalled, "w1") and not queue.complete(stalled, "w1")
+    assert queue.complete(taken, "w2")
+
+
+def test_failures_are_retried_then_marked_failed(farm):
+    """Test a failing render is queued again until it used its attempts."""
+    queue, store, log = farm
+    queue.enqueue("A", None, {"LOG": str(log), "FAIL": "1"}, "key-a")
+    for _ in range(queue.max_attempts):
+        assert not process_job(queue, store, queue.claim("w1"), "w1", fake_render)
+    (job,) = queue.jobs()
+    assert job.status == "failed" and "manim crashed" in job.error and queue.claim("w1") is None
+    assert queue.enqueue("A", None, job.params, "key-a").status == "queued"
+
+
+def test_render_past_its_timeout_is_stopped_and_fails(farm):
+    """Test a hung render is not kept leased: its timeout stops it and counts as a failed attempt."""
+    _, store, log = farm
+    queue = RenderQueue(store.root.parent / "once.db", max_attempts=1)
+    queue.enqueue("A", None, {"LOG": str(log), "SECONDS": "0.5"}, "key-a", timeout=0.1)
+    queue.enqueue("B", None, {"LOG": str(log), "SECONDS": "0.5"}, "key-b")
+    stops = []
+    render = lambda job, output, stop: (fake_render(job, output, stop), stops.append(stop.is_set()))
+    # A's own timeout, then the worker's for B
+    for _ in range(2):
+        assert not process_job(queue, store, queue.claim("w1"), "w1", render, lease=5.0, timeout=0.2)
+    a, b = queue.jobs()
+    assert stops == [True, True] and not store.has("key-a") and not store.has("key-b")
+    assert (a.status, a.error, a.timeout) == ("failed", "render timed out after 0.1s", 0.1)
+    assert (b.status, b.error, b.timeout) == ("failed", "render timed out after 0.2s", None)
+
+
+def test_stored_videos_are_not_rendered_again(farm):
+    """Test a job whose cache key is already in the store completes without rendering."""
+    queue, store, log = farm
+    queue.enqueue("A", None, {"LOG": str(log)}, "key-a")
+    assert process_job(queue, store, queue.claim("w1"), "w1", fake_render)
+    assert store.path("key-a").read_bytes() == b"A"
+    queue.retry("key-a")
+    assert process_job(queue, store, queue.claim("w1"), "w1", fake_render)
+    assert log.read_text() == "A\n"
+
+
+def test_workers_share_the_queue(farm):
+    """Test several worker processes render every job exactly once."""
+    queue, store, log = farm
+    scenes = [f"Scene{k}" for k in range(8)]
+    for scene in scenes:
+        queue.enqueue(scene, "draft", {"LOG": str(log), "SECONDS": "0.3"}, f"key-{scene}")
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=run_worker, args=(queue.path, store.root, f"w{k}")) for k in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+    assert queue.counts()["done"] == len(scenes)
+    assert sorted(log.read_text().split()) == scenes
+    assert all(store.path(f"key-{scene}").read_bytes() == scene.encode() for scene in scenes)
+    assert len({job.worker for job in queue.jobs()}) > 1
@@ -0,0 +1,77 @@
+"""
+Tests for the AST-based scene registry.
+"""
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from scene_registry import PROJECT_ROOT, discover_scenes, filter_scenes, find_scene, scene_modules, scenes_in
+
+DEMO_SCENES = textwrap.dedent('''
+    from manim import *
+
+    class Helper:
+        pass
+
+    class FlatDemo(ProfiledScene, Scene):
+        """A flat scene."""
+        metadata = {"title": "Flat", "complexity": "Beginner"}
+
+    class SpaceDemo(manim.ThreeDScene):
+        pass
+''')
+
+
+def test_scenes_in_reads_classes_and_metadata(tmp_path):
+    """Test scene classes and their literal metadata are parsed from source."""
+    path = tmp_path / "demo_scenes.py"
+    path.write_text(DEMO_SCENES)
+    flat, space = scenes_in(path)
+    assert (flat.name, flat.lineno, flat.bases) == ("FlatDemo", 7, ("ProfiledScene", "Scene"))
+    assert flat.metadata == {"title": "Flat", "complexity": "Beginner"} and flat.published
+    assert flat.docstring == "A flat scene."
+    assert space.is_3d and not space.published
+
+
+def test_scenes_in_rejects_computed_metadata(tmp_path):
+    """Test metadata that is not a literal is reported rather than ignored."""
+    path = tmp_path / "bad_scenes.py"
+    path.write_text("class Bad(Scene):\n    metadata = dict(title=TITLE)\n")
+    with pytest.raises(ValueError, match="Bad.metadata"):
+        scenes_in(path)
+
+
+def test_discovery_does_not_import_manim():
+    """Test the project's scenes are listed without importing their modules."""
+    code = "import sys, scene_registry; scene_registry.discover_scenes(); print('manim' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+    entries = discover_scenes()
+    names = {entry.name for entry in entries}
+    assert {"SE3RelativePose", "PoseGraphSparsity", "LargePoseGraphOptimization"} <= names
+    published = filter_scenes(entries, published=True)
+    assert len(published) == 12
+    assert all({"title", "description", "complexity", "icon", "order"} <= set(e.metadata) for e in published)
+
+
+def test_filters_and_lookup():
+    """Test filtering by dimension and complexity, and lookup by name."""
+    entries = discover_scenes()
+    beginner = filter_scenes(entries, complexity="Beginner")
+    assert [entry.name for entry in beginner] == ["SO3RotationVisualization"]
+    assert all(entry.is_3d for entry in filter_scenes(entries, three_d=True))
+    assert find_scene("SE3ExponentialMap").path.name == "se3_exponential_map.py"
+    with pytest.raises(KeyError):
+        find_scene("NoSuchScene")
+
+
+def test_scene_modules_only_lists_scene_files():
+    """Test discovery finds scene modules and skips kernels and config."""
+    names = {path.name for path in scene_modules()}
+    assert "se3_exponential_map.py" in names
+    assert "pose_graph_optimization_visualization.py" in names
+    assert "pose_graph.py" not in names
+    assert "config.py" not in names
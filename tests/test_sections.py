@@ -0,0 +1,216 @@
+"""
+Tests for section-level caching: section code keys, state digests and the cache.
+"""
+
+import shutil
+import sys
+import textwrap
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import sections
+from config import PROFILE_ENV_VAR, scale_resolution
+from scene_registry import find_scene, scenes_in
+from sections import (
+    FIRST_SECTION, Section, concat_videos, missing_sections, plan_sections, prune_cache, render_parallel,
+    section_sources, state_digest,
+)
+
+DEMO_SCENE = textwrap.dedent('''
+    from demo_helpers import offset
+
+    def make_dot():
+        return Dot()
+
+    class SectionDemo(ProfiledScene, Scene):
+        """Two acts."""
+        metadata = {"title": "Demo"}
+        speed = 1.0
+
+        def construct(self):
+            title = Text("Demo")
+            self.play(Write(title))
+            self.next_section("first")
+            self.intro()
+            self.next_section("second")
+            self.play(FadeIn(make_dot()))
+
+        def intro(self):
+            self.play(Create(Circle()))
+''')
+
+
+def sources(tmp_path, source=DEMO_SCENE):
+    path = tmp_path / "section_demo.py"
+    path.write_text(source)
+    return dict(section_sources(scenes_in(path)[0], root=tmp_path))
+
+
+@pytest.fixture
+def demo(tmp_path):
+    (tmp_path / "demo_helpers.py").write_text("offset = 1\n")
+    return sources(tmp_path)
+
+
+def test_sections_split_at_next_section_calls(demo):
+    """Test the statements before the first call form manim's autocreated section."""
+    assert list(demo) == [FIRST_SECTION, "first", "second"]
+
+
+def test_editing_a_section_only_changes_its_key(tmp_path, demo):
+    """Test an edit to one act leaves the code keys of the other acts alone."""
+    edited = sources(tmp_path, DEMO_SCENE.replace("FadeIn(make_dot())", "FadeIn(make_dot(), run_time=2)"))
+    assert [edited[name] == demo[name] for name in demo] == [True, True, False]
+
+
+def test_helpers_belong_to_the_sections_using_them(tmp_path, demo):
+    """Test edits to a method or module function only affect the sections calling it."""
+    method = sources(tmp_path, DEMO_SCENE.replace("Create(Circle())", "Create(Square())"))
+    assert [method[name] == demo[name] for name in demo] == [True, False, True]
+    function = sources(tmp_path, DEMO_SCENE.replace("return Dot()", "return Dot(radius=0.2)"))
+    assert [function[name] == demo[name] for name in demo] == [True, True, False]
+
+
+def test_shared_code_changes_every_section(tmp_path, demo):
+    """Test class attributes and imported project modules key every section."""
+    attribute = sources(tmp_path, DEMO_SCENE.replace("speed = 1.0", "speed = 2.0"))
+    assert all(attribute[name] != demo[name] for name in demo)
+    (tmp_path / "demo_helpers.py").write_text("offset = 2\n")
+    assert all(key != demo[name] for name, key in sources(tmp_path).items())
+
+
+def test_comments_docstrings_and_metadata_do_not_count(tmp_path, demo):
+    """Test edits that cannot change a frame keep every key."""
+    edited = DEMO_SCENE.replace('"""Two acts."""', '"""Two acts, documented."""')
+    edited = edited.replace('"title": "Demo"', '"title": "Renamed"')
+    edited = edited.replace("self.intro()", "self.intro()  # the circle")
+    assert sources(tmp_path, edited) == demo
+
+
+def test_section_names_must_be_literals(tmp_path):
+    """Test a computed section name is rejected."""
+    with pytest.raises(ValueError, match="string literals"):
+        sources(tmp_path, DEMO_SCENE.replace('"second"', 'f"second"'))
+
+
+def test_state_digest_is_stable_and_id_free():
+    """Test equal values digest equally however they were built."""
+    state = {"poses": [np.eye(4), np.zeros(3)], "count": 3, "info": {"b": 1.0, "a": "x"}}
+    rebuilt = {"info": {"a": "x", "b": 1.0}, "count": 3, "poses": [np.eye(4), np.zeros(3)]}
+    assert state_digest(state) == state_digest(rebuilt)
+    rebuilt["poses"][1][2] = 1e-9
+    assert state_digest(state) != state_digest(rebuilt)
+    cyclic = []
+    cyclic.append(cyclic)
+    assert state_digest({"cycle": cyclic}) == state_digest({"cycle": cyclic})
+
+
+def test_cache_lookup_and_pruning(tmp_path):
+    """Test only sections with plays and no cached video are missing, and stale videos are pruned."""
+    sections = [
+        Section("Demo", "low", 0, FIRST_SECTION, 0, "aaaa"),
+        Section("Demo", "low", 1, "first", 2, "bbbb"),
+        Section("Demo", "low", 2, "second", 1, "cccc"),
+    ]
+    (tmp_path / sections[1].filename).write_bytes(b"cached")
+    stale = tmp_path / "Demo.low.02.dddd.mp4"
+    other_target = tmp_path / "Demo.final.02.eeee.mp4"
+    stale.write_bytes(b"old")
+    other_target.write_bytes(b"final")
+    assert missing_sections(sections, tmp_path) == [sections[2]]
+    assert prune_cache(sections, tmp_path) == [stale]
+    assert other_target.exists() and (tmp_path / sections[1].filename).exists()
+
+
+def fake_render(entry, index, profile, video_dir):
+    """Stands in for render_sections in the child: logs the section and writes its video into ``video_dir``."""
+    with open(Path(video_dir).parent / "renders.log", "a") as log:
+        log.write(f"{index}\n")
+    if index == 3:
+        return None
+    video_dir.mkdir(parents=True)
+    video = video_dir / f"{entry.name}.{index}.{profile}.mp4"
+    video.write_bytes(str(video_dir).encode())
+    return str(video)
+
+
+def test_parallel_sections_run_most_plays_first_in_their_own_directories(tmp_path):
+    """Test sections are started by descending plays, each rendering into its own video directory."""
+    path = tmp_path / "section_demo.py"
+    path.write_text(DEMO_SCENE)
+    entry = scenes_in(path)[0]
+    sections = [Section(entry.name, "draft", index, f"act{index}", plays, "key") for index, plays in [(1, 2), (2, 9), (3, 5), (4, 7)]]
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    videos = render_parallel(entry, sections, "draft", jobs=1, work_dir=work_dir, render=fake_render)
+    assert (work_dir / "renders.log").read_text().split() == ["2", "4", "3", "1"]
+    assert sorted(videos) == [1, 2, 4]
+    for index, video in videos.items():
+        assert video.parent == work_dir / f"SectionDemo.{index:02d}" and video.read_text() == str(video.parent)
+
+
+def test_concat_needs_videos(tmp_path):
+    """Test stitching nothing is an error."""
+    with pytest.raises(ValueError):
+        concat_videos([], tmp_path / "out.mp4")
+
+
+def test_multi_act_scenes_have_sections():
+    """Test the long scenes are split into their acts."""
+    names = [name for name, _ in section_sources(find_scene("PoseGraphOptimization"))]
+    assert names == [FIRST_SECTION, "drift", "loop_closure", "optimization"]
+    names = [name for name, _ in section_sources(find_scene("SO3CompositionVsAddition"))]
+    assert names == [FIRST_SECTION, "large_rotations", "small_rotations"]
+
+
+def test_section_plan_is_reproducible():
+    """Test two headless replays give the same section keys."""
+    pytest.importorskip("manim")
+    entry = find_scene("PoseGraphOptimization")
+    first, second = plan_sections(entry), plan_sections(entry)
+    assert first == second
+    assert [s.plays > 0 for s in first] == [False, True, True, True]
+
+
+def test_section_keys_follow_the_params():
+    """Test a render with other parameters does not reuse the cached sections."""
+    pytest.importorskip("manim")
+    entry = find_scene("PoseGraphOptimization")
+    plain, swept = plan_sections(entry), plan_sections(entry, params={"SLAM_POSE_GRAPH_NODES": "1000"})
+    assert not {s.key for s in plain} & {s.key for s in swept}
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_concat_copies_streams(tmp_path):
+    """Test two clips are joined into one video."""
+    import subprocess
+
+    clips = []
+    for k in range(2):
+        clip = tmp_path / f"clip{k}.mp4"
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", "color=c=black:s=64x36:d=0.5", str(clip)],
+            check=True,
+        )
+        clips.append(clip)
+    output = concat_videos(clips, tmp_path / "joined.mp4")
+    assert output.stat().st_size > 0
+    assert not (tmp_path / "joined.concat.txt").exists()
+
+
+def test_cli_renders_with_the_selected_profile(monkeypatch, tmp_path):
+    """Test --profile is the profile the serial render uses, not the one active when config was imported."""
+    monkeypatch.setenv(PROFILE_ENV_VAR, "final")
+    rendered = []
+
+    def fake_build(entry, output, profile, *args):
+        rendered.append((profile, scale_resolution(32)))
+        return output, [], []
+
+    monkeypatch.setattr(sections, "build_scene", fake_build)
+    monkeypatch.setattr(sys, "argv", ["sections.py", "SE3RelativePose", "--profile", "draft", "--output", str(tmp_path / "out.mp4")])
+    with pytest.raises(SystemExit) as exit_info:
+        sections.main()
+    assert exit_info.value.code == 0 and rendered == [("draft", 8)]
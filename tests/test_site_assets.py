@@ -0,0 +1,76 @@
+"""
+Tests for fingerprinting and precompressing the website's assets.
+"""
+
+import gzip
+import json
+
+from site_assets import MANIFEST_FILE, build_site, fingerprinted, logical_name, precompress, rewrite_references
+
+PAGE = """<link rel="stylesheet" href="styles.css">
+<link href="https://fonts.googleapis.com/css2?family=Inter" rel="stylesheet">
+<a href="#animations">Animations</a>
+<video poster="previews/Demo-poster.jpg"><source src="previews/Demo.mp4" type="video/mp4"></video>
+<script src="script.js"></script>
+"""
+
+
+def make_site(root):
+    (root / "previews").mkdir()
+    (root / "styles.css").write_text("body { color: #fff; }\n" * 50)
+    (root / "script.js").write_text("console.log('gallery');\n" * 50)
+    (root / "previews" / "Demo.mp4").write_bytes(b"\x00video" * 100)
+    (root / "previews" / "Demo-poster.jpg").write_bytes(b"\xffjpeg")
+    (root / "index.html").write_text(PAGE)
+    return root
+
+
+def test_fingerprint_round_trip():
+    """Test fingerprinted names keep their directory and extension and map back."""
+    name = fingerprinted("previews/Demo-720p.vp9.webm", "0123456789abcdef")
+    assert name == "previews/Demo-720p.vp9.0123456789.webm"
+    assert logical_name(name) == "previews/Demo-720p.vp9.webm"
+    assert logical_name("styles.css") == "styles.css"
+
+
+def test_build_rewrites_pages_and_writes_manifest(tmp_path):
+    """Test every asset gets a hashed copy that the page and manifest refer to."""
+    assets = build_site(make_site(tmp_path))
+    assert sorted(assets) == ["previews/Demo-poster.jpg", "previews/Demo.mp4", "script.js", "styles.css"]
+    html = (tmp_path / "index.html").read_text()
+    for name, asset in assets.items():
+        assert (tmp_path / asset.file).read_bytes() == (tmp_path / name).read_bytes()
+        assert f'"{asset.file}"' in html and f'"{name}"' not in html
+    assert "https://fonts.googleapis.com/css2?family=Inter" in html and 'href="#animations"' in html
+    manifest = json.loads((tmp_path / MANIFEST_FILE).read_text())
+    assert manifest["styles.css"]["bytes"] == (tmp_path / "styles.css").stat().st_size
+    assert "gzip" in manifest["styles.css"]["encodings"] and manifest["previews/Demo.mp4"]["encodings"] == {}
+
+
+def test_rebuild_replaces_stale_fingerprints(tmp_path):
+    """Test an edited asset gets a new name, the page follows it and the old copy is deleted."""
+    old = build_site(make_site(tmp_path))["styles.css"]
+    assert build_site(tmp_path)["styles.css"] == old
+    (tmp_path / "styles.css").write_text("body { color: #000; }\n" * 50)
+    new = build_site(tmp_path)["styles.css"]
+    assert new.file != old.file
+    assert not (tmp_path / old.file).exists() and not (tmp_path / (old.file + ".gz")).exists()
+    assert f'href="{new.file}"' in (tmp_path / "index.html").read_text()
+
+
+def test_precompression_is_deterministic_and_skips_incompressible(tmp_path):
+    """Test gzip siblings are reproducible and only kept when smaller."""
+    text = tmp_path / "page.html"
+    text.write_text("<p>hello</p>\n" * 100)
+    first = precompress(text)
+    content = (tmp_path / "page.html.gz").read_bytes()
+    assert precompress(text) == first and (tmp_path / "page.html.gz").read_bytes() == content
+    assert gzip.decompress(content) == text.read_bytes()
+    tiny = tmp_path / "tiny.js"
+    tiny.write_text("x")
+    assert precompress(tiny) == {} and not (tmp_path / "tiny.js.gz").exists()
+
+
+def test_rewrite_ignores_unknown_urls():
+    """Test URLs that are not assets are left alone."""
+    assert rewrite_references('<img src="logo.png">', {}) == '<img src="logo.png">'
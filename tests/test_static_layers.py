@@ -0,0 +1,140 @@
+"""
+Tests for static-layer selection and background caching.
+
+manim is not needed: a minimal stand-in provides the scene, renderer and
+camera surface that ``StaticLayerScene`` hooks into.
+"""
+
+import types
+
+import numpy as np
+
+from static_layers import StaticLayerScene, camera_state, fingerprint
+
+
+class FakeMobject:
+    def __init__(self, *children, points=None):
+        self.submobjects = list(children)
+        self.points = np.zeros((4, 3)) if points is None else points
+
+    def get_family(self):
+        return [self] + [m for child in self.submobjects for m in child.get_family()]
+
+
+class FakeCamera:
+    frame_center = np.zeros(3)
+    frame_width, frame_height = 14.2, 8.0
+
+    def __init__(self):
+        self.phi = 0.5
+        self.fixed_in_frame_mobjects = set()
+
+    def get_phi(self):
+        return self.phi
+
+
+class FakeRenderer:
+    def __init__(self):
+        self.camera = FakeCamera()
+        self.static_image = None
+        self.renders = 0
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.renders += 1
+        self.static_image = np.full((2, 2, 4), self.renders, dtype=np.uint8)
+        return self.static_image
+
+
+class FakeScene:
+    def __init__(self):
+        self.renderer = FakeRenderer()
+        self.mobjects = []
+
+    def get_moving_mobjects(self, *animations):
+        # Like ThreeDScene while the camera moves: everything is moving
+        return self.mobjects
+
+
+class Scene(StaticLayerScene, FakeScene):
+    pass
+
+
+def animation(mobject):
+    return types.SimpleNamespace(mobject=mobject)
+
+
+def test_marked_mobjects_leave_the_moving_set():
+    """Test static members and their containers are dropped unless animated."""
+    scene = Scene()
+    axes, sphere, cube = FakeMobject(), FakeMobject(), FakeMobject()
+    group = FakeMobject(sphere, cube)
+    scene.mobjects = [axes, group]
+    scene.mark_static(axes, sphere)
+
+    moving = scene.get_moving_mobjects(animation(cube))
+    assert cube in moving
+    assert axes not in moving and sphere not in moving and group not in moving
+
+    # Animating a static mobject puts it back into the per-frame set
+    assert sphere in scene.get_moving_mobjects(animation(sphere))
+
+
+def test_camera_moves_keep_only_fixed_in_frame_static():
+    """Test 3D static mobjects re-render while the camera moves, titles do not."""
+    scene = Scene()
+    axes, title, tracker = FakeMobject(), FakeMobject(), FakeMobject()
+    scene.renderer.camera.get_value_trackers = lambda: [tracker]
+    scene.renderer.camera.fixed_in_frame_mobjects.add(title)
+    scene.mobjects = [axes, title]
+    scene.mark_static(axes, title)
+
+    moving = scene.get_moving_mobjects(animation(tracker))
+    assert axes in moving and title not in moving
+
+
+def test_background_is_cached_per_camera_state_and_content():
+    """Test the static image is reused until the camera or static content changes."""
+    scene = Scene()
+    axes = FakeMobject()
+    renderer = scene.renderer
+
+    first = renderer.save_static_frame_data(scene, [axes])
+    again = renderer.save_static_frame_data(scene, [axes])
+    assert renderer.renders == 1 and again is first
+    assert renderer.static_image is first
+    assert (scene.static_cache_hits, scene.static_cache_misses) == (1, 1)
+
+    renderer.camera.phi = 0.7
+    renderer.save_static_frame_data(scene, [axes])
+    assert renderer.renders == 2
+
+    axes.points = axes.points + 1
+    renderer.save_static_frame_data(scene, [axes])
+    assert renderer.renders == 3
+
+
+def test_camera_state_and_fingerprint():
+    """Test the cache keys react to camera angles and point edits."""
+    camera = FakeCamera()
+    state = camera_state(camera)
+    camera.phi = 1.0
+    assert camera_state(camera) != state
+
+    mob = FakeMobject()
+    print_before = fingerprint([mob])
+    mob.points[0, 0] = 1.0
+    assert fingerprint([mob]) != print_before
+
+
+def test_fingerprint_covers_submobjects():
+    """Test an edit to a child of a group, whose own points are empty, misses the background cache."""
+    child = FakeMobject()
+    group = FakeMobject(child, points=np.zeros((0, 3)))
+    scene = Scene()
+    renderer = scene.renderer
+    renderer.save_static_frame_data(scene, [group])
+    print_before = fingerprint([group])
+    child.points = child.points + 1
+    assert fingerprint([group]) != print_before
+    renderer.save_static_frame_data(scene, [group])
+    assert renderer.renders == 2
@@ -0,0 +1,55 @@
+"""
+Tests for the static LaTeX/Text collection pass.
+"""
+
+import threading
+import time
+
+from tex_precompile import collect_tex_calls, file_lock
+
+SCENE_SOURCE = '''
+from manim import *
+
+class Demo(Scene):
+    def construct(self):
+        a = MathTex(r"\\\\exp(\\\\hat{\\\\omega})", font_size=36, color=RED)
+        b = MathTex(r"\\\\exp(\\\\hat{\\\\omega})", font_size=36, color=BLUE)
+        c = Text("Pose Graph", font_size=28, color=YELLOW)
+        d = Text(f"{len(self.mobjects)} nodes")
+        e = MathTex(r"x", color=self.accent)
+        f = Text("label", color=self.accent)
+'''
+
+
+def test_collects_static_calls_and_dedupes_styles(tmp_path):
+    """Test literal calls are collected once and runtime-only ones are reported."""
+    path = tmp_path / "demo_scene.py"
+    path.write_text(SCENE_SOURCE)
+    calls, dynamic = collect_tex_calls([path])
+
+    kinds = sorted((call.kind, call.args) for call in calls)
+    # Both MathTex colors compile to the same SVG; the unresolved color is dropped
+    assert kinds == [("MathTex", (r"\\exp(\\hat{\\omega})",)), ("MathTex", ("x",)), ("Text", ("Pose Graph",))]
+    text = next(call for call in calls if call.kind == "Text")
+    # Pango caches depend on color, so it is kept as a manim constant reference
+    assert dict(text.kwargs) == {"color": ("const", "YELLOW"), "font_size": 28}
+    assert dynamic == ["demo_scene.py:9", "demo_scene.py:11"]
+
+
+def test_file_lock_serializes_holders(tmp_path):
+    """Test a second holder waits for the first to release the lock."""
+    lock = tmp_path / "locks" / "entry.lock"
+    events = []
+
+    def hold(name):
+        with file_lock(lock):
+            events.append(f"{name} in")
+            time.sleep(0.05)
+            events.append(f"{name} out")
+
+    threads = [threading.Thread(target=hold, args=(name,)) for name in "ab"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert events[1].endswith("out") and events[3].endswith("out")
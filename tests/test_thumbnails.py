@@ -0,0 +1,55 @@
+"""
+Tests for poster frame and animated thumbnail extraction.
+"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from thumbnails import LOOP_SECONDS, Thumbnails, build_thumbnails, loop_window, poster_time, thumbnail_commands
+
+
+def test_poster_is_taken_after_the_build_up():
+    """Test the poster frame sits most of the way into the scene."""
+    assert poster_time(10.0) == 6.0
+    assert 0 < poster_time(0.5) < 0.5
+
+
+def test_loop_stays_inside_the_video():
+    """Test the loop is centered on the poster unless that would run past either end."""
+    assert loop_window(20.0) == (10.0, LOOP_SECONDS)
+    start, length = loop_window(LOOP_SECONDS + 1)
+    assert start + length <= LOOP_SECONDS + 1
+    assert loop_window(2.0) == (0.0, 2.0)
+
+
+def test_commands_write_each_output(tmp_path):
+    """Test one ffmpeg run per output, with WebP only when the encoder exists."""
+    commands = thumbnail_commands(tmp_path / "Demo.mp4", tmp_path, "Demo", 10.0, webp=False)
+    assert sorted(commands) == ["Demo-loop.mp4", "Demo-poster.jpg"]
+    assert all(command[-1] == str(tmp_path / name) for name, command in commands.items())
+    assert "-an" in commands["Demo-loop.mp4"]
+    commands = thumbnail_commands(tmp_path / "Demo.mp4", tmp_path, "Demo", 10.0, webp=True)
+    assert "libwebp" in commands["Demo-poster.webp"]
+
+
+def test_poster_prefers_webp():
+    """Test the WebP poster is referenced first and the JPEG is the fallback."""
+    assert Thumbnails("Demo-poster.jpg", "Demo-poster.webp").poster == "Demo-poster.webp"
+    assert Thumbnails("Demo-poster.jpg").poster == "Demo-poster.jpg"
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="needs ffmpeg")
+def test_build_skips_unchanged_previews(tmp_path):
+    """Test posters and loops are extracted once and reused until the preview changes."""
+    source = tmp_path / "Demo.mp4"
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", "testsrc=s=320x180:d=2", str(source)],
+        check=True,
+    )
+    thumbnails = build_thumbnails({"Demo": source}, tmp_path, jobs=1)["Demo"]
+    assert (tmp_path / thumbnails.poster_jpeg).exists() and (tmp_path / thumbnails.loop).exists()
+    modified = (tmp_path / thumbnails.poster_jpeg).stat().st_mtime_ns
+    assert build_thumbnails({"Demo": source}, tmp_path, jobs=1)["Demo"] == thumbnails
+    assert (tmp_path / thumbnails.poster_jpeg).stat().st_mtime_ns == modified
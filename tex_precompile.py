@@ -0,0 +1,209 @@
+"""
+Parallel pre-compilation of the LaTeX and Pango text used by the scenes.
+
+Every ``MathTex``/``Tex`` is compiled by latex + dvisvgm and every ``Text``
+is shaped by Pango the first time a scene builds it, one after the other.
+This pre-pass finds those calls statically (by parsing the scene modules,
+without importing them) and builds each distinct one in a process pool, so
+the SVGs land in manim's own ``media/Tex`` and ``media/texts`` caches before
+rendering starts. A per-entry file lock lets several precompile runs share
+one media directory without compiling the same expression twice. Renders do
+not take the lock: run the pre-pass to completion before starting them, as
+``generate_previews.py`` does, also before it queues renders for
+``render_queue.py`` workers.
+
+Calls whose arguments are computed at runtime (f-strings, variables) are
+reported and left to the render.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from scene_registry import scene_modules
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, concurrent precompile workers may duplicate work
+    fcntl = None
+
+TEX_CLASSES = ("MathTex", "Tex", "Text")
+# Keyword arguments that only style the compiled SVG; Tex caches ignore them
+TEX_STYLE_KWARGS = {"color", "fill_color", "fill_opacity", "stroke_color", "stroke_width", "opacity"}
+
+
+@dataclass(frozen=True)
+class TexCall:
+    """One statically resolved ``MathTex``/``Tex``/``Text`` construction."""
+
+    kind: str
+    args: Tuple[str, ...]
+    # (name, value) pairs; names of manim constants are stored as ("const", NAME)
+    kwargs: Tuple[Tuple[str, object], ...] = ()
+    source: str = field(default="", compare=False)
+
+    @property
+    def key(self) -> str:
+        payload = json.dumps([self.kind, self.args, self.kwargs], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class _Unresolved(Exception):
+    pass
+
+
+def _parse(path: Path) -> ast.Module:
+    with warnings.catch_warnings():
+        # Scene sources hold LaTeX in non-raw strings ("g \in SO(3)")
+        warnings.simplefilter("ignore", (DeprecationWarning, SyntaxWarning))
+        return ast.parse(path.read_text(), filename=str(path))
+
+
+def _literal(node: ast.AST):
+    """Literal value of a node, or a manim constant reference such as ``RED``."""
+    try:
+        value = ast.literal_eval(node)
+    except ValueError:
+        if isinstance(node, ast.Name) and node.id.isupper():
+            return ("const", node.id)
+        raise _Unresolved
+    return value
+
+
+def _resolve_call(node: ast.Call, kind: str, source: str) -> TexCall:
+    if any(isinstance(arg, ast.Starred) for arg in node.args):
+        raise _Unresolved
+    args = tuple(_literal(arg) for arg in node.args)
+    if not all(isinstance(arg, str) for arg in args):
+        raise _Unresolved
+    kwargs = []
+    for keyword in node.keywords:
+        if keyword.arg is None:
+            raise _Unresolved
+        try:
+            kwargs.append((keyword.arg, _literal(keyword.value)))
+        except _Unresolved:
+            if kind == "Text" or keyword.arg not in TEX_STYLE_KWARGS:
+                raise
+    if kind != "Text":
+        kwargs = [(k, v) for k, v in kwargs if k not in TEX_STYLE_KWARGS]
+    return TexCall(kind, args, tuple(sorted(kwargs, key=lambda kv: kv[0])), source)
+
+
+def collect_tex_calls(paths: Iterable[Path]) -> Tuple[List[TexCall], List[str]]:
+    """
+    Statically collect the distinct text constructions in ``paths``.
+
+    Returns the resolvable calls and the ``file:line`` locations of calls
+    whose arguments are only known at runtime.
+    """
+    calls, dynamic = {}, []
+    for path in paths:
+        path = Path(path)
+        for node in ast.walk(_parse(path)):
+            if not isinstance(node, ast.Call):
+                continue
+            func = node.func
+            kind = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+            if kind not in TEX_CLASSES:
+                continue
+            source = f"{path.name}:{node.lineno}"
+            try:
+                call = _resolve_call(node, kind, source)
+            except _Unresolved:
+                dynamic.append(source)
+                continue
+            calls.setdefault(call.key, call)
+    return list(calls.values()), dynamic
+
+
+@contextmanager
+def file_lock(path: Path):
+    """Exclusive advisory lock held for the duration of the block."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _lock_dir() -> Path:
+    from manim import config
+
+    return Path(config.media_dir) / "Tex" / ".locks"
+
+
+def compile_call(call: TexCall) -> str:
+    """Build one text mobject so manim writes its SVG cache entry."""
+    import manim
+
+    kwargs = {
+        name: getattr(manim, value[1]) if isinstance(value, tuple) and value[:1] == ("const",) else value
+        for name, value in call.kwargs
+    }
+    with file_lock(_lock_dir() / f"{call.key}.lock"):
+        getattr(manim, call.kind)(*call.args, **kwargs)
+    return call.key
+
+
+def precompile(
+    paths: Optional[Iterable[Path]] = None,
+    workers: Optional[int] = None,
+    verbose: bool = True,
+) -> Tuple[int, List[str]]:
+    """
+    Compile every statically known text construction in a process pool.
+
+    Returns the number compiled and a list of failures (``source: error``).
+    """
+    calls, dynamic = collect_tex_calls(paths or scene_modules())
+    if verbose:
+        print(f"Pre-compiling {len(calls)} text objects ({len(dynamic)} computed at runtime, skipped)")
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(compile_call, call): call for call in calls}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures.append(f"{futures[future].source}: {e}")
+    return len(calls) - len(failures), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-compile scene LaTeX and text into manim's cache.")
+    parser.add_argument("files", nargs="*", type=Path, help="Scene modules (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--list", action="store_true", help="Only list what would be compiled")
+    args = parser.parse_args()
+
+    if args.list:
+        calls, dynamic = collect_tex_calls(args.files or scene_modules())
+        for call in calls:
+            print(f"{call.source:45s} {call.kind}{call.args}")
+        print(f"{len(calls)} static, {len(dynamic)} runtime-only")
+        return
+
+    compiled, failures = precompile(args.files or None, workers=args.jobs)
+    print(f"Compiled {compiled} text objects")
+    for failure in failures:
+        print(f"  failed {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
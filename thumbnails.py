@@ -0,0 +1,164 @@
+"""
+Poster frames and animated thumbnails for the gallery.
+
+For every rendered preview the build extracts
+
+* a poster frame, as JPEG and (when ffmpeg has libwebp) WebP, shown by the
+  gallery's ``<video preload="none">`` before anything is played, and
+* a short, muted, low-resolution loop around the same moment, which the
+  gallery only loads and plays while the card is on screen (see
+  ``docs/script.js``).
+
+so opening the gallery fetches a few small images instead of every video.
+Outputs are skipped when the preview did not change, as recorded in
+``thumbnails.json``:
+
+    python thumbnails.py docs/previews
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import manifests
+from encoding_ladder import FFMPEG, available_encoders, file_hash, preview_sources, probe_video
+
+MANIFEST_FILE = "thumbnails.json"
+# Fraction of the video where the poster is taken: most of the scene is built
+# up by then, and it is before the final fade-outs
+POSTER_POSITION = 0.6
+POSTER_HEIGHT = 480
+JPEG_QUALITY = 4  # ffmpeg -q:v, 2 (best) to 31
+WEBP_QUALITY = 75
+LOOP_SECONDS = 4.0
+LOOP_HEIGHT = 240
+LOOP_FPS = 12
+LOOP_CRF = 30
+
+
+@dataclass
+class Thumbnails:
+    """File names of one scene's poster frames and loop."""
+
+    poster_jpeg: str
+    poster_webp: Optional[str] = None
+    loop: Optional[str] = None
+
+    @property
+    def poster(self) -> str:
+        """The poster to reference first (the smaller WebP when there is one)."""
+        return self.poster_webp or self.poster_jpeg
+
+
+def poster_time(duration: float) -> float:
+    return round(duration * POSTER_POSITION, 3)
+
+
+def loop_window(duration: float) -> Tuple[float, float]:
+    """``(start, length)`` of the loop, centered on the poster frame and inside the video."""
+    length = min(LOOP_SECONDS, duration)
+    start = min(max(poster_time(duration) - length / 2, 0.0), duration - length)
+    return round(start, 3), round(length, 3)
+
+
+def thumbnail_commands(source: Path, directory: Path, scene: str, duration: float, webp: bool) -> Dict[str, List[str]]:
+    """The ffmpeg command producing each output file, by file name."""
+    time = str(poster_time(duration))
+    start, length = loop_window(duration)
+    still = ["-ss", time, "-i", str(source), "-frames:v", "1", "-vf", f"scale=-2:{POSTER_HEIGHT}"]
+    commands = {
+        f"{scene}-poster.jpg": still + ["-q:v", str(JPEG_QUALITY)],
+        f"{scene}-loop.mp4": [
+            "-ss", str(start), "-t", str(length), "-i", str(source), "-an",
+            "-vf", f"fps={LOOP_FPS},scale=-2:{LOOP_HEIGHT}", "-c:v", "libx264", "-crf", str(LOOP_CRF),
+            "-preset", "slow", "-pix_fmt", "yuv420p", "-movflags", "+faststart",
+        ],
+    }
+    if webp:
+        commands[f"{scene}-poster.webp"] = still + ["-c:v", "libwebp", "-quality", str(WEBP_QUALITY)]
+    return {
+        name: [FFMPEG, "-y", "-loglevel", "error", "-nostdin", *args, str(Path(directory) / name)]
+        for name, args in commands.items()
+    }
+
+
+def load_manifest(directory: Path) -> Dict[str, dict]:
+    return manifests.read_manifest(Path(directory) / MANIFEST_FILE)
+
+
+def save_manifest(directory: Path, manifest: Dict[str, dict]) -> None:
+    manifests.write_manifest(Path(directory) / MANIFEST_FILE, manifest)
+
+
+def load_thumbnails(directory: Path) -> Dict[str, Thumbnails]:
+    """The thumbnails per scene from the last ``build_thumbnails`` run."""
+    return {scene: Thumbnails(**entry["files"]) for scene, entry in load_manifest(directory).items()}
+
+
+def settings_key() -> str:
+    return manifests.settings_key(
+        POSTER_POSITION, POSTER_HEIGHT, JPEG_QUALITY, WEBP_QUALITY, LOOP_SECONDS, LOOP_HEIGHT, LOOP_FPS, LOOP_CRF,
+    )
+
+
+def build_thumbnails(sources: Dict[str, Path], directory: Path, jobs: int = 2, force: bool = False) -> Dict[str, Thumbnails]:
+    """Posters and loops for every scene in ``sources`` (scene name -> rendered preview)."""
+    directory = Path(directory)
+    manifest = load_manifest(directory)
+    webp = "libwebp" in available_encoders()
+    stale = {}
+    for scene, source in sources.items():
+        source_hash = file_hash(source)
+        entry = manifest.get(scene)
+        fresh = (
+            entry is not None
+            and entry["source_hash"] == source_hash
+            and entry["settings"] == settings_key()
+            and all((directory / name).exists() for name in entry["files"].values() if name)
+        )
+        if force or not fresh:
+            stale[scene] = (source, source_hash)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        durations = dict(zip(stale, pool.map(lambda item: probe_video(item[0])["duration"], stale.values())))
+        runs = {
+            (scene, name): pool.submit(subprocess.run, command, check=True)
+            for scene, (source, _) in stale.items()
+            for name, command in thumbnail_commands(source, directory, scene, durations[scene], webp).items()
+        }
+
+    for scene, (_, source_hash) in stale.items():
+        done = {name for (owner, name), run in runs.items() if owner == scene and run.exception() is None}
+        if f"{scene}-poster.jpg" not in done:
+            manifest.pop(scene, None)
+            continue
+        thumbnails = Thumbnails(
+            f"{scene}-poster.jpg",
+            f"{scene}-poster.webp" if f"{scene}-poster.webp" in done else None,
+            f"{scene}-loop.mp4" if f"{scene}-loop.mp4" in done else None,
+        )
+        manifest[scene] = {"source_hash": source_hash, "settings": settings_key(), "files": asdict(thumbnails)}
+    save_manifest(directory, manifest)
+    return {scene: Thumbnails(**manifest[scene]["files"]) for scene in sources if scene in manifest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract poster frames and looping thumbnails from the previews.")
+    parser.add_argument("directory", type=Path, nargs="?", default=Path(__file__).parent / "docs" / "previews")
+    parser.add_argument("-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="Parallel ffmpeg runs")
+    parser.add_argument("--force", action="store_true", help="Regenerate even if nothing changed")
+    args = parser.parse_args()
+
+    thumbnails = build_thumbnails(preview_sources(args.directory), args.directory, args.jobs, args.force)
+    for scene, files in thumbnails.items():
+        print(f"🖼️  {scene}: {', '.join(name for name in asdict(files).values() if name)}")
+    sys.exit(0 if thumbnails else 1)
+
+
+if __name__ == "__main__":
+    main()